@@ -40,7 +40,7 @@ def main() -> None:
     print(f"Executed SQL files: {len(results)}")
     for result in results:
         print(
-            f"{result.query_path.name} -> {result.output_csv_path} "
+            f"{result.query_path.name} -> {result.output_path} "
             f"(rows={result.rows}, cols={result.columns})"
         )
 
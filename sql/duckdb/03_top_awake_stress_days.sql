@@ -8,5 +8,5 @@ FROM vw_day_to_next_sleep
 WHERE valid_day_strict IS TRUE
   AND corrupted_stress_only_day IS NOT TRUE
   AND day_awake_average_stress IS NOT NULL
-ORDER BY day_awake_average_stress DESC
+ORDER BY day_awake_average_stress DESC, day_date
 LIMIT 20;
@@ -1,25 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-import pandas as pd
 import typer
 from rich.console import Console
 
-from .ingest.sleep import parse_sleep_files
-from .ingest.uds import parse_uds_files
-from .quality.quality import (
-    QualityConfig,
-    apply_quality_labels,
-    build_quality_summary_markdown,
-    build_suspicious_days,
-    build_suspicious_days_artifacts,
-    write_quality_outputs,
-)
-from .reports.data_dictionary import DictionaryOptions, build_data_dictionary, write_dictionary_reports
-from .sanitize import sanitize_parquet_file, write_sanitize_report
-from .sql import build_sql_mart, run_sql_directory
 from .util.io import (
     ensure_dir,
     get_export_dir,
@@ -29,11 +17,33 @@ from .util.io import (
     list_sleep_files,
     list_uds_files,
 )
+from .util.metrics import configure_metrics_output, instrumented, record_output, record_rows
+
+# pandas, pyarrow, duckdb and the modules built on them are imported inside the
+# commands that use them, so `--help` and light commands start quickly.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .pipeline import Stage
+    from .quality.quality import QualityConfig
 
 app = typer.Typer(add_completion=False)
 console = Console()
 
 
+@app.callback()
+def main(
+    metrics_out: Path = typer.Option(
+        None,
+        "--metrics-out",
+        envvar="GARMIN_METRICS_OUT",
+        help="Append per-command metrics (wall/CPU time, peak RSS, rows, bytes) as JSON lines to this file",
+    ),
+) -> None:
+    """Garmin export analytics toolkit."""
+    configure_metrics_output(metrics_out)
+
+
 def _safe_relpath(path: Path, base: Path) -> str:
     try:
         return str(path.relative_to(base))
@@ -55,6 +65,8 @@ def _pick_existing_path(*candidates: Path) -> Path | None:
 
 def _normalize_and_validate_calendar_date(df: pd.DataFrame, *, label: str) -> None:
     """Normalize and validate the calendarDate column in-place."""
+    import pandas as pd
+
     if "calendarDate" not in df.columns:
         _info(f"{label} is missing required column: calendarDate")
         raise typer.Exit(code=1)
@@ -74,6 +86,8 @@ def _assert_unique_calendar_date(df: pd.DataFrame, *, label: str) -> None:
     if not bool(duplicate_mask.any()):
         return
 
+    import pandas as pd
+
     dup_rows = int(duplicate_mask.sum())
     dup_dates = (
         pd.to_datetime(df.loc[duplicate_mask, "calendarDate"], errors="coerce")
@@ -89,9 +103,37 @@ def _assert_unique_calendar_date(df: pd.DataFrame, *, label: str) -> None:
     raise typer.Exit(code=1)
 
 
+def _parse_grid(raw: str, *, option: str, cast: type = int) -> list[Any]:
+    """Parse a comma-separated grid option such as ``0,50,100``."""
+    try:
+        values = [cast(item) for item in raw.split(",") if item.strip()]
+    except ValueError:
+        _info(f"{option} expects comma-separated numbers, got: {raw}")
+        raise typer.Exit(code=1)
+    if not values:
+        _info(f"{option} needs at least one value")
+        raise typer.Exit(code=1)
+    return values
+
+
+def _reject_stream_conflicts(*, workers: int, incremental: bool) -> None:
+    if workers > 1 or incremental:
+        _info("--stream cannot be combined with --workers or --incremental.")
+        raise typer.Exit(code=1)
+
+
+def _check_partition_by(partition_by: str) -> None:
+    if partition_by not in {"none", "month"}:
+        _info("Invalid --partition-by. Expected one of: none, month")
+        raise typer.Exit(code=1)
+
+
 @app.command("discover")
+@instrumented("discover")
 def discover() -> None:
     """Discover available Garmin export files and write inventory CSV."""
+    import pandas as pd
+
     export_dir = get_export_dir()
     uds_files = list_uds_files(export_dir)
     sleep_files = list_sleep_files(export_dir)
@@ -130,44 +172,172 @@ def discover() -> None:
     inventory_path = get_interim_dir() / "inventory.csv"
     ensure_dir(inventory_path.parent)
     pd.DataFrame(rows).to_csv(inventory_path, index=False)
+    record_rows(rows_out=len(rows))
+    record_output(inventory_path)
     _info(f"Wrote inventory: {inventory_path}")
 
 
 @app.command("ingest-uds")
-def ingest_uds() -> None:
+@instrumented("ingest-uds")
+def ingest_uds(
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Parse files in N worker processes (output is identical to serial mode)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Only parse new or changed files; reuse cached chunks from data/interim/ingest_cache/uds",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Write parquet in record batches with bounded memory (two passes over the files)",
+    ),
+    batch_size: int = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Rows per parquet batch in --stream mode (default: 10000)",
+    ),
+    partition_by: str = typer.Option(
+        "none",
+        "--partition-by",
+        help="Output layout: none (one parquet file) or month (year=YYYY/month=MM directories)",
+    ),
+) -> None:
     """Parse UDSFile_*.json and write daily_uds.parquet."""
+    from .ingest.manifest import ChunkCache
+    from .ingest.stream import DEFAULT_BATCH_SIZE
+    from .ingest.uds import parse_uds_files, stream_uds_parquet
+    from .util.partitions import write_table
+
+    _check_partition_by(partition_by)
+
     export_dir = get_export_dir()
     uds_files = list_uds_files(export_dir)
     if not uds_files:
         _info("No UDS files found.")
         raise typer.Exit(code=1)
 
-    df = parse_uds_files(uds_files)
     output_path = get_processed_dir() / "daily_uds.parquet"
     ensure_dir(output_path.parent)
-    df.to_parquet(output_path, index=False, engine="pyarrow")
+    if stream:
+        _reject_stream_conflicts(workers=workers, incremental=incremental)
+        rows = stream_uds_parquet(
+            uds_files,
+            output_path,
+            batch_size=batch_size or DEFAULT_BATCH_SIZE,
+            partition_by=partition_by,
+        )
+        record_rows(rows_out=rows)
+        record_output(output_path)
+        _info(f"Wrote {rows} rows to {output_path}")
+        return
+
+    cache = ChunkCache(get_interim_dir() / "ingest_cache" / "uds") if incremental else None
+    df = parse_uds_files(uds_files, workers=workers, cache=cache)
+    if cache is not None and cache.stats is not None:
+        _info(
+            f"Incremental: parsed {cache.stats.parsed} new/changed files, "
+            f"reused {cache.stats.reused}, dropped {cache.stats.removed} removed"
+        )
+    write_table(df, output_path, partition_by=partition_by)
+    record_rows(rows_out=len(df))
+    record_output(output_path)
     _info(f"Wrote {len(df)} rows to {output_path}")
 
 
 @app.command("ingest-sleep")
-def ingest_sleep() -> None:
+@instrumented("ingest-sleep")
+def ingest_sleep(
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Parse files in N worker processes (output is identical to serial mode)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Only parse new or changed files; reuse cached chunks from data/interim/ingest_cache/sleep",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Write parquet in record batches with bounded memory (two passes over the files)",
+    ),
+    batch_size: int = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Rows per parquet batch in --stream mode (default: 10000)",
+    ),
+    partition_by: str = typer.Option(
+        "none",
+        "--partition-by",
+        help="Output layout: none (one parquet file) or month (year=YYYY/month=MM directories)",
+    ),
+) -> None:
     """Parse *_sleepData.json and write sleep.parquet."""
+    from .ingest.manifest import ChunkCache
+    from .ingest.sleep import parse_sleep_files, stream_sleep_parquet
+    from .ingest.stream import DEFAULT_BATCH_SIZE
+    from .util.partitions import write_table
+
+    _check_partition_by(partition_by)
+
     export_dir = get_export_dir()
     sleep_files = list_sleep_files(export_dir)
     if not sleep_files:
         _info("No sleep files found.")
         raise typer.Exit(code=1)
 
-    df = parse_sleep_files(sleep_files)
     output_path = get_processed_dir() / "sleep.parquet"
     ensure_dir(output_path.parent)
-    df.to_parquet(output_path, index=False, engine="pyarrow")
+    if stream:
+        _reject_stream_conflicts(workers=workers, incremental=incremental)
+        rows = stream_sleep_parquet(
+            sleep_files,
+            output_path,
+            batch_size=batch_size or DEFAULT_BATCH_SIZE,
+            partition_by=partition_by,
+        )
+        record_rows(rows_out=rows)
+        record_output(output_path)
+        _info(f"Wrote {rows} rows to {output_path}")
+        return
+
+    cache = ChunkCache(get_interim_dir() / "ingest_cache" / "sleep") if incremental else None
+    df = parse_sleep_files(sleep_files, workers=workers, cache=cache)
+    if cache is not None and cache.stats is not None:
+        _info(
+            f"Incremental: parsed {cache.stats.parsed} new/changed files, "
+            f"reused {cache.stats.reused}, dropped {cache.stats.removed} removed"
+        )
+    write_table(df, output_path, partition_by=partition_by)
+    record_rows(rows_out=len(df))
+    record_output(output_path)
     _info(f"Wrote {len(df)} rows to {output_path}")
 
 
 @app.command("build-daily")
-def build_daily() -> None:
+@instrumented("build-daily")
+def build_daily(
+    partition_by: str = typer.Option(
+        "none",
+        "--partition-by",
+        help="Output layout: none (one parquet file) or month (year=YYYY/month=MM directories)",
+    ),
+) -> None:
     """Merge daily UDS and sleep tables on calendarDate."""
+    import pandas as pd
+
+    from .util.partitions import read_table, write_table
+
+    _check_partition_by(partition_by)
     processed_dir = get_processed_dir()
     uds_path = processed_dir / "daily_uds.parquet"
     sleep_path = processed_dir / "sleep.parquet"
@@ -179,8 +349,8 @@ def build_daily() -> None:
         _info(f"Missing input: {sleep_path}")
         raise typer.Exit(code=1)
 
-    uds_df = pd.read_parquet(uds_path)
-    sleep_df = pd.read_parquet(sleep_path)
+    uds_df = read_table(uds_path)
+    sleep_df = read_table(sleep_path)
 
     _normalize_and_validate_calendar_date(uds_df, label="daily_uds.parquet")
     _normalize_and_validate_calendar_date(sleep_df, label="sleep.parquet")
@@ -189,11 +359,14 @@ def build_daily() -> None:
 
     daily = pd.merge(uds_df, sleep_df, on="calendarDate", how="left", suffixes=("", "_sleep"))
     output_path = processed_dir / "daily.parquet"
-    daily.to_parquet(output_path, index=False, engine="pyarrow")
+    write_table(daily, output_path, partition_by=partition_by)
+    record_rows(rows_in=len(uds_df) + len(sleep_df), rows_out=len(daily))
+    record_output(output_path)
     _info(f"Wrote {len(daily)} rows to {output_path}")
 
 
 @app.command("sanitize")
+@instrumented("sanitize")
 def sanitize(
     input: Path = typer.Option(
         None,
@@ -220,8 +393,38 @@ def sanitize(
         "--allow-identifiers",
         help="Dangerous: allow identifier-like columns to remain (not recommended)",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        min=1,
+        help="Sanitize up to N tables at once in threads (report order is unchanged)",
+    ),
+    guid_sample: str = typer.Option(
+        "head",
+        "--guid-sample",
+        help="Values checked by the GUID rule: head, random, or stratified (across row groups)",
+    ),
+    guid_cache: bool = typer.Option(
+        False,
+        "--guid-cache",
+        help="Reuse GUID-check results for unchanged columns from data/interim/sanitize_guid_cache.json",
+    ),
+    partition_by: str = typer.Option(
+        "none",
+        "--partition-by",
+        help="Output layout: none (one parquet file) or month (year=YYYY/month=MM directories)",
+    ),
 ) -> None:
     """Create sanitized parquet outputs without personal identifiers."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .sanitize import GUID_SAMPLE_STRATEGIES, GuidScanCache, sanitize_parquet_file, write_sanitize_report
+
+    if guid_sample not in GUID_SAMPLE_STRATEGIES:
+        _info(f"Invalid --guid-sample. Expected one of: {', '.join(GUID_SAMPLE_STRATEGIES)}")
+        raise typer.Exit(code=1)
+    _check_partition_by(partition_by)
+
     processed_dir = get_processed_dir()
 
     default_daily_in = processed_dir / "daily.parquet"
@@ -259,27 +462,46 @@ def sanitize(
 
     aggregated: dict[str, object] = {"files": {}}
 
-    for label, in_path, out_path in candidates:
-        df = pd.read_parquet(in_path)
-        before_cols = df.shape[1]
-        before_rows = len(df)
-        file_report = sanitize_parquet_file(
+    def _run(candidate: tuple[str, Path, Path]) -> dict[str, Any]:
+        _, in_path, out_path = candidate
+        return sanitize_parquet_file(
             in_path,
             out_path,
             allow_identifiers=allow_identifiers,
+            guid_sample=guid_sample,
+            guid_cache=cache,
+            partition_by=partition_by,
         )
-        after_cols = file_report.get("cols_after", before_cols)
-        dropped = before_cols - int(after_cols)
+
+    cache = GuidScanCache(get_interim_dir() / "sanitize_guid_cache.json") if guid_cache else None
+
+    # Tables are independent; map() keeps reports in candidate order.
+    with ThreadPoolExecutor(max_workers=min(jobs, len(candidates))) as pool:
+        file_reports = list(pool.map(_run, candidates))
+
+    if cache is not None:
+        cache.save()
+        _info(f"GUID cache: reused {cache.hits} column checks, scanned {cache.misses}")
+
+    for (label, _, out_path), file_report in zip(candidates, file_reports):
+        rows = int(file_report["rows"])
+        before_cols = int(file_report["cols_before"])
+        after_cols = int(file_report["cols_after"])
+        dropped = before_cols - after_cols
         _info(
-            f"Sanitized {label}: {before_rows} rows, {before_cols} → {after_cols} cols (dropped {dropped})"
+            f"Sanitized {label}: {rows} rows, {before_cols} → {after_cols} cols (dropped {dropped})"
         )
         aggregated["files"][label] = file_report
+        record_rows(rows_in=rows, rows_out=rows)
+        record_output(out_path)
 
     write_sanitize_report(report_path, aggregated)
+    record_output(report_path)
     _info(f"Wrote report: {report_path}")
 
 
 @app.command("data-dictionary")
+@instrumented("data-dictionary")
 def data_dictionary(
     input: Path = typer.Option(
         None,
@@ -301,11 +523,40 @@ def data_dictionary(
         "--markdown-mode",
         help="Markdown output mode: full, summary, or both",
     ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Read the parquet in record batches with bounded memory (sketched n_unique/quantiles)",
+    ),
+    batch_size: int = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Rows per record batch in --stream mode (default: 65536)",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        min=1,
+        help="Profile column groups in N worker processes (column order is unchanged)",
+    ),
 ) -> None:
     """Generate a data dictionary report for the aggregated dataset."""
+    from .reports.data_dictionary import (
+        STREAM_BATCH_SIZE,
+        DictionaryOptions,
+        build_data_dictionary,
+        build_data_dictionary_streaming,
+        write_dictionary_reports,
+    )
+    from .util.partitions import read_schema, read_table
+
     if markdown_mode not in {"full", "summary", "both"}:
         _info("Invalid --markdown-mode. Expected one of: full, summary, both")
         raise typer.Exit(code=1)
+    if stream and jobs > 1:
+        _info("--stream cannot be combined with --jobs.")
+        raise typer.Exit(code=1)
 
     processed_dir = get_processed_dir()
     default_in = processed_dir / "daily_sanitized.parquet"
@@ -317,50 +568,61 @@ def data_dictionary(
         raise typer.Exit(code=1)
 
     output_dir = out_dir or (get_repo_root() / "reports")
+    ts_cols = ["sleepStartTimestampGMT", "sleepEndTimestampGMT"]
 
-    df = pd.read_parquet(input_path)
+    def _ts_counts(path: Path) -> dict[str, int]:
+        # Only the two timestamp columns are read, so the checks stay cheap in --stream mode.
+        present = [col for col in ts_cols if col in read_schema(path).names]
+        if not present:
+            return {}
+        frame = read_table(path, columns=present)
+        return {col: int(frame[col].notna().sum()) for col in present}
 
-    def _log_ts_counts(label: str, frame: pd.DataFrame) -> None:
-        for col in ["sleepStartTimestampGMT", "sleepEndTimestampGMT"]:
-            if col in frame.columns:
-                _info(f"{label} {col} non-null: {int(frame[col].notna().sum())}")
+    def _log_ts_counts(label: str, counts: dict[str, int]) -> None:
+        for col, count in counts.items():
+            _info(f"{label} {col} non-null: {count}")
 
-    _log_ts_counts("input", df)
+    input_counts = _ts_counts(input_path)
+    _log_ts_counts("input", input_counts)
 
     if input is None and input_path == default_in and fallback_in.exists():
-        _log_ts_counts("daily_sanitized", df)
-        if all(
-            col in df.columns and int(df[col].notna().sum()) == 0
-            for col in ["sleepStartTimestampGMT", "sleepEndTimestampGMT"]
-        ):
-            daily_df = pd.read_parquet(fallback_in)
-            _log_ts_counts("daily", daily_df)
-            if any(
-                col in daily_df.columns and int(daily_df[col].notna().sum()) > 0
-                for col in ["sleepStartTimestampGMT", "sleepEndTimestampGMT"]
-            ):
+        _log_ts_counts("daily_sanitized", input_counts)
+        if all(input_counts.get(col) == 0 for col in ts_cols):
+            daily_counts = _ts_counts(fallback_in)
+            _log_ts_counts("daily", daily_counts)
+            if any(count > 0 for count in daily_counts.values()):
                 _info(
                     "Warning: daily_sanitized appears stale; using daily.parquet instead."
                 )
-                df = daily_df
                 input_path = fallback_in
 
     if fallback_in.exists() and fallback_in != input_path:
-        daily_df = pd.read_parquet(fallback_in)
-        _log_ts_counts("daily", daily_df)
+        _log_ts_counts("daily", _ts_counts(fallback_in))
 
     sleep_path = processed_dir / "sleep.parquet"
     if sleep_path.exists():
-        sleep_df = pd.read_parquet(sleep_path)
-        _log_ts_counts("sleep", sleep_df)
-    dictionary_df = build_data_dictionary(df, max_sample_values=max_sample_values)
+        _log_ts_counts("sleep", _ts_counts(sleep_path))
+
+    if stream:
+        dictionary_df, source = build_data_dictionary_streaming(
+            input_path,
+            max_sample_values=max_sample_values,
+            batch_size=batch_size or STREAM_BATCH_SIZE,
+        )
+        rows_in = source.n_rows
+    else:
+        source = read_table(input_path)
+        dictionary_df = build_data_dictionary(source, max_sample_values=max_sample_values, jobs=jobs)
+        rows_in = len(source)
     csv_path, full_md_path, summary_md_path = write_dictionary_reports(
         dictionary_df,
-        df,
+        source,
         output_dir,
         options=DictionaryOptions(max_sample_values=max_sample_values),
         markdown_mode=markdown_mode,
     )
+    record_rows(rows_in=rows_in, rows_out=len(dictionary_df))
+    record_output(csv_path, full_md_path, summary_md_path)
     _info(f"Wrote {csv_path}")
     if full_md_path is not None:
         _info(f"Wrote {full_md_path}")
@@ -369,6 +631,7 @@ def data_dictionary(
 
 
 @app.command("quality")
+@instrumented("quality")
 def quality(
     input: Path = typer.Option(
         None,
@@ -396,8 +659,24 @@ def quality(
     strict_min_score: int = typer.Option(4, "--strict-min-score", help="Strict good-day threshold"),
     loose_min_score: int = typer.Option(3, "--loose-min-score", help="Loose good-day threshold"),
     top_n: int = typer.Option(50, "--top-n", help="Number of suspicious days to export"),
+    partition_by: str = typer.Option(
+        "none",
+        "--partition-by",
+        help="Output layout: none (one parquet file) or month (year=YYYY/month=MM directories)",
+    ),
 ) -> None:
     """Compute day quality labels and export quality reports."""
+    from .quality.quality import (
+        QualityConfig,
+        apply_quality_labels,
+        build_quality_summary_markdown,
+        build_suspicious_days,
+        build_suspicious_days_artifacts,
+        write_quality_outputs,
+    )
+    from .util.partitions import read_table
+
+    _check_partition_by(partition_by)
     processed_dir = get_processed_dir()
     default_in = processed_dir / "daily_sanitized.parquet"
     fallback_in = processed_dir / "daily.parquet"
@@ -419,7 +698,7 @@ def quality(
         top_n=top_n,
     )
 
-    df = pd.read_parquet(input_path)
+    df = read_table(input_path)
     quality_df = apply_quality_labels(df, config)
     suspicious_df = build_suspicious_days(quality_df, top_n=config.top_n)
     suspicious_artifacts_df = build_suspicious_days_artifacts(quality_df, top_n=config.top_n)
@@ -433,8 +712,12 @@ def quality(
         summary_markdown=summary_md,
         output_parquet=parquet_path,
         write_parquet=not no_parquet,
+        partition_by=partition_by,
     )
 
+    record_rows(rows_in=len(df), rows_out=len(quality_df))
+    record_output(summary_path, suspicious_path, suspicious_artifacts_path, maybe_parquet)
+
     strict_dist = quality_df["day_quality_label_strict"].value_counts(dropna=False)
     loose_dist = quality_df["day_quality_label_loose"].value_counts(dropna=False)
     total = len(quality_df) or 1
@@ -465,7 +748,64 @@ def quality(
         _info(f"Wrote {maybe_parquet}")
 
 
+@app.command("quality-sweep")
+@instrumented("quality-sweep")
+def quality_sweep(
+    input: Path = typer.Option(
+        None,
+        "--input",
+        help="Input parquet (default: daily_sanitized.parquet, fallback: daily.parquet)",
+    ),
+    output: Path = typer.Option(
+        None,
+        "--output",
+        help="Output CSV path (default: reports/quality_sweep.csv)",
+    ),
+    steps_min: str = typer.Option("0,50,100,500,1000", "--steps-min", help="Comma-separated steps_min candidates"),
+    stress_any_hours: str = typer.Option("2,4,6,8,12", "--stress-any-hours", help="Comma-separated stress hours candidates for has_stress_duration"),
+    stress_full_hours: str = typer.Option("20", "--stress-full-hours", help="Comma-separated stress hours candidates for full_day_stress"),
+    strict_min_score: str = typer.Option("3,4,5", "--strict-min-score", help="Comma-separated strict good-day thresholds"),
+    loose_min_score: str = typer.Option("2,3,4", "--loose-min-score", help="Comma-separated loose good-day thresholds"),
+) -> None:
+    """Compare label mixes across a grid of quality thresholds."""
+    from .quality.quality import build_config_grid, sweep_quality_configs
+    from .util.partitions import read_table
+
+    processed_dir = get_processed_dir()
+    default_in = processed_dir / "daily_sanitized.parquet"
+    fallback_in = processed_dir / "daily.parquet"
+    input_path = input or (default_in if default_in.exists() else fallback_in)
+
+    if not input_path.exists():
+        _info(f"Missing input: {input_path}")
+        raise typer.Exit(code=1)
+
+    configs = build_config_grid(
+        steps_min=_parse_grid(steps_min, option="--steps-min"),
+        stress_any_min_seconds=[int(h * 3600) for h in _parse_grid(stress_any_hours, option="--stress-any-hours", cast=float)],
+        stress_full_min_seconds=[int(h * 3600) for h in _parse_grid(stress_full_hours, option="--stress-full-hours", cast=float)],
+        strict_min_score=_parse_grid(strict_min_score, option="--strict-min-score"),
+        loose_min_score=_parse_grid(loose_min_score, option="--loose-min-score"),
+    )
+
+    df = read_table(input_path)
+    sweep_df = sweep_quality_configs(df, configs)
+
+    output_path = output or (get_repo_root() / "reports" / "quality_sweep.csv")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    sweep_df.to_csv(output_path, index=False)
+
+    record_rows(rows_in=len(df), rows_out=len(sweep_df))
+    record_output(output_path)
+
+    _info(f"Input: {input_path}")
+    _info(f"Total days: {len(df)}")
+    _info(f"Configs evaluated: {len(sweep_df)}")
+    _info(f"Wrote {output_path}")
+
+
 @app.command("build-sql-mart")
+@instrumented("build-sql-mart")
 def build_sql_mart_command(
     db_path: Path = typer.Option(
         None,
@@ -492,8 +832,44 @@ def build_sql_mart_command(
         "--overwrite/--no-overwrite",
         help="Overwrite existing DuckDB file if it already exists",
     ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Refresh an existing mart in place: upsert changed days, rebuild views only on schema changes",
+    ),
+    materialize: bool = typer.Option(
+        False,
+        "--materialize",
+        help="Back the vw_* views with date-sorted mat_* tables, refreshed when their fact tables change",
+    ),
+    mode: str = typer.Option(
+        "table",
+        "--mode",
+        help="Fact storage: table (copy into DuckDB), external (views over parquet), hybrid (views + hot columns)",
+    ),
+    since: datetime = typer.Option(
+        None,
+        "--since",
+        formats=["%Y-%m-%d"],
+        help="Only load days on or after this date (month-partitioned sources are pruned)",
+    ),
+    until: datetime = typer.Option(
+        None,
+        "--until",
+        formats=["%Y-%m-%d"],
+        help="Only load days on or before this date",
+    ),
 ) -> None:
     """Build a local DuckDB mart from Stage 1 parquet outputs."""
+    from .sql import build_sql_mart
+
+    if mode not in {"table", "external", "hybrid"}:
+        _info("Invalid --mode. Expected one of: table, external, hybrid")
+        raise typer.Exit(code=1)
+    if incremental and mode != "table":
+        _info("--incremental cannot be combined with --mode external or hybrid.")
+        raise typer.Exit(code=1)
+
     processed_dir = get_processed_dir()
 
     resolved_daily = daily_path or _pick_existing_path(
@@ -521,15 +897,25 @@ def build_sql_mart_command(
             sleep_path=resolved_sleep,
             quality_path=resolved_quality,
             overwrite=overwrite,
+            incremental=incremental,
+            materialize=materialize,
+            mode=mode,
+            date_range=(since, until) if since or until else None,
         )
-    except (FileNotFoundError, ModuleNotFoundError) as err:
+    except (FileNotFoundError, ModuleNotFoundError, ValueError) as err:
         _info(str(err))
         raise typer.Exit(code=1) from err
 
+    record_rows(rows_out=summary.fact_daily_rows)
+    record_output(summary.db_path)
     _info(f"DuckDB mart: {summary.db_path}")
     _info(f"Daily source: {summary.daily_source}")
     _info(f"Sleep source: {summary.sleep_source or 'fact_daily fallback'}")
     _info(f"Quality source: {summary.quality_source or 'fact_daily fallback'}")
+    if since or until:
+        _info(f"Date range: {since.date() if since else 'start'} to {until.date() if until else 'end'}")
+    if summary.mode != "table":
+        _info(f"Mode: {summary.mode} (fact_* are views over the parquet sources)")
     _info(
         "Tables: "
         f"fact_daily={summary.fact_daily_rows}, "
@@ -541,9 +927,16 @@ def build_sql_mart_command(
         f"vw_day_to_next_sleep={summary.day_to_next_sleep_rows}, "
         f"vw_weekday_profiles={summary.weekday_profile_rows}"
     )
+    if incremental:
+        for refresh in summary.refreshes:
+            _info(f"{refresh.table}: {refresh.action} (upserted={refresh.upserted}, deleted={refresh.deleted})")
+        _info(f"Views: {'rebuilt' if summary.views_rebuilt else 'unchanged'}")
+    if materialize:
+        _info(f"Materialized: {', '.join(summary.materialized) or 'up to date'}")
 
 
 @app.command("run-sql-portfolio")
+@instrumented("run-sql-portfolio")
 def run_sql_portfolio(
     db_path: Path = typer.Option(
         None,
@@ -560,8 +953,31 @@ def run_sql_portfolio(
         "--out-dir",
         help="Directory for CSV outputs (default: reports/sql/duckdb)",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        min=1,
+        help="Run up to N queries at once on cursors of one read-only connection",
+    ),
+    repeat: int = typer.Option(
+        1,
+        "--repeat",
+        min=1,
+        help="Run each query N times and report p50/p95 latency (benchmark mode)",
+    ),
+    output_format: str = typer.Option(
+        "csv",
+        "--format",
+        help="Result file format: csv, parquet, or arrow (parquet/arrow keep column types)",
+    ),
 ) -> None:
     """Run SQL showcase queries against the DuckDB mart and export CSV results."""
+    from .sql import run_sql_directory
+
+    if output_format not in {"csv", "parquet", "arrow"}:
+        _info("Invalid --format. Expected one of: csv, parquet, arrow")
+        raise typer.Exit(code=1)
+
     repo_root = get_repo_root()
     processed_dir = get_processed_dir()
 
@@ -574,14 +990,233 @@ def run_sql_portfolio(
             db_path=resolved_db,
             query_dir=resolved_query_dir,
             output_dir=resolved_out_dir,
+            jobs=jobs,
+            repeat=repeat,
+            output_format=output_format,
         )
     except (FileNotFoundError, ModuleNotFoundError) as err:
         _info(str(err))
         raise typer.Exit(code=1) from err
 
+    record_rows(rows_out=sum(result.rows for result in results))
+    record_output(*(result.output_path for result in results))
     _info(f"Executed SQL files: {len(results)}")
     for result in results:
+        latency = ""
+        if repeat > 1:
+            latency = f", p50={result.p50_seconds * 1000:.1f}ms, p95={result.p95_seconds * 1000:.1f}ms"
         _info(
-            f"{result.query_path.name} -> {result.output_csv_path} "
-            f"(rows={result.rows}, cols={result.columns})"
+            f"{result.query_path.name} -> {result.output_path} "
+            f"(rows={result.rows}, cols={result.columns}{latency})"
         )
+
+
+def _pipeline_stages(
+    config: QualityConfig,
+    *,
+    quality_options: dict[str, Any],
+    max_sample_values: int,
+    markdown_mode: str,
+    allow_identifiers: bool,
+) -> list[Stage]:
+    """Describe the CLI stages as a dependency graph for ``run``."""
+    from .pipeline import Stage
+
+    export_dir = get_export_dir()
+    processed_dir = get_processed_dir()
+    reports_dir = get_repo_root() / "reports"
+    uds_files = tuple(list_uds_files(export_dir))
+    sleep_files = tuple(list_sleep_files(export_dir))
+
+    daily_uds = processed_dir / "daily_uds.parquet"
+    sleep = processed_dir / "sleep.parquet"
+    daily = processed_dir / "daily.parquet"
+    daily_sanitized = processed_dir / "daily_sanitized.parquet"
+    sleep_sanitized = processed_dir / "sleep_sanitized.parquet"
+    daily_quality = processed_dir / "daily_quality.parquet"
+
+    dictionary_outputs = [reports_dir / "data_dictionary.csv"]
+    if markdown_mode in {"full", "both"}:
+        dictionary_outputs.append(reports_dir / "data_dictionary.md")
+    if markdown_mode in {"summary", "both"}:
+        dictionary_outputs.append(reports_dir / "data_dictionary_summary.md")
+
+    # Commands are called with every option spelled out: their typer.Option
+    # defaults are only resolved when invoked through the CLI.
+    return [
+        Stage(
+            name="discover",
+            action=discover,
+            inputs=uds_files + sleep_files,
+            outputs=(get_interim_dir() / "inventory.csv",),
+        ),
+        Stage(
+            name="ingest-uds",
+            action=lambda: ingest_uds(
+                workers=1, incremental=False, stream=False, batch_size=None, partition_by="none"
+            ),
+            inputs=uds_files,
+            outputs=(daily_uds,),
+        ),
+        Stage(
+            name="ingest-sleep",
+            action=lambda: ingest_sleep(
+                workers=1, incremental=False, stream=False, batch_size=None, partition_by="none"
+            ),
+            inputs=sleep_files,
+            outputs=(sleep,),
+        ),
+        Stage(
+            name="build-daily",
+            action=lambda: build_daily(partition_by="none"),
+            deps=("ingest-uds", "ingest-sleep"),
+            inputs=(daily_uds, sleep),
+            outputs=(daily,),
+        ),
+        Stage(
+            name="sanitize",
+            action=lambda: sanitize(
+                input=None,
+                output=None,
+                report=None,
+                inplace=False,
+                allow_identifiers=allow_identifiers,
+                jobs=1,
+                guid_sample="head",
+                guid_cache=False,
+                partition_by="none",
+            ),
+            deps=("build-daily",),
+            inputs=(daily, daily_uds, sleep),
+            outputs=(
+                daily_sanitized,
+                processed_dir / "daily_uds_sanitized.parquet",
+                sleep_sanitized,
+                processed_dir / "sanitize_report.json",
+            ),
+            params={"allow_identifiers": allow_identifiers},
+        ),
+        Stage(
+            name="quality",
+            action=lambda: quality(
+                input=None,
+                out_dir=None,
+                output_parquet=None,
+                no_parquet=False,
+                partition_by="none",
+                **quality_options,
+            ),
+            deps=("sanitize",),
+            inputs=(daily_sanitized,),
+            outputs=(
+                reports_dir / "quality_summary.md",
+                reports_dir / "suspicious_days.csv",
+                reports_dir / "suspicious_days_artifacts.csv",
+                daily_quality,
+            ),
+            params=asdict(config),
+        ),
+        Stage(
+            name="data-dictionary",
+            action=lambda: data_dictionary(
+                input=None,
+                out_dir=None,
+                max_sample_values=max_sample_values,
+                markdown_mode=markdown_mode,
+                stream=False,
+                batch_size=None,
+                jobs=1,
+            ),
+            deps=("sanitize",),
+            inputs=(daily_sanitized, daily, sleep),
+            outputs=tuple(dictionary_outputs),
+            params={"max_sample_values": max_sample_values, "markdown_mode": markdown_mode},
+        ),
+        Stage(
+            name="build-sql-mart",
+            action=lambda: build_sql_mart_command(
+                db_path=None,
+                daily_path=None,
+                sleep_path=None,
+                quality_path=None,
+                overwrite=True,
+                incremental=False,
+                materialize=False,
+                mode="table",
+                since=None,
+                until=None,
+            ),
+            deps=("sanitize", "quality"),
+            inputs=(daily_sanitized, sleep_sanitized, daily_quality),
+            outputs=(processed_dir / "analytics.duckdb",),
+        ),
+    ]
+
+
+@app.command("run")
+@instrumented("run")
+def run(
+    force: bool = typer.Option(False, "--force", help="Re-run every stage even if it is up to date"),
+    jobs: int = typer.Option(2, "--jobs", min=1, help="Run up to N independent stages at once"),
+    allow_identifiers: bool = typer.Option(
+        False,
+        "--allow-identifiers",
+        help="Dangerous: passed to sanitize (not recommended)",
+    ),
+    max_sample_values: int = typer.Option(5, "--max-sample-values", help="Passed to data-dictionary"),
+    markdown_mode: str = typer.Option("full", "--markdown-mode", help="Passed to data-dictionary"),
+    steps_min: int = typer.Option(50, "--steps-min", help="Passed to quality"),
+    stress_any_hours: float = typer.Option(6.0, "--stress-any-hours", help="Passed to quality"),
+    stress_full_hours: float = typer.Option(20.0, "--stress-full-hours", help="Passed to quality"),
+    strict_min_score: int = typer.Option(4, "--strict-min-score", help="Passed to quality"),
+    loose_min_score: int = typer.Option(3, "--loose-min-score", help="Passed to quality"),
+    top_n: int = typer.Option(50, "--top-n", help="Passed to quality"),
+) -> None:
+    """Run discover through build-sql-mart, skipping stages that are up to date."""
+    from .pipeline import run_pipeline
+    from .quality.quality import QualityConfig
+
+    if markdown_mode not in {"full", "summary", "both"}:
+        _info("Invalid --markdown-mode. Expected one of: full, summary, both")
+        raise typer.Exit(code=1)
+
+    quality_options: dict[str, Any] = {
+        "steps_min": steps_min,
+        "stress_any_hours": stress_any_hours,
+        "stress_full_hours": stress_full_hours,
+        "strict_min_score": strict_min_score,
+        "loose_min_score": loose_min_score,
+        "top_n": top_n,
+    }
+    config = QualityConfig(
+        steps_min=steps_min,
+        stress_any_min_seconds=int(stress_any_hours * 3600),
+        stress_full_min_seconds=int(stress_full_hours * 3600),
+        strict_min_score=strict_min_score,
+        loose_min_score=loose_min_score,
+        top_n=top_n,
+    )
+    stages = _pipeline_stages(
+        config,
+        quality_options=quality_options,
+        max_sample_values=max_sample_values,
+        markdown_mode=markdown_mode,
+        allow_identifiers=allow_identifiers,
+    )
+
+    def _on_event(name: str, event: str) -> None:
+        _info(f"{name}: {'up to date, skipped' if event == 'skip' else 'running'}")
+
+    results = run_pipeline(
+        stages,
+        state_path=get_interim_dir() / "pipeline_state.json",
+        force=force,
+        jobs=jobs,
+        on_event=_on_event,
+    )
+
+    for result in results:
+        detail = f" ({result.error})" if result.error else ""
+        _info(f"{result.name}: {result.status} ({result.seconds:.2f}s){detail}")
+    if any(result.status in {"failed", "blocked"} for result in results):
+        raise typer.Exit(code=1)
@@ -1,23 +1,23 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
+from ..features import EDA_FEATURES, STRESS_TOTAL_ALIAS_MAP, FeatureFrame
+from ..util.partitions import DateRange, read_table
 
-STRESS_TOTAL_ALIAS_MAP: dict[str, str] = {
-    "stress_total_avg_level": "allDayStress_TOTAL_averageStressLevel",
-    "stress_total_total_duration_s": "allDayStress_TOTAL_totalDuration",
-    "stress_total_stress_duration_s": "allDayStress_TOTAL_stressDuration",
-    "stress_total_rest_s": "allDayStress_TOTAL_restDuration",
-    "stress_total_low_s": "allDayStress_TOTAL_lowDuration",
-    "stress_total_med_s": "allDayStress_TOTAL_mediumDuration",
-    "stress_total_high_s": "allDayStress_TOTAL_highDuration",
-    "stress_total_activity_s": "allDayStress_TOTAL_activityDuration",
-    "stress_total_uncat_s": "allDayStress_TOTAL_uncategorizedDuration",
-}
+__all__ = [
+    "STRESS_TOTAL_ALIAS_MAP",
+    "add_derived_features",
+    "build_eda_frames",
+    "eda_readiness_summary",
+    "load_daily_sanitized",
+    "load_quality",
+]
 
 
 def _normalize_calendar_date(series: pd.Series) -> pd.Series:
@@ -33,24 +33,46 @@ def _ensure_unique_calendar_date(df: pd.DataFrame, label: str) -> None:
         raise ValueError(f"{label} has duplicate calendarDate rows: {dupes}")
 
 
-def load_daily_sanitized(path: str | Path) -> pd.DataFrame:
-    df = pd.read_parquet(path)
+def load_daily_sanitized(
+    path: str | Path,
+    *,
+    columns: Sequence[str] | None = None,
+    date_range: DateRange | None = None,
+) -> pd.DataFrame:
+    """Load the daily table (file or month-partitioned directory).
+
+    ``columns`` and ``date_range`` are pushed down to the parquet reader;
+    ``calendarDate`` is always loaded.
+    """
+    if columns is not None and "calendarDate" not in columns:
+        columns = ["calendarDate", *columns]
+    df = read_table(Path(path), columns=columns, date_range=date_range)
     if "calendarDate" not in df.columns:
         raise KeyError("daily dataset is missing calendarDate")
-    out = df.copy()
-    out["calendarDate"] = _normalize_calendar_date(out["calendarDate"])
-    _ensure_unique_calendar_date(out, "daily")
-    return out
-
-
-def load_quality(path: str | Path) -> pd.DataFrame:
-    df = pd.read_parquet(path)
+    df["calendarDate"] = _normalize_calendar_date(df["calendarDate"])
+    _ensure_unique_calendar_date(df, "daily")
+    return df
+
+
+def load_quality(
+    path: str | Path,
+    *,
+    columns: Sequence[str] | None = None,
+    date_range: DateRange | None = None,
+) -> pd.DataFrame:
+    """Load the quality table (file or month-partitioned directory).
+
+    ``columns`` and ``date_range`` are pushed down to the parquet reader;
+    ``calendarDate`` is always loaded.
+    """
+    if columns is not None and "calendarDate" not in columns:
+        columns = ["calendarDate", *columns]
+    df = read_table(Path(path), columns=columns, date_range=date_range)
     if "calendarDate" not in df.columns:
         raise KeyError("quality dataset is missing calendarDate")
-    out = df.copy()
-    out["calendarDate"] = _normalize_calendar_date(out["calendarDate"])
-    _ensure_unique_calendar_date(out, "quality")
-    return out
+    df["calendarDate"] = _normalize_calendar_date(df["calendarDate"])
+    _ensure_unique_calendar_date(df, "quality")
+    return df
 
 
 def build_eda_frames(
@@ -97,71 +119,10 @@ def build_eda_frames(
 
 
 def add_derived_features(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-
-    if "calendarDate" not in out.columns:
+    """Copy of ``df`` with the Stage 2 features (``EDA_FEATURES``) its columns allow."""
+    if "calendarDate" not in df.columns:
         raise KeyError("DataFrame is missing calendarDate")
-
-    out["calendarDate"] = _normalize_calendar_date(out["calendarDate"])
-    out["date"] = out["calendarDate"]
-    out["year"] = out["calendarDate"].dt.year
-    out["month"] = out["calendarDate"].dt.month
-    out["week"] = out["calendarDate"].dt.isocalendar().week.astype("Int64")
-    out["dayofweek"] = out["calendarDate"].dt.dayofweek
-
-    # Readability aliases for stress TOTAL breakdown (keep originals untouched).
-    for alias, original in STRESS_TOTAL_ALIAS_MAP.items():
-        if original in out.columns and alias not in out.columns:
-            out[alias] = out[original]
-
-    if "stressTotalDurationSeconds" in out.columns:
-        out["stress_hours"] = pd.to_numeric(out["stressTotalDurationSeconds"], errors="coerce") / 3600.0
-    if "stressAwakeDurationSeconds" in out.columns:
-        out["awake_stress_hours"] = pd.to_numeric(out["stressAwakeDurationSeconds"], errors="coerce") / 3600.0
-    if "totalSteps" in out.columns:
-        out["steps_k"] = pd.to_numeric(out["totalSteps"], errors="coerce") / 1000.0
-    if "totalDistanceMeters" in out.columns:
-        out["distance_km"] = pd.to_numeric(out["totalDistanceMeters"], errors="coerce") / 1000.0
-    if "activeSeconds" in out.columns:
-        out["active_hours"] = pd.to_numeric(out["activeSeconds"], errors="coerce") / 3600.0
-
-    if "bodyBatteryEndOfDay" in out.columns and "bodyBatteryStartOfDay" in out.columns:
-        bb_end = pd.to_numeric(out["bodyBatteryEndOfDay"], errors="coerce")
-        bb_start = pd.to_numeric(out["bodyBatteryStartOfDay"], errors="coerce")
-        out["bb_delta"] = bb_end - bb_start
-
-    sleep_parts = [
-        c
-        for c in ["deepSleepSeconds", "lightSleepSeconds", "remSleepSeconds", "awakeSleepSeconds"]
-        if c in out.columns
-    ]
-    if sleep_parts:
-        sleep_df = out[sleep_parts].apply(pd.to_numeric, errors="coerce")
-        out["sleep_total_seconds"] = sleep_df.sum(axis=1, min_count=1)
-        out["sleep_total_hours"] = out["sleep_total_seconds"] / 3600.0
-
-        core_cols = [c for c in ["deepSleepSeconds", "lightSleepSeconds", "remSleepSeconds"] if c in sleep_df.columns]
-        core_sum = sleep_df[core_cols].sum(axis=1, min_count=1) if core_cols else pd.Series(np.nan, index=out.index)
-
-        total = out["sleep_total_seconds"]
-        valid_total = total.where(total > 0)
-        out["sleep_efficiency"] = core_sum / valid_total
-
-        if "deepSleepSeconds" in sleep_df.columns:
-            out["deep_pct"] = sleep_df["deepSleepSeconds"] / valid_total
-        if "remSleepSeconds" in sleep_df.columns:
-            out["rem_pct"] = sleep_df["remSleepSeconds"] / valid_total
-        if "lightSleepSeconds" in sleep_df.columns:
-            out["light_pct"] = sleep_df["lightSleepSeconds"] / valid_total
-        if "awakeSleepSeconds" in sleep_df.columns:
-            out["awake_pct"] = sleep_df["awakeSleepSeconds"] / valid_total
-
-    if "latestSpo2Value" in out.columns and "lowestSpo2Value" in out.columns:
-        latest = pd.to_numeric(out["latestSpo2Value"], errors="coerce")
-        lowest = pd.to_numeric(out["lowestSpo2Value"], errors="coerce")
-        out["spo2_gap"] = latest - lowest
-
-    return out
+    return FeatureFrame(df.copy()).attach(EDA_FEATURES)
 
 
 def eda_readiness_summary(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
@@ -0,0 +1,29 @@
+"""Registry of derived daily features, computed on demand from their sources."""
+
+from .daily import EDA_FEATURES, MODELING_FEATURES, STRESS_TOTAL_ALIAS_MAP
+from .registry import (
+    FEATURES,
+    Feature,
+    FeatureFrame,
+    available_features,
+    clear_feature_cache,
+    compute_features,
+    feature,
+    feature_sources,
+    register_feature,
+)
+
+__all__ = [
+    "EDA_FEATURES",
+    "FEATURES",
+    "MODELING_FEATURES",
+    "STRESS_TOTAL_ALIAS_MAP",
+    "Feature",
+    "FeatureFrame",
+    "available_features",
+    "clear_feature_cache",
+    "compute_features",
+    "feature",
+    "feature_sources",
+    "register_feature",
+]
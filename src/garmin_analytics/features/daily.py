@@ -0,0 +1,322 @@
+"""Derived features of the daily table, registered in :mod:`.registry`.
+
+``EDA_FEATURES`` is the Stage 2 layer (``add_derived_features``) and
+``MODELING_FEATURES`` the Stage 3 layer added on top of it
+(``add_modeling_features``), each in the column order those functions
+produce.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from .registry import Feature, FeatureFrame, feature, register_feature
+
+STRESS_TOTAL_ALIAS_MAP: dict[str, str] = {
+    "stress_total_avg_level": "allDayStress_TOTAL_averageStressLevel",
+    "stress_total_total_duration_s": "allDayStress_TOTAL_totalDuration",
+    "stress_total_stress_duration_s": "allDayStress_TOTAL_stressDuration",
+    "stress_total_rest_s": "allDayStress_TOTAL_restDuration",
+    "stress_total_low_s": "allDayStress_TOTAL_lowDuration",
+    "stress_total_med_s": "allDayStress_TOTAL_mediumDuration",
+    "stress_total_high_s": "allDayStress_TOTAL_highDuration",
+    "stress_total_activity_s": "allDayStress_TOTAL_activityDuration",
+    "stress_total_uncat_s": "allDayStress_TOTAL_uncategorizedDuration",
+}
+
+SLEEP_STAGE_COLUMNS: tuple[str, ...] = ("deepSleepSeconds", "lightSleepSeconds", "remSleepSeconds", "awakeSleepSeconds")
+CORE_SLEEP_STAGE_COLUMNS: tuple[str, ...] = SLEEP_STAGE_COLUMNS[:3]
+
+STRESS_CONTEXTS: dict[str, str] = {"AWAKE": "awake", "ASLEEP": "sleep", "TOTAL": "total"}
+STRESS_DURATION_ALIASES: dict[str, str] = {
+    "activityDuration": "ActivityHours",
+    "lowDuration": "LowStressHours",
+    "mediumDuration": "MediumStressHours",
+    "highDuration": "HighStressHours",
+    "restDuration": "RestHours",
+    "uncategorizedDuration": "UncatHours",
+    "totalDuration": "MeasuredHours",
+}
+STRESS_SHARE_STEMS: tuple[str, ...] = ("Activity", "LowStress", "MediumStress", "HighStress", "Rest", "Uncat")
+
+WELLNESS_TIME_COLUMNS: tuple[str, ...] = (
+    "wellnessStartTimeGmt",
+    "wellnessStartTimeLocal",
+    "wellnessEndTimeGmt",
+    "wellnessEndTimeLocal",
+)
+
+
+def normalize_calendar_date(series: pd.Series) -> pd.Series:
+    parsed = pd.to_datetime(series, errors="coerce")
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.dt.normalize()
+
+
+def _scaled(name: str, source: str, divisor: float, *, keep_existing: bool = False) -> None:
+    register_feature(
+        Feature(name, lambda cols: cols.numeric(source) / divisor, sources=(source,), keep_existing=keep_existing)
+    )
+
+
+def _difference(name: str, left: str, right: str, *, keep_existing: bool = False) -> None:
+    register_feature(
+        Feature(
+            name,
+            lambda cols: cols.numeric(left) - cols.numeric(right),
+            sources=(left, right),
+            keep_existing=keep_existing,
+        )
+    )
+
+
+def _alias(name: str, source: str, *, numeric: bool = False, keep_existing: bool = True) -> None:
+    compute: Callable[[FeatureFrame], pd.Series] = (
+        (lambda cols: cols.numeric(source)) if numeric else (lambda cols: cols[source])
+    )
+    register_feature(Feature(name, compute, sources=(source,), keep_existing=keep_existing))
+
+
+# --- Stage 2 (EDA) layer -------------------------------------------------------
+
+
+@feature("calendarDate", sources=("calendarDate",))
+def _calendar_date(cols: FeatureFrame) -> pd.Series:
+    return normalize_calendar_date(cols["calendarDate"])
+
+
+@feature("date", sources=("calendarDate",))
+def _date(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"]
+
+
+@feature("year", sources=("calendarDate",))
+def _year(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"].dt.year
+
+
+@feature("month", sources=("calendarDate",))
+def _month(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"].dt.month
+
+
+@feature("week", sources=("calendarDate",))
+def _week(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"].dt.isocalendar().week.astype("Int64")
+
+
+@feature("dayofweek", sources=("calendarDate",))
+def _dayofweek(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"].dt.dayofweek
+
+
+# Readability aliases for stress TOTAL breakdown (keep originals untouched).
+for _alias_name, _original in STRESS_TOTAL_ALIAS_MAP.items():
+    _alias(_alias_name, _original)
+
+_scaled("stress_hours", "stressTotalDurationSeconds", 3600.0)
+_scaled("awake_stress_hours", "stressAwakeDurationSeconds", 3600.0)
+_scaled("steps_k", "totalSteps", 1000.0)
+_scaled("distance_km", "totalDistanceMeters", 1000.0)
+_scaled("active_hours", "activeSeconds", 3600.0)
+_difference("bb_delta", "bodyBatteryEndOfDay", "bodyBatteryStartOfDay")
+
+
+def _stage_sum(cols: FeatureFrame, stages: tuple[str, ...]) -> pd.Series:
+    present = [c for c in stages if c in cols]
+    if not present:
+        return pd.Series(np.nan, index=cols.index)
+    return pd.concat([cols.numeric(c) for c in present], axis=1).sum(axis=1, min_count=1)
+
+
+def _valid_sleep_total(cols: FeatureFrame) -> pd.Series:
+    total = cols["sleep_total_seconds"]
+    return total.where(total > 0)
+
+
+@feature("sleep_total_seconds", any_of=SLEEP_STAGE_COLUMNS)
+def _sleep_total_seconds(cols: FeatureFrame) -> pd.Series:
+    return _stage_sum(cols, SLEEP_STAGE_COLUMNS)
+
+
+@feature("sleep_total_hours", sources=("sleep_total_seconds",), any_of=SLEEP_STAGE_COLUMNS)
+def _sleep_total_hours(cols: FeatureFrame) -> pd.Series:
+    return cols["sleep_total_seconds"] / 3600.0
+
+
+@feature("sleep_efficiency", sources=("sleep_total_seconds",), any_of=SLEEP_STAGE_COLUMNS)
+def _sleep_efficiency(cols: FeatureFrame) -> pd.Series:
+    return _stage_sum(cols, CORE_SLEEP_STAGE_COLUMNS) / _valid_sleep_total(cols)
+
+
+def _stage_share(name: str, stage: str) -> None:
+    register_feature(
+        Feature(
+            name,
+            lambda cols: cols.numeric(stage) / _valid_sleep_total(cols),
+            sources=(stage, "sleep_total_seconds"),
+        )
+    )
+
+
+_stage_share("deep_pct", "deepSleepSeconds")
+_stage_share("rem_pct", "remSleepSeconds")
+_stage_share("light_pct", "lightSleepSeconds")
+_stage_share("awake_pct", "awakeSleepSeconds")
+_difference("spo2_gap", "latestSpo2Value", "lowestSpo2Value")
+
+EDA_FEATURES: tuple[str, ...] = (
+    "calendarDate",
+    "date",
+    "year",
+    "month",
+    "week",
+    "dayofweek",
+    *STRESS_TOTAL_ALIAS_MAP,
+    "stress_hours",
+    "awake_stress_hours",
+    "steps_k",
+    "distance_km",
+    "active_hours",
+    "bb_delta",
+    "sleep_total_seconds",
+    "sleep_total_hours",
+    "sleep_efficiency",
+    "deep_pct",
+    "rem_pct",
+    "light_pct",
+    "awake_pct",
+    "spo2_gap",
+)
+
+
+# --- Stage 3 (modeling) layer --------------------------------------------------
+
+
+@feature("step_length_m", sources=("totalSteps", "totalDistanceMeters"), keep_existing=True)
+def _step_length_m(cols: FeatureFrame, min_steps: int = 1000) -> np.ndarray:
+    steps = cols.numeric("totalSteps")
+    dist = cols.numeric("totalDistanceMeters")
+    return np.where(steps >= min_steps, dist / steps, np.nan)
+
+
+_scaled("highly_active_hours", "highlyActiveSeconds", 3600.0, keep_existing=True)
+_alias("bodyBatteryCharged", "bodyBattery_chargedValue", numeric=True)
+_alias("bodyBatteryDrained", "bodyBattery_drainedValue", numeric=True)
+_difference("bodyBatteryNetBalance", "bodyBatteryCharged", "bodyBatteryDrained", keep_existing=True)
+
+
+def _stress_share(name: str, hours: str, total: str) -> None:
+    def compute(cols: FeatureFrame) -> pd.Series:
+        numer = cols.numeric(hours)
+        measured = cols.numeric(total)
+        mask = measured.notna() & numer.notna() & (measured > 0)
+        # Int64 inputs divide to Float64/pd.NA; shares are plain float64/NaN.
+        return (numer / measured).where(mask).astype("float64")
+
+    register_feature(Feature(name, compute, sources=(hours, total)))
+
+
+def _register_stress_context(context: str, prefix: str) -> tuple[str, ...]:
+    """Readable aliases plus hours/shares for Garmin allDayStress_<CONTEXT> fields."""
+    base = f"allDayStress_{context}_"
+    _alias(f"{prefix}AverageStressLevel", base + "averageStressLevel", numeric=True, keep_existing=False)
+    for suffix, stem in STRESS_DURATION_ALIASES.items():
+        _scaled(f"{prefix}{stem}", base + suffix, 3600.0)
+    for stem in STRESS_SHARE_STEMS:
+        _stress_share(f"{prefix}{stem}Share", f"{prefix}{stem}Hours", f"{prefix}MeasuredHours")
+    return (
+        f"{prefix}AverageStressLevel",
+        *(f"{prefix}{stem}" for stem in STRESS_DURATION_ALIASES.values()),
+        *(f"{prefix}{stem}Share" for stem in STRESS_SHARE_STEMS),
+    )
+
+
+STRESS_CONTEXT_FEATURES: dict[str, tuple[str, ...]] = {
+    context: _register_stress_context(context, prefix) for context, prefix in STRESS_CONTEXTS.items()
+}
+
+
+def _row_garmin_offset_hours(cols: FeatureFrame) -> pd.Series:
+    out = pd.Series(np.nan, index=cols.index, dtype="float64")
+    for gmt_col, local_col in [("wellnessStartTimeGmt", "wellnessStartTimeLocal"), ("wellnessEndTimeGmt", "wellnessEndTimeLocal")]:
+        if gmt_col in cols and local_col in cols:
+            gmt_ts = pd.to_datetime(cols[gmt_col], errors="coerce")
+            local_ts = pd.to_datetime(cols[local_col], errors="coerce")
+            delta_h = (local_ts - gmt_ts).dt.total_seconds() / 3600.0
+            out = out.where(~out.isna(), delta_h)
+    return out
+
+
+@feature(
+    "sleep_start_hour_local",
+    sources=("sleepStartTimestampGMT",),
+    optional=WELLNESS_TIME_COLUMNS,
+    keep_existing=True,
+)
+def _sleep_start_hour_local(cols: FeatureFrame) -> pd.Series:
+    sleep_start_utc = pd.to_datetime(
+        cols.numeric("sleepStartTimestampGMT"),
+        unit="s",
+        utc=True,
+        errors="coerce",
+    )
+    offset_h = _row_garmin_offset_hours(cols)
+    local_dt = sleep_start_utc.copy()
+    mask = offset_h.notna() & sleep_start_utc.notna()
+    if mask.any():
+        local_dt.loc[mask] = sleep_start_utc.loc[mask] + pd.to_timedelta(offset_h.loc[mask], unit="h")
+    return (
+        local_dt.dt.hour.astype("float64")
+        + local_dt.dt.minute.astype("float64") / 60.0
+        + local_dt.dt.second.astype("float64") / 3600.0
+    )
+
+
+@feature("sleep_start_hour_local_wrapped", sources=("sleep_start_hour_local",))
+def _sleep_start_hour_local_wrapped(cols: FeatureFrame, wrap_at: float = 18.0) -> np.ndarray:
+    h = cols.numeric("sleep_start_hour_local")
+    return np.where(h >= wrap_at, h - 24.0, h)
+
+
+@feature("sleep_opportunity_hours", sources=("sleepStartTimestampGMT", "sleepEndTimestampGMT"), keep_existing=True)
+def _sleep_opportunity_hours(cols: FeatureFrame) -> pd.Series:
+    duration_h = (cols.numeric("sleepEndTimestampGMT") - cols.numeric("sleepStartTimestampGMT")) / 3600.0
+    return duration_h.where(duration_h > 0)
+
+
+@feature("day_of_week", sources=("calendarDate",))
+def _day_of_week(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"].dt.dayofweek
+
+
+@feature("weekday_name", sources=("calendarDate",))
+def _weekday_name(cols: FeatureFrame) -> pd.Series:
+    return cols["calendarDate"].dt.day_name()
+
+
+@feature("is_weekend", sources=("day_of_week",))
+def _is_weekend(cols: FeatureFrame) -> pd.Series:
+    return cols["day_of_week"].isin([5, 6]).astype("boolean")
+
+
+MODELING_FEATURES: tuple[str, ...] = (
+    "step_length_m",
+    "highly_active_hours",
+    "bodyBatteryCharged",
+    "bodyBatteryDrained",
+    "bodyBatteryNetBalance",
+    *STRESS_CONTEXT_FEATURES["AWAKE"],
+    *STRESS_CONTEXT_FEATURES["ASLEEP"],
+    *STRESS_CONTEXT_FEATURES["TOTAL"],
+    "sleep_start_hour_local",
+    "sleep_start_hour_local_wrapped",
+    "sleep_opportunity_hours",
+    "calendarDate",
+    "day_of_week",
+    "weekday_name",
+    "is_weekend",
+)
@@ -0,0 +1,304 @@
+"""Declarative registry of derived daily features.
+
+Each :class:`Feature` names the columns it reads and a function computing it
+from them. Sources can be raw columns or other features, so asking for one
+feature computes only what it depends on::
+
+    compute_features(daily, ["awakeHighStressShare", "sleep_efficiency"])
+
+A feature is available when its required sources are (recursively).
+Otherwise a column of the same name already in the frame is used as is, so
+frames that went through the full feature layer once can be queried again.
+``keep_existing`` features always prefer such a column.
+
+:func:`compute_features` memoizes results on a fingerprint of the raw
+columns each feature reads, so notebooks and feature-selection loops that ask
+for the same features again skip the work. The definitions live in
+:mod:`garmin_analytics.features.daily`.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+FEATURE_CACHE_SIZE = 512
+
+FeatureValues = pd.Series | np.ndarray
+
+
+@dataclass(frozen=True)
+class Feature:
+    """One derived column.
+
+    ``sources`` must all be available; ``any_of`` needs at least one of its
+    columns; ``optional`` columns are read when present. A source with the
+    feature's own name refers to the frame's column (e.g. ``calendarDate``
+    normalizes itself).
+    """
+
+    name: str
+    compute: Callable[[FeatureFrame], FeatureValues]
+    sources: tuple[str, ...] = ()
+    any_of: tuple[str, ...] = ()
+    optional: tuple[str, ...] = ()
+    keep_existing: bool = False
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        return (*self.sources, *self.any_of, *self.optional)
+
+
+FEATURES: dict[str, Feature] = {}
+
+
+def register_feature(feature: Feature) -> Feature:
+    if feature.name in FEATURES:
+        raise ValueError(f"Feature already registered: {feature.name}")
+    FEATURES[feature.name] = feature
+    return feature
+
+
+def feature(
+    name: str,
+    *,
+    sources: tuple[str, ...] = (),
+    any_of: tuple[str, ...] = (),
+    optional: tuple[str, ...] = (),
+    keep_existing: bool = False,
+) -> Callable[[Callable[[FeatureFrame], FeatureValues]], Callable[[FeatureFrame], FeatureValues]]:
+    """Register the decorated function as the compute function of feature ``name``."""
+
+    def decorator(func: Callable[[FeatureFrame], FeatureValues]) -> Callable[[FeatureFrame], FeatureValues]:
+        register_feature(Feature(name, func, sources, any_of, optional, keep_existing))
+        return func
+
+    return decorator
+
+
+def feature_sources(names: Iterable[str]) -> list[str]:
+    """Every column ``names`` may read from a frame, in dependency order.
+
+    Includes intermediate feature names, which a frame may already carry.
+    Useful as a superset for the ``columns=`` of the parquet loaders.
+    """
+    seen: dict[str, None] = {}
+
+    def visit(name: str) -> None:
+        if name in seen:
+            return
+        seen[name] = None
+        feature_def = FEATURES.get(name)
+        if feature_def is not None:
+            for source in feature_def.inputs:
+                visit(source)
+
+    for name in names:
+        visit(name)
+    return list(seen)
+
+
+class _FeatureCache:
+    """Bounded LRU of computed feature columns keyed on input fingerprints."""
+
+    def __init__(self, max_entries: int = FEATURE_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], pd.Series] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> pd.Series | None:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+            return values
+
+    def put(self, key: tuple[str, str], values: pd.Series) -> None:
+        with self._lock:
+            self._entries[key] = values
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = _FeatureCache()
+
+
+def clear_feature_cache() -> None:
+    _cache.clear()
+
+
+class FeatureFrame:
+    """Read-through view of a frame that computes registered features on demand.
+
+    Compute functions receive it in place of a DataFrame: ``name in cols``
+    says whether a column or feature is available and ``cols[name]`` returns
+    it, computing it first if needed. Computed columns are kept in a dict, not
+    inserted into the frame, and :meth:`attach` adds the requested ones with a
+    single ``concat``.
+    """
+
+    def __init__(self, frame: pd.DataFrame, *, cache: _FeatureCache | None = None) -> None:
+        self.frame = frame
+        self.derived: dict[str, pd.Series] = {}
+        self._cache = cache
+        self._available: dict[str, bool] = {}
+        self._computing: set[str] = set()
+        self._raw_inputs: dict[str, frozenset[str]] = {}
+        self._digests: dict[str, str] = {}
+        self._index_digest: str | None = None
+
+    @property
+    def index(self) -> pd.Index:
+        return self.frame.index
+
+    def _computable(self, feature_def: Feature) -> bool:
+        if feature_def.keep_existing and feature_def.name in self.frame.columns:
+            return False
+
+        def ready(source: str) -> bool:
+            return source in self.frame.columns if source == feature_def.name else self.available(source)
+
+        if not all(ready(source) for source in feature_def.sources):
+            return False
+        return not feature_def.any_of or any(ready(source) for source in feature_def.any_of)
+
+    def available(self, name: str) -> bool:
+        if name in self._computing:
+            return name in self.frame.columns
+        cached = self._available.get(name)
+        if cached is None:
+            feature_def = FEATURES.get(name)
+            cached = name in self.frame.columns or (feature_def is not None and self._computable(feature_def))
+            self._available[name] = cached
+        return cached
+
+    def __contains__(self, name: str) -> bool:
+        return self.available(name)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        if name in self._computing:
+            return self.frame[name]
+        if name not in self.derived:
+            feature_def = FEATURES.get(name)
+            if feature_def is None or not self._computable(feature_def):
+                if name not in self.frame.columns:
+                    raise KeyError(f"Feature {name!r} is not available: its source columns are missing")
+                return self.frame[name]
+            self.derived[name] = self._compute(feature_def)
+        return self.derived[name]
+
+    def numeric(self, name: str) -> pd.Series:
+        return pd.to_numeric(self[name], errors="coerce")
+
+    def _compute(self, feature_def: Feature) -> pd.Series:
+        key = None
+        if self._cache is not None:
+            key = (feature_def.name, self._fingerprint(feature_def.name))
+            hit = self._cache.get(key)
+            if hit is not None:
+                return hit
+        self._computing.add(feature_def.name)
+        try:
+            values = feature_def.compute(self)
+        finally:
+            self._computing.discard(feature_def.name)
+        if not isinstance(values, pd.Series):
+            values = pd.Series(values, index=self.frame.index)
+        values = values.rename(feature_def.name)
+        if key is not None:
+            self._cache.put(key, values)
+        return values
+
+    def raw_inputs(self, name: str) -> frozenset[str]:
+        """Frame columns the value of ``name`` is computed from."""
+        inputs = self._raw_inputs.get(name)
+        if inputs is not None:
+            return inputs
+        feature_def = FEATURES.get(name)
+        if feature_def is None or not self._computable(feature_def):
+            inputs = frozenset({name} & set(self.frame.columns))
+        else:
+            found: set[str] = set()
+            for source in feature_def.inputs:
+                if source == name:
+                    found |= {name} & set(self.frame.columns)
+                elif self.available(source):
+                    found |= self.raw_inputs(source)
+            inputs = frozenset(found)
+        self._raw_inputs[name] = inputs
+        return inputs
+
+    def _column_digest(self, column: str) -> str:
+        digest = self._digests.get(column)
+        if digest is None:
+            values = self.frame[column]
+            try:
+                hashed = pd.util.hash_pandas_object(values, index=False)
+            except TypeError:  # unhashable objects such as lists
+                hashed = pd.util.hash_pandas_object(values.astype(str), index=False)
+            digest = hashlib.sha1(str(values.dtype).encode() + hashed.to_numpy().tobytes()).hexdigest()
+            self._digests[column] = digest
+        return digest
+
+    def _fingerprint(self, name: str) -> str:
+        if self._index_digest is None:
+            hashed = pd.util.hash_pandas_object(self.frame.index, index=False)
+            self._index_digest = hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+        parts = [self._index_digest]
+        parts.extend(f"{column}={self._column_digest(column)}" for column in sorted(self.raw_inputs(name)))
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def attach(self, names: Iterable[str]) -> pd.DataFrame:
+        """The frame plus the available features among ``names``.
+
+        Existing columns are replaced in place, so the frame must be owned by
+        the caller; new ones are appended in ``names`` order.
+        """
+        out = self.frame
+        added: dict[str, pd.Series] = {}
+        for name in names:
+            if name in added or not self.available(name):
+                continue
+            values = self[name]
+            if name not in out.columns:
+                added[name] = values
+            elif name in self.derived:
+                out[name] = values
+        if not added:
+            return out
+        return pd.concat([out, pd.DataFrame(added, index=out.index)], axis=1)
+
+
+def available_features(frame: pd.DataFrame) -> list[str]:
+    """Registered features that can be computed from (or are already in) ``frame``."""
+    cols = FeatureFrame(frame)
+    return [name for name in FEATURES if cols.available(name)]
+
+
+def compute_features(frame: pd.DataFrame, names: Iterable[str], *, cache: bool = True) -> pd.DataFrame:
+    """Compute the requested features (and only their dependencies) from ``frame``.
+
+    Returns a DataFrame with one column per name, on ``frame``'s index. A name
+    that is neither a column of ``frame`` nor an available feature raises
+    ``KeyError``. With ``cache`` (default), results are reused across calls
+    while the raw columns they read are unchanged.
+    """
+    cols = FeatureFrame(frame, cache=_cache if cache else None)
+    names = list(dict.fromkeys(names))
+    missing = [name for name in names if not cols.available(name)]
+    if missing:
+        raise KeyError(f"Features not available from this frame: {missing}")
+    return pd.DataFrame({name: cols[name] for name in names}, index=frame.index)
@@ -0,0 +1,104 @@
+"""Per-file columnar chunks shared by the UDS and sleep parsers."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ColumnChunk:
+    """Flattened rows of one export file, stored column by column.
+
+    ``types`` holds the Python type names observed per key (nulls excluded),
+    which drives dtype coercion without re-inspecting every value.
+    """
+
+    n_rows: int = 0
+    columns: dict[str, list[Any]] = field(default_factory=dict)
+    types: dict[str, set[str]] = field(default_factory=dict)
+
+
+def rows_to_chunk(rows: Iterable[dict[str, Any]]) -> ColumnChunk:
+    """Transpose flat row dicts into a chunk, padding absent keys with NaN.
+
+    Column order and padding follow ``pd.DataFrame(rows)``, which also fills
+    absent keys with NaN (so a key that is only ever None or absent becomes
+    ``float64``, as it does there).
+    """
+    columns: dict[str, list[Any]] = {}
+    seen: dict[str, set[type]] = {}
+    n_rows = 0
+    for row in rows:
+        for key, value in row.items():
+            values = columns.get(key)
+            if values is None:
+                values = columns[key] = []
+                seen[key] = set()
+            if len(values) < n_rows:
+                values.extend([np.nan] * (n_rows - len(values)))
+            values.append(value)
+            if value is not None:
+                seen[key].add(value.__class__)
+        n_rows += 1
+
+    for values in columns.values():
+        if len(values) < n_rows:
+            values.extend([np.nan] * (n_rows - len(values)))
+    types = {key: {t.__name__ for t in observed} for key, observed in seen.items()}
+    return ColumnChunk(n_rows=n_rows, columns=columns, types=types)
+
+
+def merge_chunks(chunks: list[ColumnChunk]) -> pd.DataFrame:
+    """Concatenate chunks in order into one DataFrame.
+
+    Columns missing from a chunk are padded with NaN, so the result is the
+    same frame that building all rows in a single list would produce.
+    """
+    order: dict[str, None] = {}
+    for chunk in chunks:
+        for key in chunk.columns:
+            order.setdefault(key)
+
+    data: dict[str, list[Any]] = {}
+    for key in order:
+        merged: list[Any] = []
+        for chunk in chunks:
+            values = chunk.columns.get(key)
+            merged.extend(values if values is not None else [np.nan] * chunk.n_rows)
+        data[key] = merged
+    return pd.DataFrame(data)
+
+
+def merge_chunk_types(chunks: list[ColumnChunk]) -> dict[str, set[str]]:
+    """Union the observed type names per column across chunks."""
+    merged: dict[str, set[str]] = {}
+    for chunk in chunks:
+        for key, observed in chunk.types.items():
+            merged.setdefault(key, set()).update(observed)
+    return merged
+
+
+def parse_file_chunks(
+    parse_file: Callable[[Path], ColumnChunk],
+    paths: list[Path],
+    *,
+    workers: int = 1,
+) -> list[ColumnChunk]:
+    """Run ``parse_file`` over paths, optionally in a process pool.
+
+    ``parse_file`` must be a module-level function so it can be pickled.
+    Results are always returned in input order.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if workers == 1 or len(paths) <= 1:
+        return [parse_file(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(parse_file, paths))
@@ -0,0 +1,151 @@
+"""Schema-driven dtype coercion for flattened ingest columns.
+
+While flattening, :func:`~garmin_analytics.ingest.chunks.rows_to_chunk` records
+the Python type names observed for every key. Those observed types decide each
+column's cast up front, so coercion runs one vectorized conversion per column
+instead of probing every value with ``Series.map``. Columns with ambiguous
+types fall back to the per-value checks and give the same result as before.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+
+CONTAINER_TYPES = frozenset({"list", "tuple", "dict"})
+NUMERIC_TYPES = frozenset({"int", "float"})
+
+# Share of non-null values that must be numeric-like before a mixed column is cast.
+NUMERIC_SHARE_MIN = 0.95
+
+
+def _sanitize_scalar(value: Any) -> Any:
+    """Coerce non-scalar values to None for numeric casting."""
+    if isinstance(value, (list, tuple, dict)):
+        return None
+    return value
+
+
+def classify_observed_types(observed: Iterable[str] | None) -> str:
+    """Classify a column by the types seen while flattening.
+
+    Returns ``"empty"`` (only nulls), ``"boolean"``, ``"numeric"`` (ints and
+    floats only) or ``"probe"`` when values must be inspected.
+    """
+    if observed is None:
+        return "probe"
+    types = set(observed)
+    if not types:
+        return "empty"
+    if types == {"bool"}:
+        return "boolean"
+    if types <= NUMERIC_TYPES:
+        return "numeric"
+    return "probe"
+
+
+def needs_scalar_sanitize(observed: Iterable[str] | None) -> bool:
+    """Whether a column may hold lists/dicts that must be nulled before casting."""
+    return observed is None or not CONTAINER_TYPES.isdisjoint(observed)
+
+
+def _numeric_with_int_check(numeric: pd.Series) -> pd.Series:
+    non_null = numeric.dropna()
+    is_int_like = bool((non_null % 1 == 0).all()) if not non_null.empty else False
+    return numeric.astype("Int64" if is_int_like else "Float64")
+
+
+def coerce_column(series: pd.Series, observed: Iterable[str] | None = None) -> pd.Series | None:
+    """Cast one flattened column to boolean, Int64 or Float64.
+
+    Returns None when the column should be left as is. ``observed`` may cover
+    more rows than ``series`` (rows with invalid dates are dropped later), so
+    it is only used to skip checks whose outcome it already determines.
+    """
+    observed_set = None if observed is None else set(observed)
+    kind = classify_observed_types(observed_set)
+
+    if kind == "empty":
+        return None
+
+    if kind == "boolean":
+        return series.astype("boolean") if bool(series.notna().any()) else None
+
+    if kind == "numeric":
+        numeric = pd.to_numeric(series, errors="coerce")
+        if not bool(numeric.notna().any()):
+            return None
+        return _numeric_with_int_check(numeric)
+
+    non_null = series.dropna()
+    if non_null.empty:
+        return None
+
+    if observed_set is None or "bool" in observed_set:
+        if non_null.map(lambda v: isinstance(v, bool)).all():
+            return series.astype("boolean")
+
+    values = series.map(_sanitize_scalar) if needs_scalar_sanitize(observed_set) else series
+    numeric = pd.to_numeric(values, errors="coerce")
+    numeric_count = int(numeric.notna().sum())
+    if numeric_count == 0:
+        return None
+    if numeric_count / max(len(non_null), 1) >= NUMERIC_SHARE_MIN:
+        return _numeric_with_int_check(numeric)
+    return None
+
+
+def cast_column(series: pd.Series, dtype: str, observed: Iterable[str] | None = None) -> pd.Series:
+    """Apply a cast chosen by :func:`coerce_column` or :class:`CoercionStats`."""
+    if dtype == "boolean":
+        return series.astype("boolean")
+    values = series.map(_sanitize_scalar) if needs_scalar_sanitize(observed) else series
+    return pd.to_numeric(values, errors="coerce").astype(dtype)
+
+
+@dataclass
+class CoercionStats:
+    """Mergeable per-column counts that reproduce :func:`coerce_column` over batches.
+
+    Feeding every batch of a column through :meth:`update` and then calling
+    :meth:`target_dtype` gives the dtype ``coerce_column`` would pick for the
+    concatenated column, without holding the whole column in memory.
+    """
+
+    non_null: int = 0
+    all_bool: bool = True
+    numeric: int = 0
+    int_like: bool = True
+
+    def update(self, series: pd.Series, observed: Iterable[str] | None = None) -> None:
+        observed_set = None if observed is None else set(observed)
+        non_null = series.dropna()
+        if non_null.empty:
+            return
+        self.non_null += len(non_null)
+
+        if self.all_bool:
+            if observed_set is None or ("bool" in observed_set and observed_set != {"bool"}):
+                self.all_bool = bool(non_null.map(lambda v: isinstance(v, bool)).all())
+            else:
+                self.all_bool = observed_set == {"bool"}
+
+        values = non_null.map(_sanitize_scalar) if needs_scalar_sanitize(observed_set) else non_null
+        numeric = pd.to_numeric(values, errors="coerce").dropna()
+        self.numeric += len(numeric)
+        if self.int_like and not numeric.empty:
+            self.int_like = bool((numeric % 1 == 0).all())
+
+    def target_dtype(self) -> str | None:
+        """Return ``"boolean"``, ``"Int64"``, ``"Float64"`` or None (leave as is)."""
+        if self.non_null == 0:
+            return None
+        if self.all_bool:
+            return "boolean"
+        if self.numeric == 0:
+            return None
+        if self.numeric / self.non_null >= NUMERIC_SHARE_MIN:
+            return "Int64" if self.int_like else "Float64"
+        return None
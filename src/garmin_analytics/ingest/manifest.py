@@ -0,0 +1,168 @@
+"""File-fingerprint manifest for incremental ingest.
+
+Each ingested file is fingerprinted by size, mtime and SHA-256. Its parsed
+column chunk is cached by content hash, so later runs only parse files that are
+new or changed and rebuild the table from cached chunks for everything else.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from .chunks import ColumnChunk, parse_file_chunks
+
+# Bump when flattening rules change so stale chunks are re-parsed.
+MANIFEST_VERSION = 3
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Outcome of one incremental load."""
+
+    parsed: int
+    reused: int
+    removed: int
+
+
+def _sha256(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def fingerprint_file(path: Path, previous: FileFingerprint | None = None) -> FileFingerprint:
+    """Fingerprint a file, skipping the hash when size and mtime are unchanged."""
+    stat = path.stat()
+    if previous is not None and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+        return previous
+    return FileFingerprint(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=_sha256(path))
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class ChunkCache:
+    """Manifest plus content-addressed chunk store under one directory.
+
+    Layout::
+
+        <cache_dir>/manifest.json
+        <cache_dir>/chunks/<sha256>.v<MANIFEST_VERSION>.json
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.manifest_path = cache_dir / "manifest.json"
+        self.chunks_dir = cache_dir / "chunks"
+        self.stats: CacheStats | None = None
+
+    def _read_manifest(self) -> dict[str, FileFingerprint]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            payload: Any = orjson.loads(self.manifest_path.read_bytes())
+        except orjson.JSONDecodeError:
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+            return {}
+        files = payload.get("files")
+        if not isinstance(files, dict):
+            return {}
+        return {key: FileFingerprint(**value) for key, value in files.items()}
+
+    def _write_manifest(self, files: dict[str, FileFingerprint]) -> None:
+        payload = {
+            "version": MANIFEST_VERSION,
+            "files": {key: asdict(fp) for key, fp in sorted(files.items())},
+        }
+        _write_bytes_atomic(self.manifest_path, orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+    def _chunk_path(self, fp: FileFingerprint) -> Path:
+        return self.chunks_dir / f"{fp.sha256}.v{MANIFEST_VERSION}.json"
+
+    def _read_chunk(self, fp: FileFingerprint) -> ColumnChunk:
+        payload = orjson.loads(self._chunk_path(fp).read_bytes())
+        columns = payload["columns"]
+        for key, positions in payload["padded"].items():
+            values = columns[key]
+            for pos in positions:
+                values[pos] = math.nan
+        return ColumnChunk(
+            n_rows=payload["n_rows"],
+            columns=columns,
+            types={key: set(names) for key, names in payload["types"].items()},
+        )
+
+    def _write_chunk(self, fp: FileFingerprint, chunk: ColumnChunk) -> None:
+        # JSON has no NaN, so absent-key padding is stored by position.
+        padded = {}
+        for key, values in chunk.columns.items():
+            positions = [pos for pos, value in enumerate(values) if isinstance(value, float) and math.isnan(value)]
+            if positions:
+                padded[key] = positions
+        payload = {
+            "n_rows": chunk.n_rows,
+            "columns": chunk.columns,
+            "types": {key: sorted(names) for key, names in chunk.types.items()},
+            "padded": padded,
+        }
+        _write_bytes_atomic(self._chunk_path(fp), orjson.dumps(payload))
+
+    def load(
+        self,
+        parse_file: Callable[[Path], ColumnChunk],
+        paths: list[Path],
+        *,
+        workers: int = 1,
+    ) -> list[ColumnChunk]:
+        """Return one chunk per path, parsing only new or changed files."""
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        previous = self._read_manifest()
+
+        current: dict[str, FileFingerprint] = {}
+        keys: list[str] = []
+        stale: list[Path] = []
+        for path in paths:
+            key = str(path.resolve())
+            fp = fingerprint_file(path, previous.get(key))
+            current[key] = fp
+            keys.append(key)
+            if not self._chunk_path(fp).exists():
+                stale.append(path)
+
+        fresh: dict[str, ColumnChunk] = {}
+        for path, chunk in zip(stale, parse_file_chunks(parse_file, stale, workers=workers)):
+            key = str(path.resolve())
+            self._write_chunk(current[key], chunk)
+            fresh[key] = chunk
+
+        chunks = [fresh[key] if key in fresh else self._read_chunk(current[key]) for key in keys]
+
+        referenced = {self._chunk_path(fp).name for fp in current.values()}
+        for chunk_file in self.chunks_dir.glob("*.json"):
+            if chunk_file.name not in referenced:
+                chunk_file.unlink()
+
+        self._write_manifest(current)
+        self.stats = CacheStats(
+            parsed=len(stale),
+            reused=len(paths) - len(stale),
+            removed=len(set(previous) - set(current)),
+        )
+        return chunks
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype
 
-from ..util.io import read_json
+from ..util.io import iter_json_records
+from ..util.partitions import write_table
+from .chunks import ColumnChunk, merge_chunk_types, merge_chunks, parse_file_chunks, rows_to_chunk
+from .dtypes import needs_scalar_sanitize
+from .manifest import ChunkCache
+from .stream import DEFAULT_BATCH_SIZE, LatestRowIndex, iter_raw_batches, schema_from_dtypes, text_dtype, write_parquet_batches
 
 COLUMNS = [
     "calendarDate",
@@ -81,6 +89,9 @@ FLOAT_COLS = [
     "spo2SleepAverageHR",
 ]
 
+# Keys that hold the record list when a sleep file is a JSON object.
+SLEEP_RECORD_KEYS = ["sleepData", "dailySleep", "sleep"]
+
 
 def _pick(mapping: dict[str, Any], keys: list[str]) -> Any:
     """Return the first non-null mapping value for the given keys."""
@@ -97,21 +108,23 @@ def _sanitize_scalar(value: Any) -> Any:
     return value
 
 
-def _to_int_nullable(series: pd.Series) -> pd.Series:
+def _to_int_nullable(series: pd.Series, observed: set[str] | None = None) -> pd.Series:
     """Convert numeric-like values to nullable Int64, dropping non-integers."""
-    series = series.map(_sanitize_scalar)
+    if needs_scalar_sanitize(observed):
+        series = series.map(_sanitize_scalar)
     series = pd.to_numeric(series, errors="coerce")
     series = series.where(series.isna() | (series % 1 == 0))
     return series.astype("Int64")
 
 
-def _to_unix_seconds_nullable(series: pd.Series) -> pd.Series:
+def _to_unix_seconds_nullable(series: pd.Series, observed: set[str] | None = None) -> pd.Series:
     """Convert timestamps to nullable unix seconds.
 
     Supports already-numeric seconds (int/float/str) and ISO-like datetime strings.
     """
     # First: numeric-like seconds.
-    numeric = pd.to_numeric(series.map(_sanitize_scalar), errors="coerce")
+    scalars = series.map(_sanitize_scalar) if needs_scalar_sanitize(observed) else series
+    numeric = pd.to_numeric(scalars, errors="coerce")
     out = numeric.where(numeric.isna() | (numeric % 1 == 0)).astype("Int64")
 
     # Second: parse ISO timestamps for the remaining values.
@@ -127,15 +140,11 @@ def _to_unix_seconds_nullable(series: pd.Series) -> pd.Series:
     return out
 
 
-def _extract_records(payload: Any) -> list[dict[str, Any]]:
-    """Locate sleep records inside a parsed sleep payload."""
-    if isinstance(payload, list):
-        return [row for row in payload if isinstance(row, dict)]
-    if isinstance(payload, dict):
-        for key in ["sleepData", "dailySleep", "sleep"]:
-            if key in payload and isinstance(payload[key], list):
-                return [row for row in payload[key] if isinstance(row, dict)]
-    return []
+def _extract_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield sleep records from a sleep file one at a time."""
+    for row in iter_json_records(path, container_keys=SLEEP_RECORD_KEYS):
+        if isinstance(row, dict):
+            yield row
 
 
 def _row_from_entry(entry: dict[str, Any]) -> dict[str, Any]:
@@ -200,19 +209,24 @@ def _row_from_entry(entry: dict[str, Any]) -> dict[str, Any]:
     return row
 
 
-def parse_sleep_files(paths: list[Path]) -> pd.DataFrame:
-    """Parse *_sleepData.json files into a normalized sleep DataFrame."""
-    rows: list[dict[str, Any]] = []
-    for path in paths:
-        payload = read_json(path)
-        records = _extract_records(payload)
-        for entry in records:
-            rows.append(_row_from_entry(entry))
+def _parse_file_chunk(path: Path) -> ColumnChunk:
+    """Read one sleep file and normalize its records into a column chunk."""
+    return rows_to_chunk(_row_from_entry(entry) for entry in _extract_records(path))
 
-    if not rows:
-        return pd.DataFrame(columns=COLUMNS)
 
-    df = pd.DataFrame(rows)
+def _normalize_frame(
+    df: pd.DataFrame,
+    observed_types: dict[str, set[str]] | None = None,
+) -> pd.DataFrame:
+    """Apply the sleep schema and parse dates and timestamps, row by row.
+
+    ``observed_types`` (from flattening) lets columns that only held scalars
+    skip the per-value list/dict sanitizing pass.
+    """
+
+    def _observed(col: str) -> set[str] | None:
+        return observed_types.get(col, set()) if observed_types is not None else None
+
     df = df.reindex(columns=COLUMNS)
 
     df["calendarDate"] = pd.to_datetime(df["calendarDate"], errors="coerce").dt.normalize()
@@ -221,7 +235,7 @@ def parse_sleep_files(paths: list[Path]) -> pd.DataFrame:
     # Parse timestamps (support numeric seconds and ISO strings).
     for col in ["sleepStartTimestampGMT", "sleepEndTimestampGMT", "spo2SleepMeasurementStartTimestampGMT", "spo2SleepMeasurementEndTimestampGMT"]:
         if col in df.columns:
-            df[col] = _to_unix_seconds_nullable(df[col])
+            df[col] = _to_unix_seconds_nullable(df[col], _observed(col))
 
     for col in INT_COLS:
         if col in [
@@ -231,13 +245,103 @@ def parse_sleep_files(paths: list[Path]) -> pd.DataFrame:
             "spo2SleepMeasurementEndTimestampGMT",
         ]:
             continue
-        df[col] = _to_int_nullable(df[col])
+        df[col] = _to_int_nullable(df[col], _observed(col))
     for col in FLOAT_COLS:
-        df[col] = df[col].map(_sanitize_scalar)
+        if needs_scalar_sanitize(_observed(col)):
+            df[col] = df[col].map(_sanitize_scalar)
         df[col] = pd.to_numeric(df[col], errors="coerce")
 
     if "retro" in df.columns:
         df["retro"] = df["retro"].astype("boolean")
 
-    df = df.sort_values("calendarDate").drop_duplicates("calendarDate", keep="last")
+    return df
+
+
+def _finalize_frame(
+    df: pd.DataFrame,
+    observed_types: dict[str, set[str]] | None = None,
+) -> pd.DataFrame:
+    """Apply the sleep schema, parse dates and timestamps, and deduplicate."""
+    df = _normalize_frame(df, observed_types)
+    df = df.sort_values("calendarDate", kind="stable").drop_duplicates("calendarDate", keep="last")
     return df.reset_index(drop=True)
+
+
+def _common_dtype(dtypes: list[object], observed: set[str] | None) -> object:
+    """Combine per-file column dtypes into the dtype of the concatenated column."""
+    if any(is_object_dtype(d) or is_string_dtype(d) for d in dtypes):
+        return text_dtype(observed)
+    unique = list(dict.fromkeys(dtypes))
+    if len(unique) == 1:
+        return unique[0]
+    return np.result_type(*unique)
+
+
+def parse_sleep_files(
+    paths: list[Path],
+    *,
+    workers: int = 1,
+    cache: ChunkCache | None = None,
+) -> pd.DataFrame:
+    """Parse *_sleepData.json files into a normalized sleep DataFrame.
+
+    With ``workers > 1`` files are parsed in a process pool; the merged result
+    is identical to a serial parse. With a ``cache``, only new or changed
+    files are parsed.
+    """
+    if cache is not None:
+        chunks = cache.load(_parse_file_chunk, paths, workers=workers)
+    else:
+        chunks = parse_file_chunks(_parse_file_chunk, paths, workers=workers)
+    if not any(chunk.n_rows for chunk in chunks):
+        return pd.DataFrame(columns=COLUMNS)
+
+    return _finalize_frame(merge_chunks(chunks), merge_chunk_types(chunks))
+
+
+def stream_sleep_parquet(
+    paths: list[Path],
+    output_path: Path,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    partition_by: str = "none",
+) -> int:
+    """Parse sleep files straight into ``output_path`` with bounded memory.
+
+    Produces the same table as ``parse_sleep_files(paths).to_parquet(...)``
+    while holding at most one file plus one ``batch_size``-row batch.
+    ``partition_by="month"`` writes a month-partitioned directory.
+    Returns the number of rows written.
+    """
+    index = LatestRowIndex()
+    order: dict[str, None] = {}
+    observed: dict[str, set[str]] = {}
+    seen_dtypes: dict[str, list[object]] = {}
+    for file_index, path in enumerate(paths):
+        chunk = _parse_file_chunk(path)
+        if not chunk.n_rows:
+            continue
+        for key, types in chunk.types.items():
+            order.setdefault(key)
+            observed.setdefault(key, set()).update(types)
+
+        df = _normalize_frame(pd.DataFrame(chunk.columns), chunk.types)
+        if df.empty:
+            continue
+        index.add(file_index, df["calendarDate"])
+        for col in df.columns:
+            seen_dtypes.setdefault(col, []).append(df[col].dtype)
+
+    if not order:
+        write_table(pd.DataFrame(columns=COLUMNS), output_path, partition_by=partition_by)
+        return 0
+
+    if seen_dtypes:
+        dtypes = {col: _common_dtype(seen_dtypes[col], observed.get(col)) for col in COLUMNS}
+    else:
+        dtypes = dict(_normalize_frame(pd.DataFrame(columns=list(order))).dtypes)
+
+    files, rows = index.winners()
+    batches = iter_raw_batches(_parse_file_chunk, paths, files, rows, list(order), batch_size=batch_size)
+    normalized = (_normalize_frame(batch, observed) for batch in batches)
+    return write_parquet_batches(normalized, schema_from_dtypes(dtypes), output_path, partition_by=partition_by)
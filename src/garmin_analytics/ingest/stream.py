@@ -0,0 +1,148 @@
+"""Bounded-memory streaming writer shared by the UDS and sleep parsers.
+
+The in-memory parsers merge every file into one DataFrame before writing
+parquet. The streaming path instead makes two passes over the export files:
+
+1. Scan: parse one file at a time, remembering only which record wins each
+   ``calendarDate`` plus small per-column summaries used to fix the schema.
+2. Write: re-read the winning records in date order, ``batch_size`` rows at
+   a time, and append each batch to a ``pyarrow.parquet.ParquetWriter``.
+
+Peak memory is one export file plus one output batch, independent of how
+many years of exports are ingested.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..util.partitions import PartitionedWriter, replace_path
+from .chunks import ColumnChunk
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+class LatestRowIndex:
+    """Track which (file, record) is kept for every calendar date.
+
+    Ties on a date are resolved like ``sort_values(kind="stable")`` followed
+    by ``drop_duplicates(keep="last")``: the last record in input order wins.
+    """
+
+    def __init__(self) -> None:
+        self._dates: list[np.ndarray] = []
+        self._files: list[np.ndarray] = []
+        self._rows: list[np.ndarray] = []
+
+    def add(self, file_index: int, dates: pd.Series) -> None:
+        """Register valid rows of one file; ``dates`` is indexed by record position."""
+        if dates.empty:
+            return
+        self._dates.append(dates.to_numpy(dtype="datetime64[ns]").view("int64"))
+        self._files.append(np.full(len(dates), file_index, dtype=np.int64))
+        self._rows.append(dates.index.to_numpy(dtype=np.int64))
+
+    def winners(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(file_index, row_index)`` arrays of kept rows in date order."""
+        if not self._dates:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        dates = np.concatenate(self._dates)
+        files = np.concatenate(self._files)
+        rows = np.concatenate(self._rows)
+        order = np.lexsort((rows, files, dates))
+        dates = dates[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = dates[1:] != dates[:-1]
+        order = order[keep]
+        return files[order], rows[order]
+
+
+def iter_raw_batches(
+    parse_file: Callable[[Path], ColumnChunk],
+    paths: list[Path],
+    files: np.ndarray,
+    rows: np.ndarray,
+    columns: list[str],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield the selected records as raw DataFrames of at most ``batch_size`` rows.
+
+    Files are re-parsed on demand; the most recently parsed file is kept so a
+    file spanning consecutive batches is only read once.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    cached: tuple[int, ColumnChunk] | None = None
+    for start in range(0, len(files), batch_size):
+        batch_files = files[start : start + batch_size]
+        batch_rows = rows[start : start + batch_size]
+        n = len(batch_files)
+        data: dict[str, list] = {col: [None] * n for col in columns}
+
+        for file_index in pd.unique(batch_files):
+            if cached is None or cached[0] != file_index:
+                cached = (int(file_index), parse_file(paths[int(file_index)]))
+            chunk = cached[1]
+            positions = np.flatnonzero(batch_files == file_index).tolist()
+            source_rows = batch_rows[batch_files == file_index].tolist()
+            for col, values in chunk.columns.items():
+                target = data.get(col)
+                if target is None:
+                    continue
+                for pos, row in zip(positions, source_rows):
+                    target[pos] = values[row]
+
+        yield pd.DataFrame(data)
+
+
+def write_parquet_batches(
+    frames: Iterable[pd.DataFrame],
+    schema: pa.Schema,
+    output_path: Path,
+    *,
+    partition_by: str = "none",
+) -> int:
+    """Write frames to one parquet file with a fixed schema; return the row count.
+
+    The file is written next to ``output_path`` and moved into place once
+    complete, so a failed run never leaves a truncated parquet behind. With
+    ``partition_by="month"`` the batches are routed into a month-partitioned
+    directory instead (see :mod:`garmin_analytics.util.partitions`).
+    """
+    if partition_by == "month":
+        with PartitionedWriter(output_path, schema) as partitioned:
+            for frame in frames:
+                partitioned.write_frame(frame)
+        return partitioned.rows
+
+    tmp = output_path.with_name(output_path.name + ".tmp")
+    n_rows = 0
+    try:
+        with pq.ParquetWriter(tmp, schema) as writer:
+            for frame in frames:
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                n_rows += len(frame)
+        replace_path(tmp, output_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return n_rows
+
+
+def schema_from_dtypes(dtypes: dict[str, object]) -> pa.Schema:
+    """Build the Arrow schema (with pandas metadata) ``to_parquet`` would write."""
+    empty = pd.DataFrame({col: pd.Series([], dtype=dtype) for col, dtype in dtypes.items()})
+    return pa.Schema.from_pandas(empty, preserve_index=False)
+
+
+def text_dtype(observed: set[str] | None) -> str:
+    """Dtype pandas infers for a column of strings/None when built from lists."""
+    return "str" if observed else "object"
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
-from ..util.io import read_json
+from ..util.io import iter_json_records
+from ..util.partitions import write_table
+from .chunks import ColumnChunk, merge_chunk_types, merge_chunks, parse_file_chunks, rows_to_chunk
+from .dtypes import CoercionStats, cast_column, coerce_column
+from .manifest import ChunkCache
+from .stream import DEFAULT_BATCH_SIZE, LatestRowIndex, iter_raw_batches, schema_from_dtypes, write_parquet_batches
 
 CORE_COLUMNS = [
     "calendarDate",
@@ -32,6 +38,12 @@ CORE_DERIVED_COLUMNS = [
 # Backwards-compat: tests/other modules may import this.
 COLUMNS = [*CORE_COLUMNS, *CORE_DERIVED_COLUMNS]
 
+CALENDAR_DATE_DTYPE = "datetime64[us]"
+
+UDS_RECORD_KEYS = ["dailySummaries", "entries", "summaries", "records"]
+# Some payloads (and our pretty previews) may be a single record dict.
+UDS_RECORD_MARKERS = ["calendarDate", "calendarDateStr"]
+
 
 def _pick(mapping: dict[str, Any], keys: list[str]) -> Any:
     """Return the first non-null mapping value for the given keys."""
@@ -41,13 +53,6 @@ def _pick(mapping: dict[str, Any], keys: list[str]) -> Any:
     return None
 
 
-def _sanitize_scalar(value: Any) -> Any:
-    """Coerce non-scalar values to None for numeric casting."""
-    if isinstance(value, (list, tuple, dict)):
-        return None
-    return value
-
-
 def _is_scalar(value: Any) -> bool:
     return value is None or isinstance(value, (str, int, float, bool))
 
@@ -275,34 +280,25 @@ def _flatten_entry(entry: dict[str, Any]) -> dict[str, Any]:
     return row
 
 
-def _coerce_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+def _coerce_dtypes(
+    df: pd.DataFrame,
+    observed_types: dict[str, set[str]] | None = None,
+) -> pd.DataFrame:
+    """Cast flattened columns to boolean/Int64/Float64 where values allow it.
+
+    ``observed_types`` (from flattening) lets most columns skip per-value
+    inspection; without it every column is probed value by value. Columns
+    with no non-null value become float64 (see :func:`_column_dtype`).
+    """
     for col in df.columns:
         if col == "calendarDate":
             continue
-        s = df[col]
-
-        non_null = s.dropna()
-        if non_null.empty:
-            continue
-
-        # Boolean
-        if non_null.map(lambda v: isinstance(v, bool)).all():
-            df[col] = s.astype("boolean")
-            continue
-
-        # Numeric (allow numeric-like strings)
-        numeric = pd.to_numeric(s.map(_sanitize_scalar), errors="coerce")
-        if numeric.notna().sum() == 0:
-            continue
-
-        # If most values are numeric-like, coerce.
-        if numeric.notna().sum() / max(len(non_null), 1) >= 0.95:
-            numeric_non_null = numeric.dropna()
-            is_int_like = (numeric_non_null % 1 == 0).all() if not numeric_non_null.empty else False
-            if is_int_like:
-                df[col] = numeric.astype("Int64")
-            else:
-                df[col] = numeric.astype("Float64")
+        observed = observed_types.get(col, set()) if observed_types is not None else None
+        coerced = coerce_column(df[col], observed)
+        if coerced is not None:
+            df[col] = coerced
+        elif not df[col].notna().any():
+            df[col] = df[col].astype("float64")
 
     return df
 
@@ -329,42 +325,136 @@ def _deterministic_column_order(columns: list[str]) -> list[str]:
     return out
 
 
-def _extract_records(payload: Any) -> list[dict[str, Any]]:
-    """Locate summary records inside a parsed UDS payload."""
-    if isinstance(payload, list):
-        return [row for row in payload if isinstance(row, dict)]
-    if isinstance(payload, dict):
-        # Some payloads (and our pretty previews) may be a single record dict.
-        if "calendarDate" in payload or "calendarDateStr" in payload:
-            return [payload]
-        for key in ["dailySummaries", "entries", "summaries", "records"]:
-            if key in payload and isinstance(payload[key], list):
-                return [row for row in payload[key] if isinstance(row, dict)]
-    return []
-
-
-def parse_uds_files(paths: list[Path]) -> pd.DataFrame:
-    """Parse UDSFile_*.json files into a normalized daily DataFrame."""
-    rows: list[dict[str, Any]] = []
-    for path in paths:
-        payload = read_json(path)
-        records = _extract_records(payload)
-        for entry in records:
-            rows.append(_flatten_entry(entry))
-
-    if not rows:
-        return pd.DataFrame(columns=COLUMNS)
+def _extract_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield summary records from a UDS file one at a time."""
+    for row in iter_json_records(path, container_keys=UDS_RECORD_KEYS, record_markers=UDS_RECORD_MARKERS):
+        if isinstance(row, dict):
+            yield row
+
+
+def _parse_file_chunk(path: Path) -> ColumnChunk:
+    """Read one UDS file and flatten its records into a column chunk."""
+    return rows_to_chunk(_flatten_entry(entry) for entry in _extract_records(path))
+
 
-    df = pd.DataFrame(rows)
+def _parse_calendar_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize calendarDate to midnight timestamps and drop rows without one."""
+    dates = pd.to_datetime(df["calendarDate"], errors="coerce").dt.normalize()
+    # Fixed unit: pandas picks seconds when no value parses, microseconds otherwise.
+    df["calendarDate"] = dates.astype(CALENDAR_DATE_DTYPE)
+    return df.dropna(subset=["calendarDate"])
 
+
+def _finalize_frame(
+    df: pd.DataFrame,
+    observed_types: dict[str, set[str]] | None = None,
+) -> pd.DataFrame:
+    """Order columns, parse dates, coerce dtypes and deduplicate by calendarDate."""
     # Deterministic column order for stable analysis notebooks and diffs.
     ordered_cols = _deterministic_column_order(list(df.columns))
     df = df.reindex(columns=ordered_cols)
 
-    df["calendarDate"] = pd.to_datetime(df["calendarDate"], errors="coerce").dt.normalize()
-    df = df.dropna(subset=["calendarDate"])
+    df = _parse_calendar_dates(df)
 
-    df = _coerce_dtypes(df)
+    df = _coerce_dtypes(df, observed_types)
 
-    df = df.sort_values("calendarDate").drop_duplicates("calendarDate", keep="last")
+    df = df.sort_values("calendarDate", kind="stable").drop_duplicates("calendarDate", keep="last")
     return df.reset_index(drop=True)
+
+
+def parse_uds_files(
+    paths: list[Path],
+    *,
+    workers: int = 1,
+    cache: ChunkCache | None = None,
+) -> pd.DataFrame:
+    """Parse UDSFile_*.json files into a normalized daily DataFrame.
+
+    With ``workers > 1`` files are read and flattened in a process pool. Chunks
+    are merged in input order, so the result is identical to a serial parse.
+    With a ``cache``, only new or changed files are parsed and unchanged files
+    reuse their cached chunks.
+    """
+    if cache is not None:
+        chunks = cache.load(_parse_file_chunk, paths, workers=workers)
+    else:
+        chunks = parse_file_chunks(_parse_file_chunk, paths, workers=workers)
+    if not any(chunk.n_rows for chunk in chunks):
+        return pd.DataFrame(columns=COLUMNS)
+
+    return _finalize_frame(merge_chunks(chunks), merge_chunk_types(chunks))
+
+
+def _column_dtype(stats: CoercionStats | None, observed: set[str] | None) -> str:
+    """Output dtype of a non-date column, from the values on kept rows.
+
+    Columns that ``coerce_column`` casts take its dtype. A column with no
+    non-null value on any kept row is float64 (all NaN), whatever was seen on
+    dropped rows. Remaining text columns are ``str`` when every value is a
+    string and ``object`` otherwise, as pandas infers them.
+    """
+    if stats is None or stats.non_null == 0:
+        return "float64"
+    return stats.target_dtype() or ("str" if observed == {"str"} else "object")
+
+
+def stream_uds_parquet(
+    paths: list[Path],
+    output_path: Path,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    partition_by: str = "none",
+) -> int:
+    """Parse UDS files straight into ``output_path`` with bounded memory.
+
+    Produces the same table as ``parse_uds_files(paths).to_parquet(...)`` in
+    two passes over the input, so every file is parsed twice. The first pass
+    collects the latest row per calendarDate and per-column :class:`CoercionStats`,
+    from which the schema is derived (:func:`_column_dtype`). The second pass
+    re-parses the files holding winning rows and writes them in batches.
+    Neither pass holds more than one parsed file plus one ``batch_size``-row
+    batch in memory. ``partition_by="month"`` writes a month-partitioned
+    directory. Returns the number of rows written.
+    """
+    index = LatestRowIndex()
+    order: dict[str, None] = {}
+    observed: dict[str, set[str]] = {}
+    stats: dict[str, CoercionStats] = {}
+    for file_index, path in enumerate(paths):
+        chunk = _parse_file_chunk(path)
+        if not chunk.n_rows:
+            continue
+        for key, types in chunk.types.items():
+            order.setdefault(key)
+            observed.setdefault(key, set()).update(types)
+
+        df = _parse_calendar_dates(pd.DataFrame(chunk.columns))
+        index.add(file_index, df["calendarDate"])
+        for col in df.columns:
+            if col != "calendarDate":
+                stats.setdefault(col, CoercionStats()).update(df[col], chunk.types.get(col, set()))
+
+    if not order:
+        write_table(pd.DataFrame(columns=COLUMNS), output_path, partition_by=partition_by)
+        return 0
+
+    columns = _deterministic_column_order(list(order))
+    dtypes: dict[str, str] = {
+        col: CALENDAR_DATE_DTYPE if col == "calendarDate" else _column_dtype(stats.get(col), observed.get(col))
+        for col in columns
+    }
+
+    def _finalize_batch(df: pd.DataFrame) -> pd.DataFrame:
+        df = _parse_calendar_dates(df)
+        for col, dtype in dtypes.items():
+            if col == "calendarDate" or df[col].dtype == dtype:
+                continue
+            if dtype in ("boolean", "Int64", "Float64"):
+                df[col] = cast_column(df[col], dtype, observed.get(col, set()))
+            else:
+                df[col] = df[col].astype(dtype)
+        return df
+
+    files, rows = index.winners()
+    batches = iter_raw_batches(_parse_file_chunk, paths, files, rows, columns, batch_size=batch_size)
+    return write_parquet_batches(map(_finalize_batch, batches), schema_from_dtypes(dtypes), output_path, partition_by=partition_by)
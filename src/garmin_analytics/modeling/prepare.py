@@ -3,10 +3,11 @@ from __future__ import annotations
 from collections.abc import Iterable, Sequence
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
 from ..eda.prepare import add_derived_features, load_daily_sanitized, load_quality
+from ..features import MODELING_FEATURES, FeatureFrame, feature_sources
+from ..util.partitions import DateRange, normalize_date_range, read_schema
 
 DEFAULT_LOW_RECOVERY_THRESHOLD = 70.0
 
@@ -91,6 +92,13 @@ RECOVERY_SLEEP_TARGET_COLUMNS: tuple[str, ...] = (
     "sleep_opportunity_hours",
 )
 
+RECOVERY_QUALITY_COLUMNS: tuple[str, ...] = (
+    "valid_day_strict",
+    "valid_day_loose",
+    "corrupted_stress_only_day",
+    "has_sleep",
+)
+
 BINARY_TARGET_DIRECTIONS: frozenset[str] = frozenset({"lt", "le", "gt", "ge"})
 
 
@@ -124,155 +132,13 @@ def _join_daily_quality(daily_df: pd.DataFrame, quality_df: pd.DataFrame) -> pd.
     return daily.merge(quality[quality_cols], on="calendarDate", how="left")
 
 
-def _ensure_activity_duration_hours(frame: pd.DataFrame) -> pd.DataFrame:
-    out = frame.copy()
-    if "activeSeconds" in out.columns and "active_hours" not in out.columns:
-        out["active_hours"] = pd.to_numeric(out["activeSeconds"], errors="coerce") / 3600.0
-    if "highlyActiveSeconds" in out.columns and "highly_active_hours" not in out.columns:
-        out["highly_active_hours"] = pd.to_numeric(out["highlyActiveSeconds"], errors="coerce") / 3600.0
-    return out
-
-
-def _ensure_step_length(frame: pd.DataFrame, *, min_steps: int = 1000) -> pd.DataFrame:
-    out = frame.copy()
-    if {"totalSteps", "totalDistanceMeters"}.issubset(out.columns) and "step_length_m" not in out.columns:
-        steps = pd.to_numeric(out["totalSteps"], errors="coerce")
-        dist = pd.to_numeric(out["totalDistanceMeters"], errors="coerce")
-        out["step_length_m"] = np.where(steps >= min_steps, dist / steps, np.nan)
-    return out
-
-
-def _ensure_bodybattery_aliases(frame: pd.DataFrame) -> pd.DataFrame:
-    out = frame.copy()
-    if "bodyBattery_chargedValue" in out.columns and "bodyBatteryCharged" not in out.columns:
-        out["bodyBatteryCharged"] = pd.to_numeric(out["bodyBattery_chargedValue"], errors="coerce")
-    if "bodyBattery_drainedValue" in out.columns and "bodyBatteryDrained" not in out.columns:
-        out["bodyBatteryDrained"] = pd.to_numeric(out["bodyBattery_drainedValue"], errors="coerce")
-    if "bodyBatteryCharged" in out.columns and "bodyBatteryDrained" in out.columns and "bodyBatteryNetBalance" not in out.columns:
-        out["bodyBatteryNetBalance"] = (
-            pd.to_numeric(out["bodyBatteryCharged"], errors="coerce")
-            - pd.to_numeric(out["bodyBatteryDrained"], errors="coerce")
-        )
-    return out
-
-
-def _ensure_stress_context_features(frame: pd.DataFrame, context: str, *, prefix: str) -> pd.DataFrame:
-    """Create readable aliases plus hours/shares for Garmin allDayStress_<CONTEXT> fields."""
-    out = frame.copy()
-    base = f"allDayStress_{context}_"
-
-    avg_col = base + "averageStressLevel"
-    if avg_col in out.columns:
-        out[f"{prefix}AverageStressLevel"] = pd.to_numeric(out[avg_col], errors="coerce")
-
-    duration_alias = {
-        "activityDuration": f"{prefix}ActivityHours",
-        "lowDuration": f"{prefix}LowStressHours",
-        "mediumDuration": f"{prefix}MediumStressHours",
-        "highDuration": f"{prefix}HighStressHours",
-        "restDuration": f"{prefix}RestHours",
-        "uncategorizedDuration": f"{prefix}UncatHours",
-        "totalDuration": f"{prefix}MeasuredHours",
-    }
-    for raw_suffix, alias in duration_alias.items():
-        raw_col = base + raw_suffix
-        if raw_col in out.columns:
-            out[alias] = pd.to_numeric(out[raw_col], errors="coerce") / 3600.0
-
-    total_col = f"{prefix}MeasuredHours"
-    if total_col in out.columns:
-        total = pd.to_numeric(out[total_col], errors="coerce")
-        for stem in ["Activity", "LowStress", "MediumStress", "HighStress", "Rest", "Uncat"]:
-            hcol = f"{prefix}{stem}Hours"
-            scol = f"{prefix}{stem}Share"
-            if hcol in out.columns:
-                numer = pd.to_numeric(out[hcol], errors="coerce")
-                out[scol] = np.nan
-                mask = total.notna() & numer.notna() & (total > 0)
-                if mask.any():
-                    out.loc[mask, scol] = numer.loc[mask] / total.loc[mask]
-    return out
-
-
-def _row_garmin_offset_hours(frame: pd.DataFrame) -> pd.Series:
-    out = pd.Series(np.nan, index=frame.index, dtype="float64")
-    for gmt_col, local_col in [("wellnessStartTimeGmt", "wellnessStartTimeLocal"), ("wellnessEndTimeGmt", "wellnessEndTimeLocal")]:
-        if gmt_col in frame.columns and local_col in frame.columns:
-            gmt_ts = pd.to_datetime(frame[gmt_col], errors="coerce")
-            local_ts = pd.to_datetime(frame[local_col], errors="coerce")
-            delta_h = (local_ts - gmt_ts).dt.total_seconds() / 3600.0
-            out = out.where(~out.isna(), delta_h)
-    return out
-
-
-def _ensure_sleep_local_time_features(frame: pd.DataFrame) -> pd.DataFrame:
-    out = frame.copy()
-    if "sleepStartTimestampGMT" in out.columns and "sleep_start_hour_local" not in out.columns:
-        sleep_start_utc = pd.to_datetime(
-            pd.to_numeric(out["sleepStartTimestampGMT"], errors="coerce"),
-            unit="s",
-            utc=True,
-            errors="coerce",
-        )
-        offset_h = _row_garmin_offset_hours(out)
-        local_dt = sleep_start_utc.copy()
-        mask = offset_h.notna() & sleep_start_utc.notna()
-        if mask.any():
-            local_dt.loc[mask] = sleep_start_utc.loc[mask] + pd.to_timedelta(offset_h.loc[mask], unit="h")
-        out["sleep_start_hour_local"] = (
-            local_dt.dt.hour.astype("float64")
-            + local_dt.dt.minute.astype("float64") / 60.0
-            + local_dt.dt.second.astype("float64") / 3600.0
-        )
-    return out
-
-
-def _ensure_sleep_start_hour_wrapped(
-    frame: pd.DataFrame,
-    *,
-    src_col: str = "sleep_start_hour_local",
-    dst_col: str = "sleep_start_hour_local_wrapped",
-    wrap_at: float = 18.0,
-) -> pd.DataFrame:
-    out = frame.copy()
-    if src_col not in out.columns:
-        return out
-    h = pd.to_numeric(out[src_col], errors="coerce")
-    out[dst_col] = np.where(h >= wrap_at, h - 24.0, h)
-    return out
-
-
-def _ensure_sleep_opportunity_hours(frame: pd.DataFrame) -> pd.DataFrame:
-    out = frame.copy()
-    required = {"sleepStartTimestampGMT", "sleepEndTimestampGMT"}
-    if required.issubset(out.columns) and "sleep_opportunity_hours" not in out.columns:
-        start = pd.to_numeric(out["sleepStartTimestampGMT"], errors="coerce")
-        end = pd.to_numeric(out["sleepEndTimestampGMT"], errors="coerce")
-        duration_h = (end - start) / 3600.0
-        out["sleep_opportunity_hours"] = duration_h.where(duration_h > 0)
-    return out
-
-
 def add_modeling_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Build the shared Stage 3 feature layer from the joined daily dataset."""
-    out = add_derived_features(df)
-    out = _ensure_step_length(out, min_steps=1000)
-    out = _ensure_activity_duration_hours(out)
-    out = _ensure_bodybattery_aliases(out)
-    out = _ensure_stress_context_features(out, "AWAKE", prefix="awake")
-    out = _ensure_stress_context_features(out, "ASLEEP", prefix="sleep")
-    out = _ensure_stress_context_features(out, "TOTAL", prefix="total")
-    out = _ensure_sleep_local_time_features(out)
-    out = _ensure_sleep_start_hour_wrapped(out)
-    out = _ensure_sleep_opportunity_hours(out)
-
-    if "calendarDate" in out.columns:
-        out["calendarDate"] = _normalize_calendar_date(out["calendarDate"])
-        out["day_of_week"] = out["calendarDate"].dt.dayofweek
-        out["weekday_name"] = out["calendarDate"].dt.day_name()
-        out["is_weekend"] = out["day_of_week"].isin([5, 6]).astype("boolean")
+    """Build the shared Stage 3 feature layer from the joined daily dataset.
 
-    return out
+    ``df`` is copied once (in :func:`add_derived_features`); the
+    ``MODELING_FEATURES`` its columns allow are attached to that copy in one step.
+    """
+    return FeatureFrame(add_derived_features(df)).attach(MODELING_FEATURES)
 
 
 def prepare_day_to_next_sleep(
@@ -419,8 +285,8 @@ def build_recovery_modeling_frame(
     current_ok = joined[day_flag_col].fillna(False).astype(bool)
     has_sleep = joined["has_sleep"].fillna(False).astype(bool)
 
-    day_frame = add_modeling_features(joined[current_ok & ~corrupted].copy())
-    sleep_frame = add_modeling_features(joined[has_sleep & ~corrupted].copy())
+    day_frame = add_modeling_features(joined[current_ok & ~corrupted])
+    sleep_frame = add_modeling_features(joined[has_sleep & ~corrupted])
 
     next_sleep_cols = list(RECOVERY_SLEEP_TARGET_COLUMNS)
     if not include_schedule_targets:
@@ -457,6 +323,24 @@ def build_recovery_modeling_frame(
     return modeled.sort_values("calendarDate").reset_index(drop=True)
 
 
+def recovery_source_columns(*, include_schedule_targets: bool = True) -> list[str]:
+    """Daily columns the recovery frame is built from.
+
+    Covers every ``RECOVERY_FEATURE_TIERS`` column and the
+    ``RECOVERY_SLEEP_TARGET_COLUMNS``, plus the sources the feature registry
+    lists for the derived ones (see :func:`feature_sources`).
+    """
+    wanted: list[str] = ["calendarDate"]
+    for tier_columns in RECOVERY_FEATURE_TIERS.values():
+        wanted.extend(tier_columns)
+    wanted.extend(
+        c
+        for c in RECOVERY_SLEEP_TARGET_COLUMNS
+        if include_schedule_targets or c not in {"sleep_start_hour_local_wrapped", "sleep_opportunity_hours"}
+    )
+    return feature_sources(wanted)
+
+
 def load_recovery_modeling_frame(
     daily_path: str | Path,
     quality_path: str | Path,
@@ -464,14 +348,35 @@ def load_recovery_modeling_frame(
     current_day_quality: str = "strict",
     low_recovery_threshold: float = DEFAULT_LOW_RECOVERY_THRESHOLD,
     include_schedule_targets: bool = True,
+    columns: Sequence[str] | None = None,
+    date_range: DateRange | None = None,
 ) -> pd.DataFrame:
-    """Load parquet inputs and build the Stage 3 recovery modeling frame."""
-    daily_df = load_daily_sanitized(daily_path)
-    quality_df = load_quality(quality_path)
-    return build_recovery_modeling_frame(
+    """Load parquet inputs and build the Stage 3 recovery modeling frame.
+
+    Only the daily ``columns`` are read; by default those of
+    :func:`recovery_source_columns` that the table has, which is a small part
+    of the sanitized daily table. Of the quality table only
+    ``RECOVERY_QUALITY_COLUMNS`` are read. ``date_range`` keeps only days in
+    that inclusive range. The inputs are read one day past its end so the last
+    day still gets its next-night targets.
+    """
+    if columns is None:
+        available = set(read_schema(Path(daily_path)).names)
+        columns = [c for c in recovery_source_columns(include_schedule_targets=include_schedule_targets) if c in available]
+    quality_available = set(read_schema(Path(quality_path)).names)
+    quality_columns = [c for c in RECOVERY_QUALITY_COLUMNS if c in quality_available]
+
+    start, end = normalize_date_range(date_range)
+    read_range = None if date_range is None else (start, None if end is None else end + pd.Timedelta(days=1))
+    daily_df = load_daily_sanitized(daily_path, columns=columns, date_range=read_range)
+    quality_df = load_quality(quality_path, columns=quality_columns, date_range=read_range)
+    modeled = build_recovery_modeling_frame(
         daily_df,
         quality_df,
         current_day_quality=current_day_quality,
         low_recovery_threshold=low_recovery_threshold,
         include_schedule_targets=include_schedule_targets,
     )
+    if end is not None:
+        modeled = modeled.loc[modeled["calendarDate"] <= end].reset_index(drop=True)
+    return modeled
@@ -0,0 +1,211 @@
+"""Dependency-graph runner for the CLI stages.
+
+Each :class:`Stage` declares the stages it depends on, the files it reads, the
+files it writes and the parameters that shape its output. A stage is skipped
+when a previous run recorded the same input content and parameters and its
+outputs are still exactly what that run wrote. Independent stages run
+concurrently in a thread pool.
+
+Run state lives in one JSON file (``data/interim/pipeline_state.json`` for the
+CLI). File fingerprints reuse the size/mtime/SHA-256 scheme of the ingest
+manifest, so unchanged files are never re-hashed and a no-op run only stats
+files.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from .ingest.manifest import FileFingerprint, _write_bytes_atomic, fingerprint_file
+
+STATE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the pipeline graph."""
+
+    name: str
+    action: Callable[[], None]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """Outcome of one stage: ``ran``, ``skipped``, ``failed`` or ``blocked``."""
+
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def _validate_graph(stages: list[Stage]) -> None:
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique")
+    known = set(names)
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in known]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+    # Kahn's algorithm: any stage left unvisited sits on a cycle.
+    pending = {stage.name: set(stage.deps) for stage in stages}
+    while pending:
+        ready = [name for name, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"Stage graph has a cycle among: {sorted(pending)}")
+        for name in ready:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+
+class PipelineState:
+    """Thread-safe view of the persisted run state."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._files: dict[str, FileFingerprint] = {}
+        self._stages: dict[str, dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload: Any = orjson.loads(self.path.read_bytes())
+        except orjson.JSONDecodeError:
+            return
+        if not isinstance(payload, dict) or payload.get("version") != STATE_VERSION:
+            return
+        self._files = {key: FileFingerprint(**value) for key, value in payload.get("files", {}).items()}
+        self._stages = dict(payload.get("stages", {}))
+
+    def fingerprint(self, path: Path) -> FileFingerprint | None:
+        """Fingerprint a file, reusing the stored hash when size and mtime match."""
+        if not path.is_file():
+            return None
+        key = str(path.resolve())
+        with self._lock:
+            previous = self._files.get(key)
+        fp = fingerprint_file(path, previous)
+        with self._lock:
+            self._files[key] = fp
+        return fp
+
+    def stage_key(self, stage: Stage) -> str:
+        """Hash of the stage parameters and the content of its inputs."""
+        inputs = []
+        for path in stage.inputs:
+            fp = self.fingerprint(path)
+            inputs.append([str(path), fp.sha256 if fp is not None else None])
+        payload = {"params": dict(stage.params), "inputs": inputs}
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def is_current(self, stage: Stage, key: str) -> bool:
+        with self._lock:
+            record = self._stages.get(stage.name)
+        if record is None or record.get("key") != key:
+            return False
+        recorded = record.get("outputs", {})
+        for path in stage.outputs:
+            fp = self.fingerprint(path)
+            if fp is None or recorded.get(str(path)) != fp.sha256:
+                return False
+        return True
+
+    def record(self, stage: Stage, key: str) -> None:
+        outputs = {}
+        for path in stage.outputs:
+            fp = self.fingerprint(path)
+            if fp is not None:
+                outputs[str(path)] = fp.sha256
+        with self._lock:
+            self._stages[stage.name] = {"key": key, "outputs": outputs}
+            self._save_locked()
+
+    def forget(self, stage: Stage) -> None:
+        with self._lock:
+            if self._stages.pop(stage.name, None) is not None:
+                self._save_locked()
+
+    def _save_locked(self) -> None:
+        payload = {
+            "version": STATE_VERSION,
+            "stages": dict(sorted(self._stages.items())),
+            "files": {key: asdict(fp) for key, fp in sorted(self._files.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_bytes_atomic(self.path, orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+
+def run_pipeline(
+    stages: list[Stage],
+    *,
+    state_path: Path,
+    force: bool = False,
+    jobs: int = 1,
+    on_event: Callable[[str, str], None] | None = None,
+) -> list[StageResult]:
+    """Run stages in dependency order, skipping those already up to date.
+
+    ``on_event(stage_name, event)`` is called with ``"start"`` and ``"skip"``
+    as stages are picked up. Stages whose dependencies failed are reported as
+    ``blocked``. Results are returned in the order of ``stages``.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    _validate_graph(stages)
+    state = PipelineState(state_path)
+    notify = on_event or (lambda name, event: None)
+
+    def _execute(stage: Stage) -> StageResult:
+        started = time.perf_counter()
+        key = state.stage_key(stage)
+        if not force and state.is_current(stage, key):
+            notify(stage.name, "skip")
+            return StageResult(stage.name, "skipped", time.perf_counter() - started)
+        notify(stage.name, "start")
+        try:
+            stage.action()
+        except Exception as err:  # typer.Exit included: a failing stage ends its branch, not the run
+            state.forget(stage)
+            message = f"{type(err).__name__}: {err}" if str(err) else type(err).__name__
+            return StageResult(stage.name, "failed", time.perf_counter() - started, message)
+        state.record(stage, key)
+        return StageResult(stage.name, "ran", time.perf_counter() - started)
+
+    results: dict[str, StageResult] = {}
+    remaining = {stage.name: stage for stage in stages}
+    running: dict[Future[StageResult], str] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while remaining or running:
+            for name, stage in list(remaining.items()):
+                dep_results = [results.get(dep) for dep in stage.deps]
+                if any(r is not None and r.status in {"failed", "blocked"} for r in dep_results):
+                    results[name] = StageResult(name, "blocked")
+                    del remaining[name]
+                elif all(r is not None for r in dep_results):
+                    running[pool.submit(_execute, stage)] = name
+                    del remaining[name]
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return [results[stage.name] for stage in stages]
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import itertools
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from ..util.partitions import write_table
+
 
 @dataclass(frozen=True)
 class QualityConfig:
@@ -26,6 +31,35 @@ QUALITY_FLAGS = [
     "has_sleep",
 ]
 
+# Near-full-day stress with no other signal is treated as a device artifact.
+CORRUPTED_STRESS_MIN_SECONDS = int(23.5 * 3600)
+
+LABEL_ORDER = ["good", "partial", "bad"]
+
+# Upper bound on config x row cells materialized at once by sweep_quality_configs.
+SWEEP_BLOCK_CELLS = 4_000_000
+
+# Bit i of ``suspicion_mask`` is set when reason i applies: a missing flag for the
+# coverage reasons, a set flag for ``corrupted_stress_only_day``.
+SUSPICION_REASONS = [*QUALITY_FLAGS, "full_day_stress", "corrupted_stress_only_day"]
+CORRUPTED_BIT = 1 << SUSPICION_REASONS.index("corrupted_stress_only_day")
+
+
+def _reason_string(mask: int) -> str:
+    reasons = [reason for bit, reason in enumerate(SUSPICION_REASONS[:-1]) if mask & (1 << bit)]
+    if mask & CORRUPTED_BIT:
+        reasons = ["corrupted_stress_only_day", *reasons]
+    return ",".join(reasons)
+
+
+# Every flag combination, so reason strings are built with one take per frame.
+_REASON_LOOKUP = np.array([_reason_string(mask) for mask in range(1 << len(SUSPICION_REASONS))], dtype=object)
+
+
+def decode_suspicion_mask(mask: int) -> list[str]:
+    """Reason names encoded in a ``suspicion_mask`` value, in ``suspicion_reasons`` order."""
+    return [reason for reason in _REASON_LOOKUP[int(mask)].split(",") if reason]
+
 
 def _numeric(series: pd.Series) -> pd.Series:
     return pd.to_numeric(series, errors="coerce")
@@ -122,7 +156,7 @@ def apply_quality_labels(df: pd.DataFrame, config: QualityConfig) -> pd.DataFram
     # Corrupted artifact day: stress defaults to ~full day while all other key signals are absent.
     corrupted = (
         stress_total.notna()
-        & (stress_total >= int(23.5 * 3600))
+        & (stress_total >= CORRUPTED_STRESS_MIN_SECONDS)
         & (~_bool_series(out, "has_hr", default=False).fillna(False))
         & (~_bool_series(out, "has_sleep", default=False).fillna(False))
         & (~_bool_series(out, "has_bodybattery_end", default=False).fillna(False))
@@ -136,16 +170,117 @@ def apply_quality_labels(df: pd.DataFrame, config: QualityConfig) -> pd.DataFram
     out.loc[corrupted, "valid_day_strict"] = False
     out.loc[corrupted, "valid_day_loose"] = False
 
-    missing_flags = [*QUALITY_FLAGS, "full_day_stress"]
+    mask = np.zeros(len(out), dtype=np.uint8)
+    for bit, reason in enumerate(SUSPICION_REASONS):
+        flag = _bool_series(out, reason, default=False).fillna(False).to_numpy(dtype=bool)
+        hit = flag if reason == "corrupted_stress_only_day" else ~flag
+        mask |= hit.astype(np.uint8) << bit
+    out["suspicion_mask"] = mask
+    out["suspicion_reasons"] = pd.Series(_REASON_LOOKUP[mask], index=out.index, dtype="str")
+    return out
+
 
-    def _reasons(row: pd.Series) -> str:
-        missing = [flag for flag in missing_flags if not bool(row.get(flag, False))]
-        if bool(row.get("corrupted_stress_only_day", False)):
-            missing = ["corrupted_stress_only_day", *missing]
-        return ",".join(missing)
+def build_config_grid(**values: Iterable[Any]) -> list[QualityConfig]:
+    """Cartesian product of candidate values per ``QualityConfig`` field.
 
-    reason_cols = [*missing_flags, "corrupted_stress_only_day"]
-    out["suspicion_reasons"] = out[reason_cols].fillna(False).apply(_reasons, axis=1)
+    Fields that are not given keep their defaults, e.g.
+    ``build_config_grid(steps_min=[0, 50, 100], strict_min_score=[3, 4])``
+    returns six configs.
+    """
+    known = {f.name for f in fields(QualityConfig)}
+    unknown = sorted(set(values) - known)
+    if unknown:
+        raise ValueError(f"Unknown QualityConfig fields: {unknown}")
+    names = list(values)
+    grids = [list(values[name]) for name in names]
+    return [QualityConfig(**dict(zip(names, combo))) for combo in itertools.product(*grids)]
+
+
+def _present(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df[name].notna().to_numpy(dtype=bool)
+
+
+def _float_values(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return _numeric(df[name]).to_numpy(dtype="float64", na_value=np.nan)
+
+
+def sweep_quality_configs(df: pd.DataFrame, configs: list[QualityConfig]) -> pd.DataFrame:
+    """Label mix of ``df`` under every config, without relabeling the frame.
+
+    Signals that do not depend on thresholds are computed once. Per distinct
+    ``(steps_min, stress_any_min_seconds)`` pair the rows are reduced to a
+    histogram of (corrupted, quality_score); strict and loose label counts for
+    each config then follow from that histogram. Counts match
+    ``apply_quality_labels`` run config by config.
+
+    Returns one row per config, in input order.
+    """
+    if not configs:
+        raise ValueError("configs must not be empty")
+
+    n_rows = len(df)
+    steps = _float_values(df, "totalSteps")
+    stress = _float_values(df, "stressTotalDurationSeconds")
+    has_hr = _present(df, "minHeartRate") | _present(df, "maxHeartRate") | _present(df, "restingHeartRate")
+    has_bodybattery_end = _present(df, "bodyBatteryEndOfDay")
+    has_sleep = _present(df, "sleepStartTimestampGMT") & _present(df, "sleepEndTimestampGMT")
+    fixed_score = has_hr.astype(np.int64) + has_bodybattery_end + has_sleep
+    # NaN compares False, matching the notna() guards in apply_quality_labels.
+    corrupted_unless_steps = (stress >= CORRUPTED_STRESS_MIN_SECONDS) & ~has_hr & ~has_sleep & ~has_bodybattery_end
+
+    n_scores = len(QUALITY_FLAGS) + 1
+    thresholds = np.array([[c.steps_min, c.stress_any_min_seconds] for c in configs], dtype="float64")
+    pairs, pair_index = np.unique(thresholds, axis=0, return_inverse=True)
+    pair_index = pair_index.reshape(-1)
+
+    # hist[p, corrupted * n_scores + score] = row count for threshold pair p.
+    hist = np.zeros((len(pairs), 2 * n_scores), dtype=np.int64)
+    block = max(1, SWEEP_BLOCK_CELLS // max(n_rows, 1))
+    for start in range(0, len(pairs), block):
+        chunk = pairs[start : start + block]
+        has_steps = steps[None, :] >= chunk[:, 0:1]
+        has_stress = stress[None, :] >= chunk[:, 1:2]
+        score = fixed_score[None, :] + has_steps + has_stress
+        corrupted = corrupted_unless_steps[None, :] & ~has_steps
+        keys = corrupted * n_scores + score + (2 * n_scores) * np.arange(len(chunk))[:, None]
+        counts = np.bincount(keys.ravel(), minlength=2 * n_scores * len(chunk))
+        hist[start : start + len(chunk)] = counts.reshape(len(chunk), 2 * n_scores)
+    hist = hist[pair_index]
+
+    clean = hist[:, :n_scores]
+    corrupted_days = hist[:, n_scores:].sum(axis=1)
+    scores = np.arange(n_scores)
+
+    valid_stress = np.sort(stress[~np.isnan(stress)])
+    full_min = np.array([c.stress_full_min_seconds for c in configs], dtype="float64")
+    full_day_stress_days = len(valid_stress) - np.searchsorted(valid_stress, full_min, side="left")
+
+    out = pd.DataFrame([{k: v for k, v in asdict(c).items() if k != "top_n"} for c in configs])
+    out.insert(0, "config_id", np.arange(len(configs)))
+    out["rows"] = n_rows
+    out["corrupted_days"] = corrupted_days
+    out["full_day_stress_days"] = full_day_stress_days
+
+    for kind, min_scores in (
+        ("strict", np.array([c.strict_min_score for c in configs])),
+        ("loose", np.array([c.loose_min_score for c in configs])),
+    ):
+        # Same precedence as _label_from_score: bad (score <= 1) overrides good.
+        good_scores = (scores[None, :] >= min_scores[:, None]) & (scores[None, :] > 1)
+        counts = {
+            "good": (clean * good_scores).sum(axis=1),
+            "bad": clean[:, :2].sum(axis=1) + corrupted_days,
+        }
+        counts["partial"] = n_rows - counts["good"] - counts["bad"]
+        for label in LABEL_ORDER:
+            out[f"{kind}_{label}"] = counts[label]
+        for label in LABEL_ORDER:
+            pct = counts[label] / n_rows * 100.0 if n_rows else np.zeros(len(configs))
+            out[f"{kind}_{label}_pct"] = np.round(pct, 2)
     return out
 
 
@@ -250,9 +385,8 @@ def build_suspicious_days_artifacts(quality_df: pd.DataFrame, top_n: int) -> pd.
 def _label_table(series: pd.Series) -> pd.DataFrame:
     counts = series.value_counts(dropna=False)
     total = counts.sum()
-    order = ["good", "partial", "bad"]
     rows: list[dict[str, Any]] = []
-    for label in order:
+    for label in LABEL_ORDER:
         count = int(counts.get(label, 0))
         pct = (count / total * 100.0) if total else 0.0
         rows.append({"label": label, "count": count, "pct": round(pct, 2)})
@@ -289,9 +423,17 @@ def _reason_frequency_table(quality_df: pd.DataFrame, mask: pd.Series | None = N
         return pd.DataFrame(columns=["reason", "count", "pct_of_rows"])
 
     counts: dict[str, int] = {}
-    for raw in data["suspicion_reasons"].fillna("").astype(str):
-        for reason in [token.strip() for token in raw.split(",") if token.strip()]:
-            counts[reason] = counts.get(reason, 0) + 1
+    if "suspicion_mask" in data.columns:
+        masks = data["suspicion_mask"].to_numpy(dtype=np.uint8)
+        for bit, reason in enumerate(SUSPICION_REASONS):
+            count = int(np.count_nonzero(masks & (1 << bit)))
+            if count:
+                counts[reason] = count
+    else:
+        # Quality tables written before suspicion_mask existed.
+        for raw in data["suspicion_reasons"].fillna("").astype(str):
+            for reason in [token.strip() for token in raw.split(",") if token.strip()]:
+                counts[reason] = counts.get(reason, 0) + 1
 
     rows = [
         {"reason": reason, "count": count, "pct_of_rows": round(count / total_rows * 100.0, 2)}
@@ -476,6 +618,7 @@ def write_quality_outputs(
     summary_markdown: str,
     output_parquet: Path,
     write_parquet: bool,
+    partition_by: str = "none",
 ) -> tuple[Path, Path, Path | None, Path | None]:
     out_dir.mkdir(parents=True, exist_ok=True)
     summary_path = out_dir / "quality_summary.md"
@@ -491,8 +634,7 @@ def write_quality_outputs(
 
     parquet_path: Path | None = None
     if write_parquet:
-        output_parquet.parent.mkdir(parents=True, exist_ok=True)
-        quality_df.to_parquet(output_parquet, index=False, engine="pyarrow")
+        write_table(quality_df, output_parquet, partition_by=partition_by)
         parquet_path = output_parquet
 
     return summary_path, suspicious_path, parquet_path, wrote_artifacts_path
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+from ..util.partitions import iter_batches, read_schema
+from .sketches import HyperLogLog, KllSketch, hash_values
 
 
 ISO_DT_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T")
@@ -51,12 +59,45 @@ KEY_ANALYSIS_COLUMNS: tuple[str, ...] = (
 )
 
 
+DICTIONARY_ENGINES = ("columnar", "legacy")
+
+# Upper bound on row x column cells the columnar engine materializes at once.
+DICTIONARY_BLOCK_CELLS = 4_000_000
+
+NUMERIC_STAT_KEYS = ("min", "p05", "p25", "median", "p75", "p95", "max", "mean", "std")
+_QUANTILES = (0.05, 0.25, 0.75, 0.95)
+# Leading non-null values checked for ISO datetime strings.
+_ISO_SAMPLE = 20
+
+# Rows per record batch read by the streaming builder.
+STREAM_BATCH_SIZE = 65_536
+
+
 @dataclass(frozen=True)
 class DictionaryOptions:
     max_sample_values: int = 5
     example_max_len: int = 80
 
 
+@dataclass(frozen=True)
+class SourceSummary:
+    """Shape and calendar range of the table a dictionary describes."""
+
+    n_rows: int
+    n_columns: int
+    first_date: date | None = None
+    last_date: date | None = None
+
+
+def summarize_source(df: pd.DataFrame) -> SourceSummary:
+    first = last = None
+    if "calendarDate" in df.columns:
+        dates = pd.to_datetime(df["calendarDate"], errors="coerce")
+        if dates.notna().any():
+            first, last = dates.min().date(), dates.max().date()
+    return SourceSummary(n_rows=len(df), n_columns=len(df.columns), first_date=first, last_date=last)
+
+
 def _is_numeric(series: pd.Series) -> bool:
     return pd.api.types.is_numeric_dtype(series)
 
@@ -70,11 +111,18 @@ def _is_timestamp_col(name: str) -> bool:
     return "timestamp" in lowered or "timegmt" in lowered or "timelocal" in lowered
 
 
+def _leading_non_null(series: pd.Series, n: int) -> pd.Series:
+    """First ``n`` non-null values, scanning only a leading window when it suffices."""
+    window = series.iloc[: max(n * 50, 1000)]
+    non_null = window.dropna()
+    if len(non_null) < n and len(window) < len(series):
+        non_null = series.dropna()
+    return non_null.head(n)
+
+
 def _looks_like_iso_datetime(series: pd.Series) -> bool:
-    sample = series.dropna().astype(str).head(20)
-    if sample.empty:
-        return False
-    return bool(sample.map(lambda v: bool(ISO_DT_RE.match(v))).any())
+    sample = _leading_non_null(series, _ISO_SAMPLE).tolist()
+    return any(ISO_DT_RE.match(str(value)) for value in sample)
 
 
 def _looks_like_epoch_ms(series: pd.Series) -> bool:
@@ -243,10 +291,13 @@ def _note_for_column(name: str, series: pd.Series) -> str:
 
 
 def _example_values(series: pd.Series, max_values: int) -> str:
-    non_null = series.dropna()
-    if non_null.empty:
+    # Distinct values in order of first appearance: a leading window usually has enough.
+    window = series.iloc[: max(max_values * 200, 1000)]
+    unique = pd.unique(window.dropna())
+    if len(unique) < max_values and len(window) < len(series):
+        unique = pd.unique(series.dropna())
+    if len(unique) == 0:
         return json.dumps([])
-    unique = pd.unique(non_null)
     sample = unique[:max_values]
     safe: list[Any] = []
     for value in sample:
@@ -260,30 +311,10 @@ def _example_values(series: pd.Series, max_values: int) -> str:
 
 def _numeric_stats(series: pd.Series) -> dict[str, Any]:
     if (not _is_numeric(series)) or _is_boolean_dtype(series):
-        return {
-            "min": None,
-            "p05": None,
-            "p25": None,
-            "median": None,
-            "p75": None,
-            "p95": None,
-            "max": None,
-            "mean": None,
-            "std": None,
-        }
+        return dict.fromkeys(NUMERIC_STAT_KEYS)
     numeric = pd.to_numeric(series, errors="coerce")
     if numeric.notna().sum() == 0:
-        return {
-            "min": None,
-            "p05": None,
-            "p25": None,
-            "median": None,
-            "p75": None,
-            "p95": None,
-            "max": None,
-            "mean": None,
-            "std": None,
-        }
+        return dict.fromkeys(NUMERIC_STAT_KEYS)
     q = numeric.quantile([0.05, 0.25, 0.75, 0.95])
     return {
         "min": float(numeric.min()),
@@ -308,13 +339,6 @@ def _zero_pct(series: pd.Series) -> float | None:
     return float((numeric == 0).mean() * 100.0)
 
 
-def _is_constant_non_null(series: pd.Series) -> bool | None:
-    non_null = series.dropna()
-    if non_null.empty:
-        return None
-    return bool(non_null.nunique(dropna=True) <= 1)
-
-
 def _coverage_window_metrics(
     *,
     series: pd.Series,
@@ -354,63 +378,526 @@ def _coverage_window_metrics(
     }
 
 
-def build_data_dictionary(df: pd.DataFrame, max_sample_values: int = 5) -> pd.DataFrame:
+def _calendar_dates(df: pd.DataFrame) -> pd.Series | None:
+    if "calendarDate" not in df.columns:
+        return None
+    parsed = pd.to_datetime(df["calendarDate"], errors="coerce")
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.dt.normalize()
+
+
+def _dictionary_row(
+    col: str,
+    series: pd.Series,
+    *,
+    total: int,
+    non_null: int,
+    n_unique: int,
+    stats: dict[str, Any],
+    zero_pct: float | None,
+    coverage: dict[str, Any],
+    max_sample_values: int,
+) -> dict[str, Any]:
+    inferred_group = _infer_group(col)
+    annotations = _column_annotations(col, inferred_group)
+    missing = total - non_null
+    return {
+        "column": col,
+        "dtype": str(series.dtype),
+        "non_null_count": non_null,
+        "non_null_pct": float(non_null / total * 100) if total else 0.0,
+        "missing_count": missing,
+        "missing_pct": float(missing / total * 100) if total else 0.0,
+        "n_unique": n_unique,
+        "is_constant": None if non_null == 0 else bool(n_unique <= 1),
+        "zero_pct": zero_pct,
+        "first_non_null_date": coverage["first_non_null_date"],
+        "last_non_null_date": coverage["last_non_null_date"],
+        "coverage_span_days": coverage["coverage_span_days"],
+        "coverage_within_span_pct": coverage["coverage_within_span_pct"],
+        "example_values": _example_values(series, max_sample_values),
+        "min": stats["min"],
+        "p05": stats["p05"],
+        "p25": stats["p25"],
+        "median": stats["median"],
+        "p75": stats["p75"],
+        "p95": stats["p95"],
+        "max": stats["max"],
+        "mean": stats["mean"],
+        "std": stats["std"],
+        "inferred_unit": _infer_unit(col, series),
+        "inferred_group": inferred_group,
+        "notes": _note_for_column(col, series),
+        "used_in_quality": annotations["used_in_quality"],
+        "used_in_eda": annotations["used_in_eda"],
+        "candidate_model_feature": annotations["candidate_model_feature"],
+        "analysis_priority": annotations["analysis_priority"],
+    }
+
+
+def _legacy_rows(df: pd.DataFrame, calendar_dates: pd.Series | None, max_sample_values: int) -> list[dict[str, Any]]:
+    """Reference engine: one set of pandas scans per column."""
     rows: list[dict[str, Any]] = []
+    for col, series in df.items():
+        rows.append(
+            _dictionary_row(
+                col,
+                series,
+                total=len(df),
+                non_null=int(series.notna().sum()),
+                n_unique=int(series.nunique(dropna=True)),
+                stats=_numeric_stats(series),
+                zero_pct=_zero_pct(series),
+                coverage=_coverage_window_metrics(series=series, calendar_dates=calendar_dates),
+                max_sample_values=max_sample_values,
+            )
+        )
+    return rows
+
+
+def _column_blocks(n_columns: int, n_rows: int) -> list[slice]:
+    width = max(1, DICTIONARY_BLOCK_CELLS // max(n_rows, 1))
+    return [slice(start, min(start + width, n_columns)) for start in range(0, n_columns, width)]
+
+
+def _coverage_block(
+    notna: np.ndarray,
+    sorted_dates: np.ndarray | None,
+    date_order: np.ndarray | None,
+) -> list[dict[str, Any]]:
+    """Coverage-window metrics for every column of a ``notna`` block.
+
+    Rows are reordered by calendar date once, so the first and last covered
+    dates are the first and last True per column.
+    """
+    empty = {
+        "first_non_null_date": None,
+        "last_non_null_date": None,
+        "coverage_span_days": None,
+        "coverage_within_span_pct": None,
+    }
+    if sorted_dates is None or date_order is None:
+        return [dict(empty) for _ in range(notna.shape[1])]
+
+    covered = notna[date_order]
+    counts = covered.sum(axis=0)
+    first_idx = covered.argmax(axis=0)
+    last_idx = len(covered) - 1 - covered[::-1].argmax(axis=0)
+    first = sorted_dates[first_idx]
+    last = sorted_dates[last_idx]
+    in_span = np.searchsorted(sorted_dates, last, side="right") - np.searchsorted(sorted_dates, first, side="left")
+
+    out = []
+    for j in range(notna.shape[1]):
+        if counts[j] == 0:
+            out.append(dict(empty))
+            continue
+        first_day = pd.Timestamp(first[j])
+        last_day = pd.Timestamp(last[j])
+        out.append(
+            {
+                "first_non_null_date": first_day.date().isoformat(),
+                "last_non_null_date": last_day.date().isoformat(),
+                "coverage_span_days": int((last_day - first_day).days) + 1,
+                "coverage_within_span_pct": float(counts[j] / in_span[j] * 100.0) if in_span[j] else None,
+            }
+        )
+    return out
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    # numpy's linear-interpolation formula, so quantiles match Series.quantile.
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def _numeric_block_stats(values: np.ndarray) -> list[dict[str, Any]]:
+    """Summary statistics for every column of a float64 block (NaN = missing).
+
+    Each reduction runs once over the whole block. The block is
+    column-major, so per-column sums use the same pairwise summation as a
+    1-D pandas reduction.
+    """
+    n_rows, n_cols = values.shape
+    if n_rows == 0:
+        return [{"stats": dict.fromkeys(NUMERIC_STAT_KEYS), "zero_pct": None, "n_unique": 0} for _ in range(n_cols)]
+    missing = np.isnan(values)
+    counts = n_rows - missing.sum(axis=0)
+    filled = np.where(missing, 0.0, values)
+    filled = np.asfortranarray(filled)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0) / counts
+        sqr = np.asfortranarray(np.where(missing, 0.0, (mean - values) ** 2))
+        std = np.sqrt(sqr.sum(axis=0) / (counts - 1))
+        std = np.where(counts > 1, std, np.nan)
+        zero_pct = (values == 0).sum(axis=0) / counts * 100.0
+
+    ordered = np.sort(values, axis=0)  # NaN sorts last
+    cols = np.arange(n_cols)
+    last = np.maximum(counts - 1, 0)
+    # Distinct values = 1 + value changes between neighbours among the non-null rows.
+    # Compared, not diffed: inf - inf is NaN, which would count every repeated inf.
+    changes = (ordered[1:] != ordered[:-1]) & (np.arange(n_rows - 1)[:, None] < last[None, :])
+    n_unique = np.where(counts > 0, 1 + changes.sum(axis=0), 0)
+
+    quantiles = {}
+    with np.errstate(invalid="ignore"):  # inf - inf between neighbours
+        for q in _QUANTILES:
+            position = q * last
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, last)
+            quantiles[q] = _lerp(ordered[lower, cols], ordered[upper, cols], position - lower)
+        middle_low = ordered[last // 2, cols]
+        middle_high = ordered[(last + 1) // 2, cols]
+        median = np.where(counts % 2 == 1, middle_low, (middle_low + middle_high) / 2)
+
+    out = []
+    for j in range(n_cols):
+        if counts[j] == 0:
+            out.append({"stats": dict.fromkeys(NUMERIC_STAT_KEYS), "zero_pct": None, "n_unique": 0})
+            continue
+        out.append(
+            {
+                "stats": {
+                    "min": float(ordered[0, j]),
+                    "p05": float(quantiles[0.05][j]),
+                    "p25": float(quantiles[0.25][j]),
+                    "median": float(median[j]),
+                    "p75": float(quantiles[0.75][j]),
+                    "p95": float(quantiles[0.95][j]),
+                    "max": float(ordered[last[j], j]),
+                    "mean": float(mean[j]),
+                    "std": float(std[j]),
+                },
+                "zero_pct": float(zero_pct[j]),
+                "n_unique": int(n_unique[j]),
+            }
+        )
+    return out
+
+
+def _columnar_rows(df: pd.DataFrame, calendar_dates: pd.Series | None, max_sample_values: int) -> list[dict[str, Any]]:
+    """Vectorized engine: missingness, coverage and numeric statistics per column block."""
     total = len(df)
-    calendar_dates: pd.Series | None = None
-    if "calendarDate" in df.columns:
-        parsed = pd.to_datetime(df["calendarDate"], errors="coerce")
-        if isinstance(parsed.dtype, pd.DatetimeTZDtype):
-            parsed = parsed.dt.tz_localize(None)
-        calendar_dates = parsed.dt.normalize()
-
-    for col in df.columns:
-        series = df[col]
-        non_null = int(series.notna().sum())
-        non_null_pct = float(non_null / total * 100) if total else 0.0
-        missing = int(series.isna().sum())
-        missing_pct = float(missing / total * 100) if total else 0.0
-        n_unique = int(series.nunique(dropna=True))
-
-        stats = _numeric_stats(series)
-        coverage = _coverage_window_metrics(series=series, calendar_dates=calendar_dates)
-        inferred_group = _infer_group(col)
-        annotations = _column_annotations(col, inferred_group)
-        row = {
-            "column": col,
-            "dtype": str(series.dtype),
-            "non_null_count": non_null,
-            "non_null_pct": non_null_pct,
-            "missing_count": missing,
-            "missing_pct": missing_pct,
-            "n_unique": n_unique,
-            "is_constant": _is_constant_non_null(series),
-            "zero_pct": _zero_pct(series),
-            "first_non_null_date": coverage["first_non_null_date"],
-            "last_non_null_date": coverage["last_non_null_date"],
-            "coverage_span_days": coverage["coverage_span_days"],
-            "coverage_within_span_pct": coverage["coverage_within_span_pct"],
-            "example_values": _example_values(series, max_sample_values),
-            "min": stats["min"],
-            "p05": stats["p05"],
-            "p25": stats["p25"],
-            "median": stats["median"],
-            "p75": stats["p75"],
-            "p95": stats["p95"],
-            "max": stats["max"],
-            "mean": stats["mean"],
-            "std": stats["std"],
-            "inferred_unit": _infer_unit(col, series),
-            "inferred_group": inferred_group,
-            "notes": _note_for_column(col, series),
-            "used_in_quality": annotations["used_in_quality"],
-            "used_in_eda": annotations["used_in_eda"],
-            "candidate_model_feature": annotations["candidate_model_feature"],
-            "analysis_priority": annotations["analysis_priority"],
+    sorted_dates = date_order = None
+    if calendar_dates is not None:
+        valid = calendar_dates.notna().to_numpy()
+        dates = calendar_dates.to_numpy(dtype="datetime64[ns]")
+        date_order = np.flatnonzero(valid)[np.argsort(dates[valid], kind="stable")]
+        sorted_dates = dates[date_order]
+
+    columns = list(df.columns)
+    series_list = [series for _, series in df.items()]
+    numeric_positions = [
+        j for j, series in enumerate(series_list) if _is_numeric(series) and not _is_boolean_dtype(series)
+    ]
+
+    non_null = np.zeros(len(columns), dtype=np.int64)
+    coverage: list[dict[str, Any]] = []
+    for block in _column_blocks(len(columns), total):
+        notna = df.iloc[:, block].notna().to_numpy(dtype=bool)
+        non_null[block] = notna.sum(axis=0)
+        coverage.extend(_coverage_block(notna, sorted_dates, date_order))
+
+    numeric: dict[int, dict[str, Any]] = {}
+    for block in _column_blocks(len(numeric_positions), total):
+        positions = numeric_positions[block]
+        values = np.empty((total, len(positions)), dtype="float64", order="F")
+        for k, j in enumerate(positions):
+            numeric_series = pd.to_numeric(series_list[j], errors="coerce")
+            values[:, k] = numeric_series.to_numpy(dtype="float64", na_value=np.nan)
+        for j, result in zip(positions, _numeric_block_stats(values)):
+            numeric[j] = result
+
+    rows: list[dict[str, Any]] = []
+    for j, (col, series) in enumerate(zip(columns, series_list)):
+        result = numeric.get(j)
+        if result is not None and series.dtype.kind in "iu" and result["n_unique"] > 0:
+            # Integers beyond 2**53 can collide as float64; count them exactly.
+            limit = float(2**53)
+            if max(abs(result["stats"]["min"]), abs(result["stats"]["max"])) >= limit:
+                result = {**result, "n_unique": int(series.nunique(dropna=True))}
+        rows.append(
+            _dictionary_row(
+                col,
+                series,
+                total=total,
+                non_null=int(non_null[j]),
+                n_unique=result["n_unique"] if result is not None else int(series.nunique(dropna=True)),
+                stats=result["stats"] if result is not None else dict.fromkeys(NUMERIC_STAT_KEYS),
+                zero_pct=result["zero_pct"] if result is not None else None,
+                coverage=coverage[j],
+                max_sample_values=max_sample_values,
+            )
+        )
+    return rows
+
+
+_ENGINE_ROWS = {"columnar": _columnar_rows, "legacy": _legacy_rows}
+
+
+def _profile_ipc_columns(
+    ipc_path: str,
+    positions: list[int],
+    calendar_position: int | None,
+    max_sample_values: int,
+    engine: str,
+) -> list[dict[str, Any]]:
+    """Worker: dictionary rows for some columns of a memory-mapped Arrow IPC file."""
+    with pa.memory_map(ipc_path) as source:
+        table = pa.ipc.open_file(source).read_all()
+        frame = table.select(positions).to_pandas()
+        calendar_dates = None
+        if calendar_position is not None:
+            calendar_dates = _calendar_dates(table.select([calendar_position]).to_pandas())
+    return _ENGINE_ROWS[engine](frame, calendar_dates, max_sample_values)
+
+
+def _parallel_rows(df: pd.DataFrame, max_sample_values: int, engine: str, jobs: int) -> list[dict[str, Any]] | None:
+    """Profile column groups in a process pool; None when ``df`` does not survive Arrow.
+
+    The frame is written once to an Arrow IPC file that every worker
+    memory-maps, so it is never pickled. Groups are contiguous and results
+    are concatenated in submission order, which keeps the column order.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, ValueError):
+        return None
+    # e.g. object columns of ints with None come back as float64.
+    restored = table.schema.empty_table().to_pandas()
+    if list(restored.columns) != list(df.columns) or list(restored.dtypes) != list(df.dtypes):
+        return None
+
+    names = list(df.columns)
+    calendar_position = names.index("calendarDate") if "calendarDate" in names else None
+    groups = [group.tolist() for group in np.array_split(np.arange(len(names)), min(len(names), jobs * 4))]
+    with tempfile.TemporaryDirectory(prefix="data_dictionary_") as tmp:
+        ipc_path = os.path.join(tmp, "source.arrow")
+        with pa.OSFile(ipc_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        del table
+        with ProcessPoolExecutor(max_workers=min(jobs, len(groups))) as pool:
+            parts = pool.map(
+                _profile_ipc_columns,
+                [ipc_path] * len(groups),
+                groups,
+                [calendar_position] * len(groups),
+                [max_sample_values] * len(groups),
+                [engine] * len(groups),
+            )
+            return [row for part in parts for row in part]
+
+
+def build_data_dictionary(
+    df: pd.DataFrame,
+    max_sample_values: int = 5,
+    *,
+    engine: str = "columnar",
+    jobs: int = 1,
+) -> pd.DataFrame:
+    """One row of statistics and annotations per column of ``df``.
+
+    The ``columnar`` engine computes missingness, coverage windows and numeric
+    statistics for blocks of columns at once; ``legacy`` scans column by
+    column and is kept as the reference implementation. With ``jobs > 1``
+    column groups are profiled in that many processes; frames whose dtypes
+    do not round-trip through Arrow are profiled serially.
+    """
+    if engine not in _ENGINE_ROWS:
+        raise ValueError(f"Unknown data dictionary engine: {engine} (expected one of {DICTIONARY_ENGINES})")
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    rows = None
+    if jobs > 1 and len(df.columns) > 1:
+        rows = _parallel_rows(df, max_sample_values, engine, jobs)
+    if rows is None:
+        rows = _ENGINE_ROWS[engine](df, _calendar_dates(df), max_sample_values)
+    return pd.DataFrame(rows)
+
+
+class _StreamColumn:
+    """Running statistics of one column over a stream of record batches."""
+
+    def __init__(self, empty: pd.Series, max_sample_values: int) -> None:
+        self.dtype = empty.dtype
+        self.numeric = _is_numeric(empty) and not _is_boolean_dtype(empty)
+        self.max_sample_values = max_sample_values
+        self.non_null = 0
+        self.examples: list[Any] = []
+        self.leading: list[Any] = []
+        self.first_date: np.datetime64 | None = None
+        self.last_date: np.datetime64 | None = None
+        self.covered = 0
+        self.distinct = HyperLogLog()
+        # Numeric columns only: exact count/mean/M2 (merged with Chan's formula) plus a quantile sketch.
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.zeros = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = KllSketch()
+
+    def update(self, series: pd.Series, notna: np.ndarray, dates: np.ndarray | None) -> None:
+        n_valid = int(notna.sum())
+        if n_valid == 0:
+            return
+        self.non_null += n_valid
+        non_null = series[notna]
+        if len(self.leading) < _ISO_SAMPLE:
+            self.leading.extend(non_null.iloc[: _ISO_SAMPLE - len(self.leading)].tolist())
+        if len(self.examples) < self.max_sample_values:
+            # First distinct values in order of appearance, as in the in-memory report.
+            for value in pd.unique(non_null):
+                if len(self.examples) == self.max_sample_values:
+                    break
+                if value not in self.examples:
+                    self.examples.append(value)
+        self.distinct.update(hash_values(non_null))
+
+        if dates is not None:
+            covered = dates[notna]
+            covered = covered[~np.isnat(covered)]
+            if len(covered):
+                first, last = covered.min(), covered.max()
+                self.first_date = first if self.first_date is None else min(self.first_date, first)
+                self.last_date = last if self.last_date is None else max(self.last_date, last)
+                self.covered += len(covered)
+
+        if self.numeric:
+            values = pd.to_numeric(non_null, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if len(values) == 0:
+                return
+            n = len(values)
+            mean = float(values.mean())
+            m2 = float(((values - mean) ** 2).sum())
+            total = self.count + n
+            delta = mean - self.mean
+            self.mean += delta * n / total
+            self.m2 += m2 + delta * delta * self.count * n / total
+            self.count = total
+            self.zeros += int((values == 0).sum())
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self.quantiles.update(values)
+
+    def stats(self) -> dict[str, Any]:
+        if self.count == 0:
+            return dict.fromkeys(NUMERIC_STAT_KEYS)
+        p05, p25, median, p75, p95 = (float(v) for v in self.quantiles.quantiles((0.05, 0.25, 0.5, 0.75, 0.95)))
+        return {
+            "min": self.min,
+            "p05": p05,
+            "p25": p25,
+            "median": median,
+            "p75": p75,
+            "p95": p95,
+            "max": self.max,
+            "mean": self.mean,
+            "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan,
+        }
+
+    def proxy(self) -> pd.Series:
+        """Small stand-in for the column: the values unit and note inference look at."""
+        proxy = pd.Series(self.leading, dtype=self.dtype)
+        if self.count:
+            proxy = pd.concat([proxy, pd.Series([self.min, self.max], dtype="float64")], ignore_index=True)
+        return proxy
+
+    def coverage(self, sorted_dates: np.ndarray, cumulative: np.ndarray) -> dict[str, Any]:
+        if self.first_date is None or self.last_date is None:
+            return {
+                "first_non_null_date": None,
+                "last_non_null_date": None,
+                "coverage_span_days": None,
+                "coverage_within_span_pct": None,
+            }
+        first_day = pd.Timestamp(self.first_date)
+        last_day = pd.Timestamp(self.last_date)
+        lo = np.searchsorted(sorted_dates, self.first_date, side="left")
+        hi = np.searchsorted(sorted_dates, self.last_date, side="right")
+        in_span = int(cumulative[hi] - cumulative[lo])
+        return {
+            "first_non_null_date": first_day.date().isoformat(),
+            "last_non_null_date": last_day.date().isoformat(),
+            "coverage_span_days": int((last_day - first_day).days) + 1,
+            "coverage_within_span_pct": float(self.covered / in_span * 100.0) if in_span else None,
         }
+
+
+def build_data_dictionary_streaming(
+    path: Path,
+    max_sample_values: int = 5,
+    *,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> tuple[pd.DataFrame, SourceSummary]:
+    """Data dictionary of a parquet file (or partitioned directory) read in record batches.
+
+    Memory is bounded by one batch plus a fixed-size summary per column.
+    Counts, missingness, coverage windows, min/max, mean and std are exact;
+    ``n_unique`` and the quantiles come from sketches that stay exact up to
+    a few thousand values. Two extra columns report their error bounds:
+    ``n_unique_rel_error`` (relative standard error) and
+    ``quantile_rank_error`` (normalized rank error), both 0 when exact.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    schema = read_schema(path)
+    empty = schema.empty_table().to_pandas()
+    columns = {col: _StreamColumn(series, max_sample_values) for col, series in empty.items()}
+    has_dates = "calendarDate" in empty.columns
+    day_counts: dict[np.datetime64, int] = {}
+    n_rows = 0
+
+    for batch in iter_batches(path, batch_size=batch_size):
+        frame = pa.Table.from_batches([batch], schema=schema).to_pandas()
+        n_rows += len(frame)
+        dates = None
+        if has_dates:
+            calendar_dates = _calendar_dates(frame)
+            dates = calendar_dates.to_numpy(dtype="datetime64[ns]")
+            days, counts = np.unique(dates[~np.isnat(dates)], return_counts=True)
+            for day, count in zip(days, counts):
+                day_counts[day] = day_counts.get(day, 0) + int(count)
+        notna = frame.notna().to_numpy(dtype=bool)
+        for j, (col, series) in enumerate(frame.items()):
+            columns[col].update(series, notna[:, j], dates)
+
+    sorted_dates = np.array(sorted(day_counts), dtype="datetime64[ns]")
+    cumulative = np.concatenate([[0], np.cumsum([day_counts[day] for day in sorted_dates], dtype=np.int64)])
+    empty_coverage = _coverage_window_metrics(series=pd.Series(dtype="float64"), calendar_dates=None)
+
+    rows: list[dict[str, Any]] = []
+    for col, state in columns.items():
+        proxy = state.proxy()
+        row = _dictionary_row(
+            col,
+            proxy,
+            total=n_rows,
+            non_null=state.non_null,
+            n_unique=state.distinct.estimate(),
+            stats=state.stats() if state.numeric else dict.fromkeys(NUMERIC_STAT_KEYS),
+            zero_pct=float(state.zeros / state.count * 100.0) if state.count else None,
+            coverage=state.coverage(sorted_dates, cumulative) if has_dates else empty_coverage,
+            max_sample_values=max_sample_values,
+        )
+        # The proxy stands in for inference only; dtype and examples come from the real column.
+        row["dtype"] = str(state.dtype)
+        row["example_values"] = _example_values(pd.Series(state.examples, dtype=state.dtype), max_sample_values)
+        row["n_unique_rel_error"] = state.distinct.relative_error
+        row["quantile_rank_error"] = state.quantiles.rank_error if state.count else None
         rows.append(row)
 
-    return pd.DataFrame(rows)
+    first_date = last_date = None
+    if len(sorted_dates):
+        first_date = pd.Timestamp(sorted_dates[0]).date()
+        last_date = pd.Timestamp(sorted_dates[-1]).date()
+    summary = SourceSummary(n_rows=n_rows, n_columns=len(columns), first_date=first_date, last_date=last_date)
+    return pd.DataFrame(rows), summary
 
 
 def _truncate(value: str, max_len: int) -> str:
@@ -450,7 +937,7 @@ def _format_markdown_value(value: Any) -> str:
 
 def build_markdown_report(
     dictionary_df: pd.DataFrame,
-    source_df: pd.DataFrame,
+    source_df: pd.DataFrame | SourceSummary,
     *,
     options: DictionaryOptions | None = None,
     mode: str = "full",
@@ -460,14 +947,13 @@ def build_markdown_report(
 
     opts = options or DictionaryOptions()
 
+    source = source_df if isinstance(source_df, SourceSummary) else summarize_source(source_df)
     now = datetime.now(timezone.utc).isoformat()
-    shape = f"rows={len(source_df)}, columns={len(source_df.columns)}"
+    shape = f"rows={source.n_rows}, columns={source.n_columns}"
 
     date_range = ""
-    if "calendarDate" in source_df.columns:
-        dates = pd.to_datetime(source_df["calendarDate"], errors="coerce")
-        if dates.notna().any():
-            date_range = f"{dates.min().date()} to {dates.max().date()}"
+    if source.first_date is not None:
+        date_range = f"{source.first_date} to {source.last_date}"
 
     warnings = dictionary_df[dictionary_df["notes"] == "likely identifier"]["column"].tolist()
     warning_text = ""
@@ -675,7 +1161,7 @@ def build_markdown_report(
 
 def write_dictionary_reports(
     dictionary_df: pd.DataFrame,
-    source_df: pd.DataFrame,
+    source_df: pd.DataFrame | SourceSummary,
     out_dir: Path,
     *,
     options: DictionaryOptions | None = None,
@@ -684,6 +1170,8 @@ def write_dictionary_reports(
     if markdown_mode not in {"full", "summary", "both"}:
         raise ValueError("markdown_mode must be one of: full, summary, both")
 
+    if not isinstance(source_df, SourceSummary):
+        source_df = summarize_source(source_df)
     out_dir.mkdir(parents=True, exist_ok=True)
     csv_path = out_dir / "data_dictionary.csv"
     full_md_path = out_dir / "data_dictionary.md"
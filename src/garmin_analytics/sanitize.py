@@ -1,16 +1,40 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import math
+import os
 import re
+import threading
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
-
-
-_GUID_RE = re.compile(r"^[0-9a-fA-F-]{32,}$")
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .util.partitions import PARTITION_LAYOUTS, PartitionedWriter, read_table, replace_path, write_table
+
+
+# Rows per record batch when streaming a parquet through sanitize_parquet_file.
+SANITIZE_BATCH_SIZE = 65_536
+# Non-null values inspected per column by the GUID-like value check.
+GUID_SAMPLE_SIZE = 200
+# Which non-null values are inspected: the leading ones, a seeded uniform
+# random sample, or values spread evenly over the table (per row group for
+# parquet inputs).
+GUID_SAMPLE_STRATEGIES = ("head", "random", "stratified")
+GUID_SAMPLE_SEED = 0
+# Bump when the GUID rule or sampling changes so cached decisions are discarded.
+GUID_CACHE_VERSION = 2
+
+# RE2 syntax for pyarrow; the optional newline mirrors Python's ``$``.
+_GUID_PATTERN = r"^[0-9a-fA-F-]{32,}\n?$"
 _STRESS_LEVEL_RE = re.compile(r"(?:^|_)averageStressLevel(?:Intensity)?$")
 
 
@@ -40,7 +64,36 @@ def _looks_like_identifier_name(name: str) -> bool:
     return False
 
 
-def _looks_like_guid_column(series: pd.Series, sample_size: int = 200) -> bool:
+def _sample_values(non_null: pd.Series, sample_size: int, strategy: str) -> pd.Series:
+    if strategy == "head":
+        return non_null.head(sample_size)
+    if strategy == "random":
+        return non_null.sample(n=min(sample_size, len(non_null)), random_state=GUID_SAMPLE_SEED)
+    if strategy == "stratified":
+        positions = np.linspace(0, len(non_null) - 1, num=min(sample_size, len(non_null)))
+        return non_null.iloc[np.unique(positions.round().astype(np.int64))]
+    raise ValueError(f"Unknown GUID sample strategy: {strategy} (expected one of {GUID_SAMPLE_STRATEGIES})")
+
+
+def _looks_like_guid_sample(sample: pd.Series) -> bool:
+    """Apply the GUID rule to already sampled non-null values."""
+    if sample.empty:
+        return False
+
+    values = pa.array(sample.astype(str), from_pandas=True)
+    matches = pc.sum(pc.match_substring_regex(values, _GUID_PATTERN)).as_py() or 0
+    if len(sample) < 5:
+        # Conservative for small samples: drop only if everything matches.
+        return matches == len(sample)
+
+    return matches / len(sample) >= 0.8
+
+
+def _looks_like_guid_column(
+    series: pd.Series,
+    sample_size: int = GUID_SAMPLE_SIZE,
+    strategy: str = "head",
+) -> bool:
     if series.dtype.kind not in {"O", "U", "S"}:
         return False
 
@@ -48,13 +101,7 @@ def _looks_like_guid_column(series: pd.Series, sample_size: int = 200) -> bool:
     if non_null.empty:
         return False
 
-    sample = non_null.astype(str).head(sample_size)
-    matches = sample.map(lambda v: bool(_GUID_RE.match(v)))
-    if len(sample) < 5:
-        # Conservative for small samples: drop only if everything matches.
-        return bool(matches.all())
-
-    return matches.mean() >= 0.8
+    return _looks_like_guid_sample(_sample_values(non_null, sample_size, strategy))
 
 
 def _is_calendar_duplicate(col: str) -> bool:
@@ -82,25 +129,35 @@ def _normalize_stress_levels(df: pd.DataFrame) -> dict[str, int]:
         if not _is_stress_level_column(col):
             continue
 
-        numeric = pd.to_numeric(df[col], errors="coerce")
-        invalid_mask = numeric.notna() & ((numeric < 0) | (numeric > 100))
-        invalid_count = int(invalid_mask.sum())
+        masked, invalid_count = _mask_stress_levels(df[col])
         if invalid_count == 0:
             continue
 
-        df[col] = numeric.mask(invalid_mask)
+        df[col] = masked
         replaced_counts[col] = invalid_count
 
     return replaced_counts
 
 
-def _sanitize_dataframe_impl(
-    df: pd.DataFrame,
+def _mask_stress_levels(series: pd.Series) -> tuple[pd.Series, int]:
+    """Coerce to numeric and null out values outside [0, 100]; return the count nulled."""
+    numeric = pd.to_numeric(series, errors="coerce")
+    invalid_mask = numeric.notna() & ((numeric < 0) | (numeric > 100))
+    return numeric.mask(invalid_mask), int(invalid_mask.sum())
+
+
+def _plan_columns(
+    columns: list[str],
+    *,
+    is_guid_like: Callable[[str], bool],
     keep: list[str] | None = None,
     drop: list[str] | None = None,
-    *,
     allow_identifiers: bool,
-) -> tuple[pd.DataFrame, dict[str, Any]]:
+) -> tuple[list[str], set[str], list[str]]:
+    """Decide which columns to drop; return ``(kept_cols, to_drop, rules_applied)``.
+
+    ``is_guid_like(col)`` is only called when identifiers are not allowed.
+    """
     keep_set = set(keep or [])
     user_drop_set = set(drop or [])
 
@@ -113,7 +170,7 @@ def _sanitize_dataframe_impl(
     # Rule 1: Sensitive/identifier columns based on column names.
     sensitive_patterns = default_sensitive_column_patterns()
     sensitive_by_name: set[str] = set()
-    for col in df.columns:
+    for col in columns:
         if col == calendar_col:
             continue
         if any(p.search(col) for p in sensitive_patterns) or _looks_like_identifier_name(col):
@@ -127,10 +184,10 @@ def _sanitize_dataframe_impl(
     # Rule 1b: GUID-like values.
     guid_like: set[str] = set()
     if not allow_identifiers:
-        for col in df.columns:
+        for col in columns:
             if col == calendar_col:
                 continue
-            if _looks_like_guid_column(df[col]):
+            if is_guid_like(col):
                 guid_like.add(col)
         if guid_like:
             rules_applied.append("drop_guid_like_value_columns")
@@ -138,13 +195,13 @@ def _sanitize_dataframe_impl(
 
     # Rule 2: Redundant metadata.
     metadata_drop = {"version", "source"}
-    meta_cols = {c for c in df.columns if c != calendar_col and c in metadata_drop}
+    meta_cols = {c for c in columns if c != calendar_col and c in metadata_drop}
     if meta_cols:
         rules_applied.append("drop_redundant_metadata_columns")
         to_drop |= meta_cols
 
     # Rule 2b: Nested duplicates of calendarDate.
-    dup_cols = {c for c in df.columns if _is_calendar_duplicate(c)}
+    dup_cols = {c for c in columns if _is_calendar_duplicate(c)}
     if dup_cols:
         rules_applied.append("drop_nested_calendarDate_duplicates")
         to_drop |= dup_cols
@@ -165,19 +222,24 @@ def _sanitize_dataframe_impl(
 
     to_drop.discard(calendar_col)
 
-    kept_cols = [c for c in df.columns if c not in to_drop]
+    kept_cols = [c for c in columns if c not in to_drop]
     if calendar_col in kept_cols:
         kept_cols = [calendar_col] + [c for c in kept_cols if c != calendar_col]
+    return kept_cols, to_drop, rules_applied
 
-    out = df.loc[:, kept_cols].copy()
-    stress_replacements = _normalize_stress_levels(out)
 
+def _build_report(
+    kept_cols: list[str],
+    to_drop: set[str],
+    rules_applied: list[str],
+    stress_replacements: dict[str, int],
+) -> dict[str, Any]:
     if stress_replacements:
-        rules_applied.append("normalize_stress_levels_out_of_range_to_null")
+        rules_applied = [*rules_applied, "normalize_stress_levels_out_of_range_to_null"]
 
     report: dict[str, Any] = {
         "dropped_columns": sorted(to_drop),
-        "kept_columns": list(out.columns),
+        "kept_columns": list(kept_cols),
         "rules_applied": rules_applied,
     }
     if stress_replacements:
@@ -185,7 +247,27 @@ def _sanitize_dataframe_impl(
             "rule": "stress_levels_must_be_in_0_100",
             "replaced_to_null_by_column": dict(sorted(stress_replacements.items())),
         }
-    return out, report
+    return report
+
+
+def _sanitize_dataframe_impl(
+    df: pd.DataFrame,
+    keep: list[str] | None = None,
+    drop: list[str] | None = None,
+    *,
+    allow_identifiers: bool,
+    guid_sample: str = "head",
+) -> tuple[pd.DataFrame, dict[str, Any]]:
+    kept_cols, to_drop, rules_applied = _plan_columns(
+        list(df.columns),
+        is_guid_like=lambda col: _looks_like_guid_column(df[col], strategy=guid_sample),
+        keep=keep,
+        drop=drop,
+        allow_identifiers=allow_identifiers,
+    )
+    out = df.loc[:, kept_cols].copy()
+    stress_replacements = _normalize_stress_levels(out)
+    return out, _build_report(kept_cols, to_drop, rules_applied, stress_replacements)
 
 
 def sanitize_dataframe(
@@ -201,26 +283,309 @@ def sanitize_dataframe(
     return _sanitize_dataframe_impl(df, keep=keep, drop=drop, allow_identifiers=False)
 
 
+class GuidScanCache:
+    """GUID-check decisions keyed by column fingerprint.
+
+    A fingerprint hashes the column's chunk metadata from the parquet footer
+    (sizes, value counts, statistics) together with its Arrow type and the
+    sampling settings, so a cache hit costs no data I/O. A column is rescanned
+    when its chunks change, regardless of the other columns or the file's mtime.
+    Entries not looked up during a run are dropped on :meth:`save`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, bool] = {}
+        self._used: dict[str, bool] = {}
+        self.hits = 0
+        self.misses = 0
+        if path.exists():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                payload = {}
+            if isinstance(payload, dict) and payload.get("version") == GUID_CACHE_VERSION:
+                self._entries = {str(k): bool(v) for k, v in payload.get("columns", {}).items()}
+
+    def get(self, key: str) -> bool | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._used[key] = value
+            return value
+
+    def put(self, key: str, value: bool) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._used[key] = value
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": GUID_CACHE_VERSION, "columns": dict(sorted(self._used.items()))}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _column_fingerprints(
+    parquet: pq.ParquetFile,
+    columns: list[str],
+    *,
+    strategy: str,
+) -> dict[str, str]:
+    """Hash each column's chunk metadata plus everything the decision depends on.
+
+    Only the footer is read: per row group, the chunk's sizes, value count,
+    encodings and min/max/null statistics. A rewrite that keeps all of those
+    identical (e.g. rows reordered within a row group) is not noticed.
+    """
+    metadata = parquet.metadata
+    schema = parquet.schema_arrow
+    digests = {}
+    for col in columns:
+        digest = hashlib.sha256()
+        settings = [GUID_CACHE_VERSION, _GUID_PATTERN, strategy, GUID_SAMPLE_SIZE, GUID_SAMPLE_SEED, str(schema.field(col).type)]
+        digest.update(json.dumps(settings).encode("utf-8"))
+        digests[col] = digest
+
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for leaf in range(row_group.num_columns):
+            chunk = row_group.column(leaf)
+            col = chunk.path_in_schema.split(".", 1)[0]
+            digest = digests.get(col)
+            if digest is None:
+                continue
+            stats = chunk.statistics
+            bounds = [repr(stats.min), repr(stats.max)] if stats is not None and stats.has_min_max else None
+            summary = [
+                rg,
+                chunk.path_in_schema,
+                chunk.num_values,
+                chunk.total_compressed_size,
+                chunk.total_uncompressed_size,
+                chunk.compression,
+                sorted(chunk.encodings),
+                bounds,
+                None if stats is None else stats.null_count,
+            ]
+            digest.update(json.dumps(summary).encode("utf-8"))
+    return {col: digest.hexdigest() for col, digest in digests.items()}
+
+
+def _sample_guid_candidates(
+    parquet: pq.ParquetFile,
+    columns: list[str],
+    *,
+    batch_size: int,
+    strategy: str = "head",
+) -> dict[str, pd.Series]:
+    """Return up to ``GUID_SAMPLE_SIZE`` non-null values per column.
+
+    ``head`` reads batches only until every column has a full sample, so it
+    usually stops after the first batch. ``stratified`` takes an equal share
+    from the start of every row group. ``random`` streams all batches once and
+    keeps a seeded uniform sample (smallest random keys), so memory stays at
+    one batch plus the sample.
+    """
+    if strategy not in GUID_SAMPLE_STRATEGIES:
+        raise ValueError(f"Unknown GUID sample strategy: {strategy} (expected one of {GUID_SAMPLE_STRATEGIES})")
+    if not columns:
+        return {}
+
+    if strategy == "random":
+        rng = np.random.default_rng(GUID_SAMPLE_SEED)
+        kept: dict[str, tuple[pd.Series, np.ndarray]] = {}
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+            frame = pa.Table.from_batches([batch]).to_pandas()
+            for col in columns:
+                non_null = frame[col].dropna()
+                keys = rng.random(len(non_null))
+                if col in kept:
+                    non_null = pd.concat([kept[col][0], non_null])
+                    keys = np.concatenate([kept[col][1], keys])
+                order = np.argsort(keys, kind="stable")[:GUID_SAMPLE_SIZE]
+                kept[col] = (non_null.iloc[order], keys[order])
+        return {col: kept[col][0] if col in kept else pd.Series([], dtype=object) for col in columns}
+
+    if strategy == "stratified":
+        groups = [[rg] for rg in range(parquet.metadata.num_row_groups)]
+        quota = math.ceil(GUID_SAMPLE_SIZE / max(len(groups), 1))
+    else:
+        groups = [None]
+        quota = GUID_SAMPLE_SIZE
+
+    samples: dict[str, list[pd.Series]] = {col: [] for col in columns}
+    for row_groups in groups:
+        counts = dict.fromkeys(columns, 0)
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=columns, row_groups=row_groups):
+            frame = pa.Table.from_batches([batch]).to_pandas()
+            for col in columns:
+                if counts[col] >= quota:
+                    continue
+                non_null = frame[col].dropna().head(quota - counts[col])
+                samples[col].append(non_null)
+                counts[col] += len(non_null)
+            if all(count >= quota for count in counts.values()):
+                break
+
+    out = {}
+    for col, parts in samples.items():
+        sample = pd.concat(parts) if parts else pd.Series([], dtype=object)
+        # Row-group quotas can overshoot; thin evenly back to the sample size.
+        out[col] = _sample_values(sample, GUID_SAMPLE_SIZE, "stratified") if len(sample) > GUID_SAMPLE_SIZE else sample
+    return out
+
+
+def _output_schema(schema: pa.Schema, kept_cols: list[str], dtypes: dict[str, Any]) -> pa.Schema:
+    """Schema of the kept columns, retyped where stress normalization changed a dtype.
+
+    The pandas metadata is rewritten to match, as ``DataFrame.to_parquet`` of the
+    sanitized frame would.
+    """
+    retyped = pa.Schema.from_pandas(
+        pd.DataFrame({col: pd.Series([], dtype=dtype) for col, dtype in dtypes.items()}),
+        preserve_index=False,
+    )
+    fields = [retyped.field(col) if col in dtypes else schema.field(col) for col in kept_cols]
+
+    metadata = dict(schema.metadata or {})
+    if b"pandas" in metadata:
+        pandas_meta = json.loads(metadata[b"pandas"])
+        entries = {entry["name"]: entry for entry in pandas_meta.get("columns", [])}
+        entries.update({entry["name"]: entry for entry in retyped.pandas_metadata["columns"]})
+        pandas_meta["columns"] = [entries[col] for col in kept_cols if col in entries]
+        pandas_meta["index_columns"] = []
+        metadata[b"pandas"] = json.dumps(pandas_meta).encode("utf-8")
+    return pa.schema(fields, metadata=metadata or None)
+
+
 def sanitize_parquet_file(
     input_path: Path,
     output_path: Path,
     *,
     allow_identifiers: bool = False,
+    batch_size: int = SANITIZE_BATCH_SIZE,
+    guid_sample: str = "head",
+    guid_cache: GuidScanCache | None = None,
+    partition_by: str = "none",
 ) -> dict[str, Any]:
-    """Read a parquet, sanitize it, and write to output_path.
+    """Sanitize a parquet into output_path, reading the data once.
+
+    Drop decisions come from the parquet schema plus a sampled scan of the
+    columns the GUID check applies to (``guid_sample`` picks which values;
+    ``guid_cache`` skips columns whose bytes were already checked). The kept columns are then streamed in
+    record batches, with stress-level normalization applied per batch, and the
+    file is moved into place when complete (``output_path`` may equal
+    ``input_path``). Output matches ``_sanitize_dataframe_impl`` on the full frame.
+
+    ``partition_by="month"`` writes a month-partitioned directory (see
+    :mod:`garmin_analytics.util.partitions`). A partitioned input is read
+    whole and sanitized with ``_sanitize_dataframe_impl``, without the GUID cache.
 
     Returns the report dict for this file.
     """
-    df = pd.read_parquet(input_path)
-    sanitized, report = _sanitize_dataframe_impl(df, allow_identifiers=allow_identifiers)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    sanitized.to_parquet(output_path, index=False, engine="pyarrow")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    if partition_by not in PARTITION_LAYOUTS:
+        raise ValueError(f"Unknown partition layout: {partition_by}. Expected one of: {', '.join(PARTITION_LAYOUTS)}")
+
+    if input_path.is_dir():
+        df = read_table(input_path)
+        out, report = _sanitize_dataframe_impl(df, allow_identifiers=allow_identifiers, guid_sample=guid_sample)
+        write_table(out, output_path, partition_by=partition_by)
+        report["input_path"] = str(input_path)
+        report["output_path"] = str(output_path)
+        report["rows"] = len(df)
+        report["cols_before"] = len(df.columns)
+        report["cols_after"] = len(out.columns)
+        return report
+
+    parquet = pq.ParquetFile(input_path)
+    schema = parquet.schema_arrow
+    pandas_meta = schema.pandas_metadata or {}
+    index_cols = {col for col in pandas_meta.get("index_columns", []) if isinstance(col, str)}
+    columns = [col for col in schema.names if col not in index_cols]
+    n_rows = parquet.metadata.num_rows
+
+    # Empty-table dtypes match what a full read produces; the GUID check only
+    # looks at object-like columns.
+    empty_dtypes = schema.empty_table().to_pandas().dtypes
+    guid_candidates = [] if allow_identifiers else [col for col in columns if empty_dtypes[col].kind in {"O", "U", "S"}]
+    guid_like: dict[str, bool] = {}
+    fingerprints: dict[str, str] = {}
+    if guid_cache is not None and guid_candidates:
+        fingerprints = _column_fingerprints(parquet, guid_candidates, strategy=guid_sample)
+        for col, key in fingerprints.items():
+            cached = guid_cache.get(key)
+            if cached is not None:
+                guid_like[col] = cached
+    to_scan = [col for col in guid_candidates if col not in guid_like]
+    samples = _sample_guid_candidates(parquet, to_scan, batch_size=batch_size, strategy=guid_sample)
+    for col, sample in samples.items():
+        guid_like[col] = _looks_like_guid_sample(sample)
+        if guid_cache is not None:
+            guid_cache.put(fingerprints[col], guid_like[col])
+
+    kept_cols, to_drop, rules_applied = _plan_columns(
+        columns,
+        is_guid_like=lambda col: guid_like.get(col, False),
+        allow_identifiers=allow_identifiers,
+    )
+
+    # Stress columns are narrow: normalize them on the full column once to fix
+    # replacement counts and output dtypes before streaming.
+    stress_cols = [col for col in kept_cols if _is_stress_level_column(col)]
+    stress_replacements: dict[str, int] = {}
+    stress_dtypes: dict[str, Any] = {}
+    if stress_cols:
+        stress_df = pd.read_parquet(input_path, columns=stress_cols)
+        stress_replacements = _normalize_stress_levels(stress_df)
+        stress_dtypes = {col: stress_df[col].dtype for col in stress_replacements}
+
+    out_schema = _output_schema(schema, kept_cols, stress_dtypes)
+
+    def _sanitized_batches() -> Iterator[pa.Table]:
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=kept_cols):
+            if stress_dtypes:
+                table = pa.Table.from_batches([batch])
+                frame = table.select(list(stress_dtypes)).to_pandas()
+                for col, dtype in stress_dtypes.items():
+                    masked, _ = _mask_stress_levels(frame[col])
+                    values = pa.array(masked.astype(dtype), type=out_schema.field(col).type, from_pandas=True)
+                    table = table.set_column(table.schema.get_field_index(col), out_schema.field(col), values)
+                batch_table = table
+            else:
+                batch_table = pa.Table.from_batches([batch])
+            yield batch_table.cast(out_schema)
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if partition_by == "month":
+        with PartitionedWriter(output_path, out_schema) as partitioned:
+            for table in _sanitized_batches():
+                partitioned.write_table(table)
+    else:
+        tmp = output_path.with_name(output_path.name + ".tmp")
+        try:
+            with pq.ParquetWriter(tmp, out_schema) as writer:
+                for table in _sanitized_batches():
+                    writer.write_table(table)
+            replace_path(tmp, output_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    report = _build_report(kept_cols, to_drop, rules_applied, stress_replacements)
     report["input_path"] = str(input_path)
     report["output_path"] = str(output_path)
-    report["rows"] = int(len(df))
-    report["cols_before"] = int(df.shape[1])
-    report["cols_after"] = int(sanitized.shape[1])
+    report["rows"] = int(n_rows)
+    report["cols_before"] = len(columns)
+    report["cols_after"] = len(kept_cols)
     return report
 
 
@@ -1,10 +1,11 @@
 """SQL marts and query runners for portfolio analytics."""
 
-from .mart import SqlMartBuildResult, build_sql_mart
+from .mart import SqlMartBuildResult, TableRefresh, build_sql_mart
 from .runner import QueryRunResult, run_sql_directory
 
 __all__ = [
     "SqlMartBuildResult",
+    "TableRefresh",
     "QueryRunResult",
     "build_sql_mart",
     "run_sql_directory",
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import functools
+import hashlib
 import importlib
 from pathlib import Path
 from typing import Any
 
+import pandas as pd
+
+from ..ingest.manifest import FileFingerprint, fingerprint_file
+from ..util.partitions import DateRange, normalize_date_range
+
 
 SLEEP_FALLBACK_COLUMNS: tuple[str, ...] = (
     "sleepStartTimestampGMT",
@@ -35,6 +42,65 @@ QUALITY_FALLBACK_COLUMNS: tuple[str, ...] = (
     "corrupted_stress_only_day",
 )
 
+# Bookkeeping table: which source (and content hash) each fact table was built from.
+MART_SOURCES_TABLE = "_mart_sources"
+# Fingerprints of the part files of month-partitioned sources, so unchanged parts skip hashing.
+MART_SOURCE_PARTS_TABLE = "_mart_source_parts"
+
+# Relations each mart view reads, in dependency order; drives refreshes of materialized views.
+VIEW_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "vw_day_to_next_sleep": ("fact_daily", "fact_quality", "fact_sleep"),
+    "vw_sleep_nights": ("fact_sleep",),
+    "vw_weekday_profiles": ("vw_day_to_next_sleep",),
+}
+
+MART_VIEWS: tuple[str, ...] = tuple(VIEW_DEPENDENCIES)
+
+# How fact tables are stored: copied into DuckDB, views over the parquet
+# sources, or views plus hot_* tables holding only the columns the mart views read.
+STORAGE_MODES: tuple[str, ...] = ("table", "external", "hybrid")
+
+# Fact columns read by the mart views (besides calendarDate); see _view_queries.
+HOT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "fact_daily": (
+        "totalSteps",
+        "totalDistanceMeters",
+        "activeKilocalories",
+        "awakeAverageStressLevel",
+        "allDayStress_AWAKE_averageStressLevel",
+        "maxHeartRate",
+        "bodyBatteryLowest",
+    ),
+    "fact_sleep": (
+        "sleepStartTimestampGMT",
+        "sleepEndTimestampGMT",
+        "sleepOverallScore",
+        "sleepQualityScore",
+        "sleepRecoveryScore",
+        "avgSleepStress",
+        "sleepAverageStressLevel",
+        "deepSleepSeconds",
+        "lightSleepSeconds",
+        "remSleepSeconds",
+        "awakeSleepSeconds",
+    ),
+    "fact_quality": (
+        "day_quality_label_strict",
+        "valid_day_strict",
+        "corrupted_stress_only_day",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class TableRefresh:
+    """What one build did to a fact table: ``created``, ``updated`` or ``unchanged``."""
+
+    table: str
+    action: str
+    upserted: int = 0
+    deleted: int = 0
+
 
 @dataclass(frozen=True)
 class SqlMartBuildResult:
@@ -49,6 +115,10 @@ class SqlMartBuildResult:
     fact_quality_rows: int
     day_to_next_sleep_rows: int
     weekday_profile_rows: int
+    refreshes: tuple[TableRefresh, ...] = ()
+    views_rebuilt: bool = True
+    materialized: tuple[str, ...] = ()
+    mode: str = "table"
 
 
 def _require_duckdb() -> Any:
@@ -123,56 +193,361 @@ def _coalesced_value(
     return f"COALESCE({', '.join(present)})"
 
 
-def _create_fact_table_from_parquet(
-    connection: Any,
-    *,
-    table_name: str,
-    parquet_path: Path,
-) -> None:
-    connection.execute(
-        f"""
-        CREATE OR REPLACE TABLE {table_name} AS
-        SELECT
-            CAST(calendarDate AS DATE) AS calendarDate,
-            * EXCLUDE (calendarDate)
-        FROM read_parquet(?)
-        """,
-        [str(parquet_path)],
-    )
+PARQUET_SOURCE_SQL = """
+    SELECT
+        CAST(calendarDate AS DATE) AS calendarDate,
+        * EXCLUDE (calendarDate)
+    FROM read_parquet(?)
+"""
 
+# Month-partitioned sources (see util.partitions); the year/month keys only
+# drive file pruning and are not copied into the fact tables.
+PARTITIONED_SOURCE_SQL = """
+    SELECT
+        CAST(calendarDate AS DATE) AS calendarDate,
+        * EXCLUDE (calendarDate, year, month)
+    FROM read_parquet(?, hive_partitioning = true, hive_types = {'year': INTEGER, 'month': INTEGER})
+"""
 
-def _create_sleep_fallback_from_daily(connection: Any) -> None:
+
+@dataclass(frozen=True)
+class _FactSource:
+    """Query a fact table is built from, plus the identity recorded for it."""
+
+    table: str
+    select_sql: str
+    params: tuple[Any, ...]
+    source: str
+    fingerprint: FileFingerprint | None
+    parts: tuple[tuple[str, FileFingerprint], ...] = ()
+
+
+def _fallback_select_sql(connection: Any, columns: tuple[str, ...]) -> str:
     daily_columns = _table_columns(connection, "fact_daily")
-    fallback_cols = [col for col in SLEEP_FALLBACK_COLUMNS if col in daily_columns]
+    fallback_cols = [col for col in columns if col in daily_columns]
     projection = ",\n            ".join(["calendarDate", *fallback_cols])
-    connection.execute(
-        f"""
-        CREATE OR REPLACE TABLE fact_sleep AS
+    return f"""
         SELECT
             {projection}
         FROM fact_daily
         """
-    )
 
 
-def _create_quality_fallback_from_daily(connection: Any) -> None:
-    daily_columns = _table_columns(connection, "fact_daily")
-    fallback_cols = [col for col in QUALITY_FALLBACK_COLUMNS if col in daily_columns]
-    projection = ",\n            ".join(["calendarDate", *fallback_cols])
+def _relation_type(connection: Any, name: str) -> str | None:
+    row = connection.execute(
+        """
+        SELECT 'TABLE' FROM duckdb_tables() WHERE table_name = ?
+        UNION ALL
+        SELECT 'VIEW' FROM duckdb_views() WHERE view_name = ? AND NOT internal
+        """,
+        [name, name],
+    ).fetchone()
+    return None if row is None else str(row[0])
+
+
+def _drop_relation(connection: Any, name: str) -> None:
+    # DuckDB refuses DROP TABLE on a view (and vice versa), so look the type up first.
+    kind = _relation_type(connection, name)
+    if kind is not None:
+        connection.execute(f"DROP {kind} {name}")
+
+
+def _sql_string(value: Any) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _create_fact_table(connection: Any, source: _FactSource) -> None:
+    _drop_relation(connection, source.table)
+    connection.execute(f"CREATE TABLE {source.table} AS {source.select_sql}", list(source.params))
+
+
+def _create_fact_view(connection: Any, source: _FactSource) -> None:
+    # View definitions cannot take prepared parameters, so the source path is inlined.
+    select_sql = source.select_sql
+    for param in source.params:
+        select_sql = select_sql.replace("?", _sql_string(param), 1)
+    _drop_relation(connection, source.table)
+    connection.execute(f"CREATE VIEW {source.table} AS {select_sql}")
+
+
+def _table_exists(connection: Any, table: str) -> bool:
+    return bool(connection.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = ?", [table]).fetchone()[0])
+
+
+def _recorded_sources(connection: Any) -> dict[str, tuple[str, FileFingerprint | None]]:
+    if not _table_exists(connection, MART_SOURCES_TABLE):
+        return {}
+    out: dict[str, tuple[str, FileFingerprint | None]] = {}
+    rows = connection.execute(f"SELECT table_name, source, size, mtime_ns, sha256 FROM {MART_SOURCES_TABLE}")
+    for table, source, size, mtime_ns, sha256 in rows.fetchall():
+        fp = FileFingerprint(size=size, mtime_ns=mtime_ns, sha256=sha256) if sha256 is not None else None
+        out[str(table)] = (str(source), fp)
+    return out
+
+
+def _recorded_parts(connection: Any) -> dict[str, FileFingerprint]:
+    if not _table_exists(connection, MART_SOURCE_PARTS_TABLE):
+        return {}
+    rows = connection.execute(f"SELECT part, size, mtime_ns, sha256 FROM {MART_SOURCE_PARTS_TABLE}")
+    return {
+        str(part): FileFingerprint(size=size, mtime_ns=mtime_ns, sha256=sha256)
+        for part, size, mtime_ns, sha256 in rows.fetchall()
+    }
+
+
+def _record_sources(connection: Any, sources: list[_FactSource]) -> None:
     connection.execute(
         f"""
-        CREATE OR REPLACE TABLE fact_quality AS
-        SELECT
-            {projection}
-        FROM fact_daily
+        CREATE TABLE IF NOT EXISTS {MART_SOURCES_TABLE} (
+            table_name VARCHAR PRIMARY KEY,
+            source VARCHAR,
+            size BIGINT,
+            mtime_ns BIGINT,
+            sha256 VARCHAR
+        )
         """
     )
+    for source in sources:
+        fp = source.fingerprint
+        connection.execute(
+            f"INSERT OR REPLACE INTO {MART_SOURCES_TABLE} VALUES (?, ?, ?, ?, ?)",
+            [
+                source.table,
+                source.source,
+                fp.size if fp is not None else None,
+                fp.mtime_ns if fp is not None else None,
+                fp.sha256 if fp is not None else None,
+            ],
+        )
 
+    connection.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {MART_SOURCE_PARTS_TABLE} (
+            table_name VARCHAR,
+            part VARCHAR,
+            size BIGINT,
+            mtime_ns BIGINT,
+            sha256 VARCHAR
+        )
+        """
+    )
+    for source in sources:
+        connection.execute(f"DELETE FROM {MART_SOURCE_PARTS_TABLE} WHERE table_name = ?", [source.table])
+        if source.parts:
+            connection.executemany(
+                f"INSERT INTO {MART_SOURCE_PARTS_TABLE} VALUES (?, ?, ?, ?, ?)",
+                [[source.table, part, fp.size, fp.mtime_ns, fp.sha256] for part, fp in source.parts],
+            )
+
+
+def _fingerprint_source(
+    path: Path,
+    previous: FileFingerprint | None,
+    previous_parts: dict[str, FileFingerprint],
+) -> tuple[FileFingerprint, tuple[tuple[str, FileFingerprint], ...]]:
+    """Fingerprint a source plus, for a partitioned one, each of its part files.
+
+    Parts whose size and mtime match ``previous_parts`` (keyed by absolute
+    path) are not hashed again.
+    """
+    if not path.is_dir():
+        return fingerprint_file(path, previous), ()
+    # A partitioned source is identified by the content of all its part files.
+    parts: list[tuple[str, FileFingerprint]] = []
+    digest = hashlib.sha256()
+    for part in sorted(path.rglob("*.parquet")):
+        key = str(part.resolve())
+        fp = fingerprint_file(part, previous_parts.get(key))
+        parts.append((key, fp))
+        digest.update(f"{part.relative_to(path).as_posix()}:{fp.sha256}\n".encode("utf-8"))
+    fingerprint = FileFingerprint(
+        size=sum(fp.size for _, fp in parts),
+        mtime_ns=max((fp.mtime_ns for _, fp in parts), default=0),
+        sha256=digest.hexdigest(),
+    )
+    return fingerprint, tuple(parts)
+
+
+def _date_conditions(date_range: tuple[pd.Timestamp | None, pd.Timestamp | None], *, partitioned: bool) -> list[str]:
+    start, end = date_range
+    conditions = []
+    if start is not None:
+        conditions.append(f"CAST(calendarDate AS DATE) >= DATE '{start.date()}'")
+        if partitioned:
+            conditions.append(f"(year > {start.year} OR (year = {start.year} AND month >= {start.month}))")
+    if end is not None:
+        conditions.append(f"CAST(calendarDate AS DATE) <= DATE '{end.date()}'")
+        if partitioned:
+            conditions.append(f"(year < {end.year} OR (year = {end.year} AND month <= {end.month}))")
+    return conditions
+
+
+def _parquet_source(
+    table: str,
+    path: Path,
+    recorded: dict[str, tuple[str, FileFingerprint | None]],
+    date_range: tuple[pd.Timestamp | None, pd.Timestamp | None] = (None, None),
+    recorded_parts: dict[str, FileFingerprint] | None = None,
+) -> _FactSource:
+    partitioned = path.is_dir()
+    select_sql = PARTITIONED_SOURCE_SQL if partitioned else PARQUET_SOURCE_SQL
+    conditions = _date_conditions(date_range, partitioned=partitioned)
+    source = str(path)
+    if conditions:
+        select_sql += "    WHERE " + "\n        AND ".join(conditions) + "\n"
+        start, end = date_range
+        source += f" [{start.date() if start is not None else ''}..{end.date() if end is not None else ''}]"
+    # Absolute, so external fact views keep working from any directory.
+    location = path.resolve() / "*" / "*" / "*.parquet" if partitioned else path.resolve()
+    previous = recorded.get(table)
+    previous_fp = previous[1] if previous is not None and previous[0] == source else None
+    fingerprint, parts = _fingerprint_source(path, previous_fp, recorded_parts or {})
+    return _FactSource(
+        table=table,
+        select_sql=select_sql,
+        params=(str(location),),
+        source=source,
+        fingerprint=fingerprint,
+        parts=parts,
+    )
 
-def _create_views(connection: Any) -> None:
-    daily_cols = _table_columns(connection, "fact_daily")
-    sleep_cols = _table_columns(connection, "fact_sleep")
-    quality_cols = _table_columns(connection, "fact_quality")
+
+def _fallback_source(connection: Any, table: str, columns: tuple[str, ...], daily: _FactSource) -> _FactSource:
+    # Derived from fact_daily, so it is unchanged exactly when the daily source is.
+    return _FactSource(
+        table=table,
+        select_sql=_fallback_select_sql(connection, columns),
+        params=(),
+        source="fact_daily",
+        fingerprint=daily.fingerprint,
+    )
+
+
+def _schema(connection: Any, relation_sql: str, params: tuple[Any, ...] = ()) -> list[tuple[str, str]]:
+    return [(str(row[0]), str(row[1])) for row in connection.execute(f"DESCRIBE {relation_sql}", list(params)).fetchall()]
+
+
+def _has_date_key(connection: Any, table: str) -> bool:
+    rows = connection.execute(
+        """
+        SELECT constraint_column_names
+        FROM duckdb_constraints()
+        WHERE table_name = ? AND constraint_type = 'PRIMARY KEY'
+        """,
+        [table],
+    ).fetchall()
+    return any(list(row[0]) == ["calendarDate"] for row in rows)
+
+
+def _check_date_key(connection: Any, source: _FactSource) -> None:
+    nulls, duplicates = connection.execute(
+        f"""
+        SELECT
+            COUNT(*) FILTER (WHERE calendarDate IS NULL),
+            COUNT(calendarDate) - COUNT(DISTINCT calendarDate)
+        FROM ({source.select_sql})
+        """,
+        list(source.params),
+    ).fetchone()
+    if nulls or duplicates:
+        raise ValueError(
+            f"Incremental refresh of {source.table} needs one row per calendarDate; "
+            f"{source.source} has {nulls} null and {duplicates} duplicate dates. Rebuild without --incremental."
+        )
+
+
+def _rebuild_fact_table(connection: Any, source: _FactSource) -> TableRefresh:
+    _create_fact_table(connection, source)
+    return TableRefresh(source.table, "created", upserted=_count_rows(connection, source.table))
+
+
+def _link_fact_table(connection: Any, source: _FactSource) -> TableRefresh:
+    _create_fact_view(connection, source)
+    return TableRefresh(source.table, "created", upserted=_count_rows(connection, source.table))
+
+
+def _hot_name(table: str) -> str:
+    return "hot_" + table.removeprefix("fact_")
+
+
+def _create_hot_tables(connection: Any) -> None:
+    """Copy ``calendarDate`` plus the present ``HOT_COLUMNS`` of each fact view, in date order."""
+    for table, columns in HOT_COLUMNS.items():
+        present = _table_columns(connection, table)
+        projection = ", ".join(["calendarDate", *[col for col in columns if col in present]])
+        hot = _hot_name(table)
+        connection.execute(f"CREATE OR REPLACE TABLE {hot} AS SELECT {projection} FROM {table} ORDER BY calendarDate")
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{hot}_date ON {hot}(calendarDate)")
+
+
+def _count_views(connection: Any) -> int:
+    placeholders = ", ".join("?" * len(MART_VIEWS))
+    query = f"SELECT COUNT(*) FROM duckdb_views() WHERE view_name IN ({placeholders})"
+    return int(connection.execute(query, list(MART_VIEWS)).fetchone()[0])
+
+
+def _refresh_fact_table(
+    connection: Any,
+    source: _FactSource,
+    recorded: dict[str, tuple[str, FileFingerprint | None]],
+) -> TableRefresh:
+    """Bring one fact table in line with its source, touching only changed days.
+
+    A missing table or a schema change recreates the table. Otherwise rows
+    whose content differs from the source (``EXCEPT``) are upserted with
+    ``INSERT OR REPLACE`` keyed on ``calendarDate`` and days gone from the
+    source are deleted.
+    """
+    existing = _table_exists(connection, source.table)
+    if existing and _schema(connection, source.table) == _schema(connection, source.select_sql, source.params):
+        previous = recorded.get(source.table)
+        if previous is not None and source.fingerprint is not None and previous[1] is not None:
+            if previous[0] == source.source and previous[1].sha256 == source.fingerprint.sha256:
+                return TableRefresh(source.table, "unchanged")
+        _check_date_key(connection, source)
+        if not _has_date_key(connection, source.table):
+            # Full builds leave the key out; the date index is recreated after the refresh.
+            connection.execute(f"DROP INDEX IF EXISTS idx_{source.table}_date")
+            connection.execute(f"ALTER TABLE {source.table} ADD PRIMARY KEY (calendarDate)")
+        params = list(source.params)
+        connection.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _mart_changed AS
+            ({source.select_sql})
+            EXCEPT
+            (SELECT * FROM {source.table})
+            """,
+            params,
+        )
+        deleted = connection.execute(
+            f"""
+            DELETE FROM {source.table}
+            WHERE calendarDate NOT IN (SELECT calendarDate FROM ({source.select_sql}))
+            """,
+            params,
+        ).fetchone()[0]
+        upserted = connection.execute(f"INSERT OR REPLACE INTO {source.table} SELECT * FROM _mart_changed").fetchone()[0]
+        connection.execute("DROP TABLE _mart_changed")
+        if not upserted and not deleted:
+            return TableRefresh(source.table, "unchanged")
+        return TableRefresh(source.table, "updated", upserted=int(upserted), deleted=int(deleted))
+
+    _check_date_key(connection, source)
+    _create_fact_table(connection, source)
+    connection.execute(f"ALTER TABLE {source.table} ADD PRIMARY KEY (calendarDate)")
+    return TableRefresh(source.table, "created", upserted=_count_rows(connection, source.table))
+
+
+def _view_queries(connection: Any, *, hot: bool = False) -> dict[str, str]:
+    """SELECT statement of every mart view, in dependency order.
+
+    With ``hot`` the views read the ``hot_*`` tables instead of the fact relations.
+    """
+    queries: dict[str, str] = {}
+    daily, sleep, quality = (_hot_name(t) if hot else t for t in ("fact_daily", "fact_sleep", "fact_quality"))
+    daily_cols = _table_columns(connection, daily)
+    sleep_cols = _table_columns(connection, sleep)
+    quality_cols = _table_columns(connection, quality)
 
     quality_label_expr = _optional_select(
         quality_cols,
@@ -203,9 +578,7 @@ def _create_views(connection: Any) -> None:
         as_name="nextsleep_avg_sleep_stress",
     )
 
-    connection.execute(
-        f"""
-        CREATE OR REPLACE VIEW vw_day_to_next_sleep AS
+    queries["vw_day_to_next_sleep"] = f"""
         SELECT
             d.calendarDate AS day_date,
             {_optional_select(daily_cols, alias='d', column='totalSteps', sql_type='DOUBLE', as_name='day_total_steps')},
@@ -230,14 +603,13 @@ def _create_views(connection: Any) -> None:
             {sleep_avg_stress_expr},
             {_optional_select(sleep_cols, alias='s', column='sleepStartTimestampGMT', sql_type='DOUBLE', as_name='nextsleep_start_ts_gmt')},
             {_optional_select(sleep_cols, alias='s', column='sleepEndTimestampGMT', sql_type='DOUBLE', as_name='nextsleep_end_ts_gmt')}
-        FROM fact_daily AS d
-        LEFT JOIN fact_quality AS q
+        FROM {daily} AS d
+        LEFT JOIN {quality} AS q
             ON q.calendarDate = d.calendarDate
-        LEFT JOIN fact_sleep AS s
+        LEFT JOIN {sleep} AS s
             ON s.calendarDate = d.calendarDate + INTERVAL 1 DAY
         ORDER BY d.calendarDate
         """
-    )
 
     sleep_start_expr = _coalesced_value(
         sleep_cols,
@@ -287,9 +659,7 @@ def _create_views(connection: Any) -> None:
     else:
         stage_hours_expr = "CAST(NULL AS DOUBLE)"
 
-    connection.execute(
-        f"""
-        CREATE OR REPLACE VIEW vw_sleep_nights AS
+    queries["vw_sleep_nights"] = f"""
         SELECT
             s.calendarDate AS sleep_date,
             {sleep_start_expr} AS sleep_start_ts_gmt,
@@ -305,14 +675,11 @@ def _create_views(connection: Any) -> None:
                 THEN ({sleep_end_expr} - {sleep_start_expr}) / 3600.0
                 ELSE {stage_hours_expr}
             END AS sleep_hours
-        FROM fact_sleep AS s
+        FROM {sleep} AS s
         ORDER BY s.calendarDate
         """
-    )
 
-    connection.execute(
-        """
-        CREATE OR REPLACE VIEW vw_weekday_profiles AS
+    queries["vw_weekday_profiles"] = """
         SELECT
             CAST(date_part('isodow', day_date) AS INTEGER) AS iso_weekday,
             dayname(day_date) AS weekday_name,
@@ -326,7 +693,53 @@ def _create_views(connection: Any) -> None:
         GROUP BY 1, 2
         ORDER BY 1
         """
-    )
+    return queries
+
+
+def _materialized_name(view: str) -> str:
+    return "mat_" + view.removeprefix("vw_")
+
+
+def _create_views(connection: Any, *, materialize: bool = False, hot: bool = False) -> None:
+    """Create the mart views; with ``materialize`` each is backed by a table.
+
+    Materialized tables are written in the views' date order, so DuckDB's
+    per-row-group min/max statistics let date filters skip row groups. The
+    ``vw_*`` names stay as ``SELECT *`` views over them, so queries are
+    unchanged.
+    """
+    for view, query in _view_queries(connection, hot=hot).items():
+        table = _materialized_name(view)
+        if materialize:
+            connection.execute(f"CREATE OR REPLACE TABLE {table} AS {query}")
+            connection.execute(f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM {table}")
+        else:
+            connection.execute(f"CREATE OR REPLACE VIEW {view} AS {query}")
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def _stale_views(changed_tables: set[str]) -> list[str]:
+    """Views whose materialized table depends, directly or not, on ``changed_tables``."""
+    stale: list[str] = []
+    changed = set(changed_tables)
+    for view, deps in VIEW_DEPENDENCIES.items():
+        if changed.intersection(deps):
+            stale.append(view)
+            changed.add(view)
+    return stale
+
+
+def _refresh_materialized(connection: Any, views: list[str]) -> None:
+    queries = _view_queries(connection)
+    for view in views:
+        connection.execute(f"CREATE OR REPLACE TABLE {_materialized_name(view)} AS {queries[view]}")
+
+
+def _is_materialized(connection: Any) -> bool:
+    names = [_materialized_name(view) for view in MART_VIEWS]
+    placeholders = ", ".join("?" * len(names))
+    query = f"SELECT COUNT(*) FROM duckdb_tables() WHERE table_name IN ({placeholders})"
+    return int(connection.execute(query, names).fetchone()[0]) == len(names)
 
 
 def _count_rows(connection: Any, relation: str) -> int:
@@ -340,52 +753,122 @@ def build_sql_mart(
     sleep_path: Path | None,
     quality_path: Path | None,
     overwrite: bool = True,
+    incremental: bool = False,
+    materialize: bool = False,
+    mode: str = "table",
+    date_range: DateRange | None = None,
 ) -> SqlMartBuildResult:
-    """Build a local DuckDB analytics mart from Stage 1 outputs."""
+    """Build a local DuckDB analytics mart from Stage 1 outputs.
+
+    With ``incremental=True`` an existing mart is refreshed in place (see
+    :func:`_refresh_fact_table`): fact tables whose source fingerprint is
+    unchanged are skipped, changed days are upserted, and views are only
+    recreated when a table had to be rebuilt. ``overwrite`` is ignored then.
+
+    With ``materialize=True`` the views are backed by ``mat_*`` tables (see
+    :func:`_create_views`). An incremental refresh recomputes only those
+    that depend on a changed fact table (``VIEW_DEPENDENCIES``).
+
+    ``mode`` (see ``STORAGE_MODES``) decides how fact tables are stored.
+    ``table`` copies the sources into DuckDB. ``external`` defines the
+    ``fact_*`` relations as views over ``read_parquet`` and copies nothing, so
+    the mart reads the parquet files at query time and needs them in place.
+    ``hybrid`` keeps those views for ad-hoc queries and copies only the
+    ``HOT_COLUMNS`` the mart views read into ``hot_*`` tables, which the
+    views then use. Incremental refresh applies to ``table`` mode only.
+
+    ``date_range`` (inclusive ``(start, end)``, either side may be None)
+    limits every fact table to those days. Month-partitioned sources are
+    pruned to the overlapping ``year=/month=`` directories.
+    """
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown mart mode: {mode}. Expected one of: {', '.join(STORAGE_MODES)}")
+    if incremental and mode != "table":
+        raise ValueError(f"Incremental refresh needs mode 'table'; {mode} marts are rebuilt in full.")
     if not daily_path.exists():
         raise FileNotFoundError(f"Missing daily parquet source: {daily_path}")
+    dates = normalize_date_range(date_range)
 
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    if overwrite and db_path.exists():
+    if overwrite and not incremental and db_path.exists():
         db_path.unlink()
 
     duckdb = _require_duckdb()
     connection = duckdb.connect(str(db_path))
     try:
         connection.execute("PRAGMA enable_progress_bar=false")
-
-        _create_fact_table_from_parquet(connection, table_name="fact_daily", parquet_path=daily_path)
-
-        sleep_source: Path | None = None
-        if sleep_path is not None and sleep_path.exists():
-            _create_fact_table_from_parquet(connection, table_name="fact_sleep", parquet_path=sleep_path)
-            sleep_source = sleep_path
-        else:
-            _create_sleep_fallback_from_daily(connection)
-
-        quality_source: Path | None = None
-        if quality_path is not None and quality_path.exists():
-            _create_fact_table_from_parquet(connection, table_name="fact_quality", parquet_path=quality_path)
-            quality_source = quality_path
+        recorded = _recorded_sources(connection)
+        recorded_parts = _recorded_parts(connection)
+        if mode != "table":
+            build_table = _link_fact_table
+        elif incremental:
+            build_table = functools.partial(_refresh_fact_table, recorded=recorded)
         else:
-            _create_quality_fallback_from_daily(connection)
-
-        connection.execute("CREATE INDEX IF NOT EXISTS idx_fact_daily_date ON fact_daily(calendarDate)")
-        connection.execute("CREATE INDEX IF NOT EXISTS idx_fact_sleep_date ON fact_sleep(calendarDate)")
-        connection.execute("CREATE INDEX IF NOT EXISTS idx_fact_quality_date ON fact_quality(calendarDate)")
-
-        _create_views(connection)
+            build_table = _rebuild_fact_table
+        if incremental:
+            connection.execute("BEGIN TRANSACTION")
+        try:
+            daily = _parquet_source("fact_daily", daily_path, recorded, dates, recorded_parts)
+            refreshes = [build_table(connection, daily)]
+            sources = [daily]
+            # The fallbacks project fact_daily, so they are resolved after it is built.
+            for table, path, fallback_columns in (
+                ("fact_sleep", sleep_path, SLEEP_FALLBACK_COLUMNS),
+                ("fact_quality", quality_path, QUALITY_FALLBACK_COLUMNS),
+            ):
+                if path is not None and path.exists():
+                    source = _parquet_source(table, path, recorded, dates, recorded_parts)
+                else:
+                    source = _fallback_source(connection, table, fallback_columns, daily)
+                refreshes.append(build_table(connection, source))
+                sources.append(source)
+
+            if mode == "table":
+                connection.execute("CREATE INDEX IF NOT EXISTS idx_fact_daily_date ON fact_daily(calendarDate)")
+                connection.execute("CREATE INDEX IF NOT EXISTS idx_fact_sleep_date ON fact_sleep(calendarDate)")
+                connection.execute("CREATE INDEX IF NOT EXISTS idx_fact_quality_date ON fact_quality(calendarDate)")
+            if mode == "hybrid":
+                _create_hot_tables(connection)
+            else:
+                for table in HOT_COLUMNS:
+                    connection.execute(f"DROP TABLE IF EXISTS {_hot_name(table)}")
+
+            views_rebuilt = (
+                not incremental
+                or _count_views(connection) < len(MART_VIEWS)
+                or any(refresh.action == "created" for refresh in refreshes)
+                or _is_materialized(connection) != materialize
+            )
+            if views_rebuilt:
+                _create_views(connection, materialize=materialize, hot=mode == "hybrid")
+                materialized = list(MART_VIEWS) if materialize else []
+            elif materialize:
+                materialized = _stale_views({r.table for r in refreshes if r.action != "unchanged"})
+                _refresh_materialized(connection, materialized)
+            else:
+                materialized = []
+            _record_sources(connection, sources)
+            if incremental:
+                connection.execute("COMMIT")
+        except BaseException:
+            if incremental:
+                connection.execute("ROLLBACK")
+            raise
 
         return SqlMartBuildResult(
             db_path=db_path,
             daily_source=daily_path,
-            sleep_source=sleep_source,
-            quality_source=quality_source,
+            sleep_source=sleep_path if sources[1].source != "fact_daily" else None,
+            quality_source=quality_path if sources[2].source != "fact_daily" else None,
             fact_daily_rows=_count_rows(connection, "fact_daily"),
             fact_sleep_rows=_count_rows(connection, "fact_sleep"),
             fact_quality_rows=_count_rows(connection, "fact_quality"),
             day_to_next_sleep_rows=_count_rows(connection, "vw_day_to_next_sleep"),
             weekday_profile_rows=_count_rows(connection, "vw_weekday_profiles"),
+            refreshes=tuple(refreshes),
+            views_rebuilt=views_rebuilt,
+            materialized=tuple(_materialized_name(view) for view in materialized),
+            mode=mode,
         )
     finally:
         connection.close()
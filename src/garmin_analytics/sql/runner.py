@@ -1,19 +1,125 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import importlib
 from pathlib import Path
+import queue
+import time
 from typing import Any
+import warnings
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+OUTPUT_FORMATS: tuple[str, ...] = ("csv", "parquet", "arrow")
+
+# Rows per Arrow record batch fetched from DuckDB for arrow exports.
+EXPORT_BATCH_ROWS = 65_536
 
 
 @dataclass(frozen=True)
 class QueryRunResult:
-    """Metadata for one executed SQL query file."""
+    """Metadata for one executed SQL query file.
+
+    ``output_path`` is the written result file (``.csv``, ``.parquet`` or
+    ``.arrow``). ``latencies_seconds`` holds one wall-clock time per run: query
+    plus fetch for CSV, query plus file write for parquet/arrow.
+    """
 
     query_path: Path
-    output_csv_path: Path
+    output_path: Path
     rows: int
     columns: int
+    latencies_seconds: tuple[float, ...] = ()
+
+    @property
+    def output_csv_path(self) -> Path:
+        """Deprecated alias of ``output_path``."""
+        warnings.warn(
+            "QueryRunResult.output_csv_path is deprecated; use output_path",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.output_path
+
+    @property
+    def p50_seconds(self) -> float | None:
+        return _percentile(self.latencies_seconds, 0.50)
+
+    @property
+    def p95_seconds(self) -> float | None:
+        return _percentile(self.latencies_seconds, 0.95)
+
+
+def _percentile(values: tuple[float, ...], q: float) -> float | None:
+    # Linear interpolation between closest ranks (numpy's default method).
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _copy_to_parquet(cursor: Any, query_text: str, path: Path) -> tuple[int, int]:
+    """Write a query result with DuckDB's own parquet writer (``COPY ... TO``)."""
+    body = query_text.strip().rstrip(";")
+    target = str(path).replace("'", "''")
+    # Newlines keep a trailing line comment in the query from swallowing the parenthesis.
+    cursor.execute(f"COPY (\n{body}\n) TO '{target}' (FORMAT parquet)")
+    parquet = pq.ParquetFile(path)
+    return parquet.metadata.num_rows, len(parquet.schema_arrow)
+
+
+def _export_arrow_batches(cursor: Any, query_text: str, path: Path) -> tuple[int, int]:
+    """Stream a query result to an Arrow IPC file, one record batch at a time."""
+    result = cursor.execute(query_text)
+    # Newer DuckDB releases deprecate fetch_record_batch in favour of to_arrow_reader.
+    fetch_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    reader = fetch_reader(EXPORT_BATCH_ROWS)
+    rows = 0
+    with pa.ipc.new_file(str(path), reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows, len(reader.schema)
+
+
+def _run_query(
+    cursors: queue.Queue[Any],
+    query_path: Path,
+    output_dir: Path,
+    repeat: int,
+    output_format: str,
+) -> QueryRunResult:
+    query_text = query_path.read_text(encoding="utf-8")
+    output_path = output_dir / f"{query_path.stem}.{output_format}"
+    cursor = cursors.get()
+    try:
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            if output_format == "csv":
+                frame = cursor.execute(query_text).df()
+                rows, columns = len(frame), len(frame.columns)
+            elif output_format == "parquet":
+                rows, columns = _copy_to_parquet(cursor, query_text, output_path)
+            else:
+                rows, columns = _export_arrow_batches(cursor, query_text, output_path)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        cursors.put(cursor)
+    if output_format == "csv":
+        frame.to_csv(output_path, index=False)
+    return QueryRunResult(
+        query_path=query_path,
+        output_path=output_path,
+        rows=rows,
+        columns=columns,
+        latencies_seconds=tuple(latencies),
+    )
 
 
 def run_sql_directory(
@@ -21,8 +127,28 @@ def run_sql_directory(
     db_path: Path,
     query_dir: Path,
     output_dir: Path,
+    jobs: int = 1,
+    repeat: int = 1,
+    output_format: str = "csv",
 ) -> list[QueryRunResult]:
-    """Execute each .sql file against DuckDB and write CSV outputs."""
+    """Execute each .sql file against DuckDB and write one result file per query.
+
+    ``output_format`` is ``csv`` (via pandas, as before), ``parquet``
+    (DuckDB's ``COPY ... TO``) or ``arrow`` (DuckDB's Arrow record batches
+    streamed to an IPC file). The columnar formats skip pandas and keep the
+    column types.
+
+    Queries run on ``jobs`` cursors of one read-only connection, and each
+    file is written as soon as its query finishes. With ``repeat > 1`` every
+    query runs that many times (the file holds the last result) so the
+    latencies can serve as a benchmark. Results follow the file order.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format} (expected one of {OUTPUT_FORMATS})")
     if not db_path.exists():
         raise FileNotFoundError(f"Missing DuckDB file: {db_path}")
     if not query_dir.exists():
@@ -36,23 +162,19 @@ def run_sql_directory(
 
     duckdb = _require_duckdb()
     connection = duckdb.connect(str(db_path), read_only=True)
+    # A DuckDB connection must not be shared between threads; each worker borrows a cursor.
+    cursors: queue.Queue[Any] = queue.Queue()
+    for _ in range(min(jobs, len(query_files))):
+        cursor = connection.cursor()
+        cursor.execute("SET enable_progress_bar = false")
+        cursors.put(cursor)
     try:
-        results: list[QueryRunResult] = []
-        for query_path in query_files:
-            query_text = query_path.read_text(encoding="utf-8")
-            frame = connection.execute(query_text).df()
-            csv_path = output_dir / f"{query_path.stem}.csv"
-            frame.to_csv(csv_path, index=False)
-            results.append(
-                QueryRunResult(
-                    query_path=query_path,
-                    output_csv_path=csv_path,
-                    rows=len(frame),
-                    columns=len(frame.columns),
-                )
-            )
-        return results
+        with ThreadPoolExecutor(max_workers=cursors.qsize()) as pool:
+            futures = [pool.submit(_run_query, cursors, path, output_dir, repeat, output_format) for path in query_files]
+            return [future.result() for future in futures]
     finally:
+        while not cursors.empty():
+            cursors.get().close()
         connection.close()
 
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from pathlib import Path
 
 import pandas as pd
 
 from ..eda.prepare import build_eda_frames, load_daily_sanitized, load_quality
 from ..modeling.prepare import add_modeling_features, prepare_day_to_next_sleep
+from ..util.partitions import DateRange, normalize_date_range
 
 WEEKDAY_ORDER_FULL: tuple[str, ...] = (
     "Monday",
@@ -52,8 +54,8 @@ def build_stat_validation_frames(
     """Build the canonical data slices used by Stage 3 statistical validation."""
     frames = build_eda_frames(daily_df, quality_df)
 
-    day_strict = add_modeling_features(frames["df_strict"].copy())
-    sleep = add_modeling_features(frames["df_sleep"].copy())
+    day_strict = add_modeling_features(frames["df_strict"])
+    sleep = add_modeling_features(frames["df_sleep"])
     sleep_onset = add_sleep_onset_weekday(sleep)
     day_nextsleep = prepare_day_to_next_sleep(day_strict, sleep, NEXT_SLEEP_VALIDATION_COLUMNS)
 
@@ -67,7 +69,24 @@ def build_stat_validation_frames(
 def load_stat_validation_frames(
     daily_path: str | Path,
     quality_path: str | Path,
+    *,
+    columns: Sequence[str] | None = None,
+    date_range: DateRange | None = None,
 ) -> dict[str, pd.DataFrame]:
-    daily_df = load_daily_sanitized(daily_path)
-    quality_df = load_quality(quality_path)
-    return build_stat_validation_frames(daily_df, quality_df)
+    """Load parquet inputs and build the Stage 3 validation frames.
+
+    ``columns`` limits the daily columns read (``calendarDate`` is always
+    loaded; the quality table is read in full). ``date_range`` keeps only days
+    in that inclusive range, reading one day past its end so the last day
+    still gets its next-night sleep.
+    """
+    start, end = normalize_date_range(date_range)
+    read_range = None if date_range is None else (start, None if end is None else end + pd.Timedelta(days=1))
+    daily_df = load_daily_sanitized(daily_path, columns=columns, date_range=read_range)
+    quality_df = load_quality(quality_path, date_range=read_range)
+    frames = build_stat_validation_frames(daily_df, quality_df)
+    if end is not None:
+        frames = {
+            name: frame.loc[frame["calendarDate"] <= end].reset_index(drop=True) for name, frame in frames.items()
+        }
+    return frames
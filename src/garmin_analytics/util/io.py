@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import mmap
 import os
+import re
+from collections.abc import Generator, Iterator, Sequence
 from pathlib import Path
 
 import orjson
@@ -55,3 +58,171 @@ def list_sleep_files(export_dir: Path | None = None) -> list[Path]:
 def read_json(path: Path) -> object:
     """Read a JSON file using orjson."""
     return orjson.loads(path.read_bytes())
+
+
+# Files at least this large are scanned through a memory map instead of being
+# decoded in one go.
+LAZY_JSON_MIN_BYTES = 32 * 1024 * 1024
+
+_WS_RE = re.compile(rb"[ \t\r\n]*")
+_STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_SCALAR_RE = re.compile(rb"[^,\]}\s]*")
+# Strings are matched whole so brackets inside them are never counted.
+_NESTING_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|([\[{])|([\]}])')
+
+
+def _select_records(
+    payload: object,
+    container_keys: Sequence[str],
+    record_markers: Sequence[str],
+) -> Iterator[object]:
+    if isinstance(payload, list):
+        yield from payload
+    elif isinstance(payload, dict):
+        if any(key in payload for key in record_markers):
+            yield payload
+            return
+        for key in container_keys:
+            if isinstance(payload.get(key), list):
+                yield from payload[key]
+                return
+
+
+class _JsonScanner:
+    """Walk a memory-mapped JSON document one value at a time."""
+
+    def __init__(self, buf: mmap.mmap) -> None:
+        self.buf = buf
+
+    def skip_ws(self, pos: int) -> int:
+        return _WS_RE.match(self.buf, pos).end()
+
+    def expect(self, pos: int, allowed: tuple[bytes, ...]) -> int:
+        """Skip whitespace and check the next byte is one of ``allowed``."""
+        pos = self.skip_ws(pos)
+        if self.buf[pos : pos + 1] not in allowed:
+            raise ValueError(f"Malformed JSON at byte {pos}")
+        return pos
+
+    def _exact_end(self, pos: int) -> int:
+        """Find a container's end with a string-aware scan."""
+        depth = 0
+        for match in _NESTING_TOKEN_RE.finditer(self.buf, pos):
+            if match.lastindex == 1:
+                depth += 1
+            elif match.lastindex == 2:
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise ValueError(f"Unterminated container at byte {pos}")
+
+    def _scalar_end(self, pos: int) -> int:
+        if self.buf[pos : pos + 1] == b'"':
+            match = _STRING_RE.match(self.buf, pos)
+            if match is None:
+                raise ValueError(f"Unterminated string at byte {pos}")
+            return match.end()
+        return _SCALAR_RE.match(self.buf, pos).end()
+
+    def read(self, pos: int) -> tuple[object, int]:
+        """Decode the value at ``pos``; return it with the offset just past it."""
+        if self.buf[pos : pos + 1] in (b"{", b"["):
+            end = self._exact_end(pos)
+        else:
+            end = self._scalar_end(pos)
+        return orjson.loads(self.buf[pos:end]), end
+
+    def skip(self, pos: int) -> int:
+        """Return the offset past the value at ``pos`` without keeping it."""
+        if self.buf[pos : pos + 1] == b"[":
+            items = self.array_items(pos)
+            while True:
+                try:
+                    next(items)
+                except StopIteration as done:
+                    return done.value
+        if self.buf[pos : pos + 1] == b"{":
+            return self.read(pos)[1]
+        return self._scalar_end(pos)
+
+    def array_items(self, start: int) -> Generator[object, None, int]:
+        """Decode and yield the items of the array at ``start`` one by one.
+
+        The generator returns the offset just past the closing bracket.
+        """
+        pos = self.skip_ws(start + 1)
+        if self.buf[pos : pos + 1] == b"]":
+            return pos + 1
+        while True:
+            item, end = self.read(pos)
+            yield item
+            pos = self.expect(end, (b",", b"]"))
+            if self.buf[pos : pos + 1] == b"]":
+                return pos + 1
+            pos = self.skip_ws(pos + 1)
+
+    def object_members(self, start: int) -> dict[str, int]:
+        """Map each key of the object at ``start`` to its value offset (last key wins)."""
+        members: dict[str, int] = {}
+        pos = self.skip_ws(start + 1)
+        if self.buf[pos : pos + 1] == b"}":
+            return members
+        while True:
+            key, key_end = self.read(pos)
+            pos = self.skip_ws(self.expect(key_end, (b":",)) + 1)
+            members[str(key)] = pos
+            pos = self.expect(self.skip(pos), (b",", b"}"))
+            if self.buf[pos : pos + 1] == b"}":
+                return members
+            pos = self.skip_ws(pos + 1)
+
+
+def _iter_mapped_records(
+    buf: mmap.mmap,
+    container_keys: Sequence[str],
+    record_markers: Sequence[str],
+) -> Iterator[object]:
+    scanner = _JsonScanner(buf)
+    start = scanner.skip_ws(0)
+    first = buf[start : start + 1]
+    if first == b"[":
+        yield from scanner.array_items(start)
+    elif first == b"{":
+        members = scanner.object_members(start)
+        if any(key in members for key in record_markers):
+            yield scanner.read(start)[0]
+            return
+        for key in container_keys:
+            value_start = members.get(key)
+            if value_start is not None and buf[value_start : value_start + 1] == b"[":
+                yield from scanner.array_items(value_start)
+                return
+
+
+def iter_json_records(
+    path: Path,
+    *,
+    container_keys: Sequence[str] = (),
+    record_markers: Sequence[str] = (),
+    lazy_min_bytes: int | None = None,
+) -> Iterator[object]:
+    """Yield the records of a JSON export file one at a time.
+
+    A top-level array yields its items. A top-level object yields itself when
+    it has any of ``record_markers``, otherwise the items of the first
+    ``container_keys`` entry holding an array.
+
+    Files of ``lazy_min_bytes`` (default ``LAZY_JSON_MIN_BYTES``) or more are
+    memory-mapped and scanned for record boundaries, and each record is
+    decoded on its own, so a huge file never has a full decoded copy in
+    memory. Smaller files are decoded in one call, which is faster.
+    """
+    if lazy_min_bytes is None:
+        lazy_min_bytes = LAZY_JSON_MIN_BYTES
+    size = path.stat().st_size
+    if size < lazy_min_bytes or size == 0:
+        yield from _select_records(read_json(path), container_keys, record_markers)
+        return
+
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        yield from _iter_mapped_records(buf, container_keys, record_markers)
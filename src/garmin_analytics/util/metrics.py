@@ -0,0 +1,153 @@
+"""Per-command timing, memory and row-count metrics.
+
+Commands are wrapped with :func:`instrumented`; inside a command,
+:func:`record_rows` and :func:`record_output` attach row counts and written
+files to the active measurement. When an output file is configured (the CLI's
+``--metrics-out``), every finished measurement is appended to it as one JSON
+line. Without one, measuring costs a few clock reads and nothing is written.
+"""
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TypeVar
+
+import orjson
+
+try:  # Not available on Windows.
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_output_path: Path | None = None
+_write_lock = threading.Lock()
+
+
+@dataclass
+class StageMetrics:
+    """Metrics of one command run, serialized as one JSON line.
+
+    ``cpu_seconds`` and ``peak_rss_bytes`` are process-wide: when stages run
+    concurrently (``garmin-analytics run --jobs N``) they include the other
+    stages running at the same time. ``peak_rss_bytes`` is the process
+    high-water mark when the command finished.
+    """
+
+    command: str
+    started_at: str
+    status: str = "ok"
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int | None = None
+    rows_in: int | None = None
+    rows_out: int | None = None
+    rows_per_second: float | None = None
+    bytes_written: int = 0
+    outputs: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+_current: ContextVar[StageMetrics | None] = ContextVar("garmin_analytics_metrics", default=None)
+
+
+def configure_metrics_output(path: Path | None) -> None:
+    """Append metrics JSON lines to ``path`` from now on (None disables)."""
+    global _output_path
+    _output_path = path
+
+
+def _peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def _size_bytes(path: Path) -> int:
+    # Month-partitioned outputs are directories of parquet files.
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size if path.is_file() else 0
+
+
+def _emit(metrics: StageMetrics) -> None:
+    path = _output_path
+    if path is None:
+        return
+    line = orjson.dumps(asdict(metrics)) + b"\n"
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("ab") as handle:
+            handle.write(line)
+
+
+@contextmanager
+def measure(command: str) -> Iterator[StageMetrics]:
+    """Measure the enclosed block and emit its metrics when it ends."""
+    metrics = StageMetrics(command=command, started_at=datetime.now(timezone.utc).isoformat())
+    token = _current.set(metrics)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield metrics
+    except BaseException as err:
+        # typer.Exit(code=0) is a normal early return.
+        if getattr(err, "exit_code", None) != 0:
+            metrics.status = "error"
+            metrics.error = type(err).__name__
+        raise
+    finally:
+        _current.reset(token)
+        metrics.wall_seconds = round(time.perf_counter() - wall_start, 6)
+        metrics.cpu_seconds = round(time.process_time() - cpu_start, 6)
+        metrics.peak_rss_bytes = _peak_rss_bytes()
+        metrics.bytes_written = sum(_size_bytes(Path(p)) for p in metrics.outputs)
+        if metrics.rows_out is not None and metrics.wall_seconds > 0:
+            metrics.rows_per_second = round(metrics.rows_out / metrics.wall_seconds, 3)
+        _emit(metrics)
+
+
+def instrumented(command: str) -> Callable[[F], F]:
+    """Decorate a CLI command so each call is wrapped in :func:`measure`."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with measure(command):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record_rows(*, rows_in: int | None = None, rows_out: int | None = None) -> None:
+    """Add input/output row counts to the active measurement, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if rows_in is not None:
+        metrics.rows_in = (metrics.rows_in or 0) + int(rows_in)
+    if rows_out is not None:
+        metrics.rows_out = (metrics.rows_out or 0) + int(rows_out)
+
+
+def record_output(*paths: Path | None) -> None:
+    """Register files written by the active measurement (sizes are read at exit)."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    for path in paths:
+        if path is not None and str(path) not in metrics.outputs:
+            metrics.outputs.append(str(path))
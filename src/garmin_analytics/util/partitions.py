@@ -0,0 +1,285 @@
+"""Month-partitioned (Hive-style) layout for the processed parquet tables.
+
+With ``partition_by="month"`` a table such as ``daily.parquet`` is written as a
+directory of ``year=YYYY/month=MM/part-0.parquet`` files instead of one file.
+The path stays the same, so commands find their inputs as before, and
+:func:`read_table` reads either layout. Given a date range it only opens the
+month directories that overlap it, so the last 90 days cost three or four
+small files however many years are stored.
+
+The ``year``/``month`` keys live in the directory names only; readers drop
+them, so both layouts load into the same DataFrame.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from collections.abc import Iterator, Sequence
+from datetime import date
+from pathlib import Path
+from types import TracebackType
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PARTITION_LAYOUTS: tuple[str, ...] = ("none", "month")
+PARTITION_COLUMNS: tuple[str, ...] = ("year", "month")
+DATE_COLUMN = "calendarDate"
+
+DateLike = str | date | pd.Timestamp | None
+DateRange = tuple[DateLike, DateLike]
+
+
+def normalize_date_range(date_range: DateRange | None) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """Inclusive ``(start, end)`` as midnight timestamps; either side may be open (None)."""
+    if date_range is None:
+        return None, None
+    start, end = (None if value is None else pd.Timestamp(value).normalize() for value in date_range)
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"Empty date range: {start.date()} is after {end.date()}")
+    return start, end
+
+
+def partition_dir(year: int, month: int) -> str:
+    return f"year={year:04d}/month={month:02d}"
+
+
+def _calendar_dates(values: pd.Series) -> pd.Series:
+    dates = pd.to_datetime(values, errors="coerce")
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        dates = dates.dt.tz_localize(None)
+    return dates.dt.normalize()
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def replace_path(tmp: Path, path: Path) -> None:
+    """Move ``tmp`` (file or directory) to ``path``, replacing either layout there.
+
+    A plain rename covers file-over-file. Otherwise the old target is first
+    moved aside to ``<name>.old`` (a directory rename cannot replace a file or
+    a non-empty directory) and removed once ``tmp`` is in place.
+    """
+    if not path.exists() or (path.is_file() and tmp.is_file()):
+        os.replace(tmp, path)
+        return
+    old = path.with_name(path.name + ".old")
+    _remove(old)
+    os.replace(path, old)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        os.replace(old, path)
+        raise
+    _remove(old)
+
+
+class PartitionedWriter:
+    """Write Arrow tables into a month-partitioned directory.
+
+    Rows are routed to one ``ParquetWriter`` per month, so input in date order
+    keeps each month in one file written in row-group batches. Files go to a
+    temporary directory that replaces ``path`` on a clean exit; on error it is
+    removed and ``path`` is left untouched.
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema) -> None:
+        if DATE_COLUMN not in schema.names:
+            raise ValueError(f"Month partitioning needs a {DATE_COLUMN} column")
+        self.path = path
+        self.schema = schema
+        self.rows = 0
+        self._tmp = path.with_name(path.name + ".tmp")
+        self._writers: dict[tuple[int, int], pq.ParquetWriter] = {}
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        self._tmp.mkdir(parents=True)
+
+    def write_table(self, table: pa.Table) -> None:
+        dates = _calendar_dates(table.column(DATE_COLUMN).to_pandas())
+        if dates.isna().any():
+            raise ValueError(f"Month partitioning needs a {DATE_COLUMN} on every row")
+        keys = (dates.dt.year * 100 + dates.dt.month).to_numpy()
+        for key in pd.unique(keys):
+            year, month = divmod(int(key), 100)
+            writer = self._writers.get((year, month))
+            if writer is None:
+                target = self._tmp / partition_dir(year, month) / "part-0.parquet"
+                target.parent.mkdir(parents=True)
+                writer = pq.ParquetWriter(target, self.schema)
+                self._writers[(year, month)] = writer
+            writer.write_table(table.filter(pa.array(keys == key)))
+        self.rows += table.num_rows
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        self.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+
+    def _close_writers(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def close(self) -> None:
+        try:
+            self._close_writers()
+            replace_path(self._tmp, self.path)
+        except BaseException:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            raise
+
+    def abort(self) -> None:
+        self._close_writers()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def __enter__(self) -> PartitionedWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_table(df: pd.DataFrame, path: Path, *, partition_by: str = "none") -> None:
+    """Write ``df`` to ``path`` as one parquet file (``none``) or by month."""
+    if partition_by not in PARTITION_LAYOUTS:
+        raise ValueError(f"Unknown partition layout: {partition_by}. Expected one of: {', '.join(PARTITION_LAYOUTS)}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if partition_by == "none":
+        if path.is_dir():
+            shutil.rmtree(path)
+        df.to_parquet(path, index=False, engine="pyarrow")
+        return
+    with PartitionedWriter(path, pa.Schema.from_pandas(df, preserve_index=False)) as writer:
+        writer.write_frame(df)
+
+
+def _open_dataset(path: Path) -> ds.Dataset:
+    return ds.dataset(path, format="parquet", partitioning="hive")
+
+
+def read_schema(path: Path) -> pa.Schema:
+    """Arrow schema of the data columns (partition keys excluded) of either layout."""
+    if not path.is_dir():
+        return pq.read_schema(path)
+    schema = _open_dataset(path).schema
+    return pa.schema([field for field in schema if field.name not in PARTITION_COLUMNS], metadata=schema.metadata)
+
+
+def _month_filter(start: pd.Timestamp | None, end: pd.Timestamp | None) -> ds.Expression | None:
+    year, month = ds.field("year"), ds.field("month")
+    expr = None
+    if start is not None:
+        expr = (year > start.year) | ((year == start.year) & (month >= start.month))
+    if end is not None:
+        upper = (year < end.year) | ((year == end.year) & (month <= end.month))
+        expr = upper if expr is None else expr & upper
+    return expr
+
+
+def _date_filter(field: pa.Field, start: pd.Timestamp | None, end: pd.Timestamp | None) -> ds.Expression | None:
+    """Filter on the stored ``calendarDate`` that pyarrow checks against row-group statistics.
+
+    It may keep a few rows outside the range (the exact day filter runs after
+    the read) but never drops one inside it. Types it cannot compare safely get
+    no filter: tz-aware timestamps, and strings, whose text order only matches
+    date order for zero-padded ISO dates ("2025-1-5" sorts after "2025-01-31").
+    """
+    if pa.types.is_timestamp(field.type) and field.type.tz is None:
+        lower = None if start is None else pa.scalar(start.to_pydatetime(), type=field.type)
+        upper = None if end is None else pa.scalar((end + pd.Timedelta(days=1)).to_pydatetime(), type=field.type)
+    elif pa.types.is_date(field.type):
+        lower = None if start is None else pa.scalar(start.date(), type=field.type)
+        upper = None if end is None else pa.scalar((end + pd.Timedelta(days=1)).date(), type=field.type)
+    else:
+        return None
+    column = ds.field(field.name)
+    expr = None
+    if lower is not None:
+        expr = column >= lower
+    if upper is not None:
+        expr = column < upper if expr is None else expr & (column < upper)
+    return expr
+
+
+def _and(*exprs: ds.Expression | None) -> ds.Expression | None:
+    out = None
+    for expr in exprs:
+        if expr is not None:
+            out = expr if out is None else out & expr
+    return out
+
+
+def read_table(
+    path: Path,
+    *,
+    columns: Sequence[str] | None = None,
+    date_range: DateRange | None = None,
+) -> pd.DataFrame:
+    """Read a processed table in either layout, optionally limited to columns and a date range.
+
+    ``columns`` is pushed down to the parquet reader, so other columns are never
+    decoded; asking for a column the table lacks raises ``KeyError``.
+    ``date_range`` is an inclusive ``(start, end)`` pair on ``calendarDate``
+    (either side may be None). Row groups whose ``calendarDate`` statistics fall
+    outside it are skipped, and on a partitioned directory so are the months
+    outside it; rows are then filtered to the exact days.
+    """
+    path = Path(path)
+    start, end = normalize_date_range(date_range)
+    filtered = start is not None or end is not None
+    schema = read_schema(path)
+
+    read_columns = None if columns is None else list(columns)
+    if read_columns is not None:
+        missing = [name for name in read_columns if name not in schema.names]
+        if missing:
+            raise KeyError(f"{path} is missing columns: {missing}")
+    if filtered:
+        if DATE_COLUMN not in schema.names:
+            raise KeyError(f"date_range needs a {DATE_COLUMN} column in {path}")
+        if read_columns is not None and DATE_COLUMN not in read_columns:
+            read_columns.append(DATE_COLUMN)
+    date_filter = _date_filter(schema.field(DATE_COLUMN), start, end) if filtered else None
+
+    if path.is_dir():
+        table = _open_dataset(path).to_table(
+            columns=schema.names if read_columns is None else read_columns,
+            filter=_and(_month_filter(start, end), date_filter),
+        )
+        df = table.to_pandas()
+    else:
+        df = pd.read_parquet(path, columns=read_columns, filters=date_filter)
+
+    if filtered:
+        dates = _calendar_dates(df[DATE_COLUMN])
+        keep = dates.notna()
+        if start is not None:
+            keep &= dates >= start
+        if end is not None:
+            keep &= dates <= end
+        df = df.loc[keep.to_numpy()].reset_index(drop=True)
+        if columns is not None and DATE_COLUMN not in columns:
+            df = df.drop(columns=DATE_COLUMN)
+    return df
+
+
+def iter_batches(path: Path, *, batch_size: int) -> Iterator[pa.RecordBatch]:
+    """Record batches of the data columns of either layout, in file order."""
+    if not path.is_dir():
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+        return
+    schema = read_schema(path)
+    yield from _open_dataset(path).to_batches(columns=schema.names, batch_size=batch_size)
@@ -1,3 +1,8 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 from typer.testing import CliRunner
 
 from garmin_analytics import __version__
@@ -23,3 +28,34 @@ def test_cli_help_lists_commands() -> None:
         "run-sql-portfolio",
     ]:
         assert cmd in output
+
+
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "duckdb", "scipy", "sklearn")
+
+# Cumulative import time allowed for garmin_analytics.cli (importing pandas
+# alone costs more than this on a typical laptop).
+CLI_IMPORT_BUDGET_US = 350_000
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    src_dir = str(Path(__file__).resolve().parents[1] / "src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")]))}
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def test_cli_import_does_not_load_heavy_dependencies() -> None:
+    code = (
+        "import sys, garmin_analytics.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert _python("-c", code).stdout.strip() == ""
+
+
+def test_cli_import_time_budget() -> None:
+    result = _python("-X", "importtime", "-c", "import garmin_analytics.cli")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+        if len(parts) == 3 and parts[1].isdigit():
+            cumulative[parts[2]] = int(parts[1])
+    assert cumulative["garmin_analytics.cli"] < CLI_IMPORT_BUDGET_US
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from garmin_analytics.reports.data_dictionary import (
     build_data_dictionary,
+    build_data_dictionary_streaming,
     build_markdown_report,
     write_dictionary_reports,
 )
+from garmin_analytics.reports.sketches import HyperLogLog, KllSketch, hash_values
 
 
 def test_data_dictionary_stats_and_inference() -> None:
@@ -199,3 +203,115 @@ def test_unit_inference_timestamp_and_hr_edge_cases() -> None:
 
     r_algo = dd[dd["column"] == "respiration_algorithmVersion"].iloc[0]
     assert r_algo["inferred_unit"] == ""
+
+
+def test_columnar_engine_matches_legacy_engine() -> None:
+    rng = np.random.default_rng(7)
+    n = 400
+    floats = rng.normal(60, 15, n).round(1)
+    floats[rng.random(n) < 0.3] = np.nan
+    nullable = pd.array(rng.integers(0, 4, n), dtype="Int64")
+    nullable[rng.random(n) < 0.2] = pd.NA
+    df = pd.DataFrame(
+        {
+            "calendarDate": pd.date_range("2024-01-01", periods=n).strftime("%Y-%m-%d"),
+            "restingHeartRate": floats,
+            "totalSteps": rng.integers(0, 20000, n),
+            "stressLevelValue": nullable,
+            "lateMetricSeconds": [np.nan] * 300 + list(range(100)),
+            "allMissing": [np.nan] * n,
+            "zeros": [0.0] * n,
+            "withInf": [np.inf, np.inf, 1.0, -np.inf, -np.inf] * (n // 5),
+            "includesFlag": rng.random(n) < 0.5,
+            "sleepStartTimestampGMT": [f"2024-01-01T{h % 24:02d}:00:00.0" for h in range(n)],
+            "label": pd.Series(rng.choice(["a", "b", None], n), dtype="str"),
+        }
+    )
+    df.loc[::9, "calendarDate"] = None
+
+    legacy = build_data_dictionary(df, max_sample_values=3, engine="legacy")
+    columnar = build_data_dictionary(df, max_sample_values=3)
+
+    # Numeric statistics agree up to floating-point summation order.
+    pd.testing.assert_frame_equal(columnar, legacy, check_exact=False, rtol=1e-12)
+
+
+def test_streaming_dictionary_matches_in_memory(tmp_path: Path) -> None:
+    rng = np.random.default_rng(11)
+    n = 500
+    floats = rng.normal(60, 15, n).round(1)
+    floats[rng.random(n) < 0.3] = np.nan
+    df = pd.DataFrame(
+        {
+            "calendarDate": pd.date_range("2024-01-01", periods=n).strftime("%Y-%m-%d"),
+            "restingHeartRate": floats,
+            "totalSteps": rng.integers(0, 20000, n),
+            "lateMetricSeconds": [np.nan] * 420 + list(range(80)),
+            "signedZeros": [0.0, -0.0] * (n // 2),
+            "includesFlag": rng.random(n) < 0.5,
+            "sleepStartTimestampGMT": [None] * 30 + [f"2024-01-01T{h % 24:02d}:00:00.0" for h in range(n - 30)],
+            "label": pd.Series(rng.choice(["a", "b", None], n), dtype="str"),
+        }
+    )
+    df.loc[::9, "calendarDate"] = None
+    path = tmp_path / "daily.parquet"
+    df.to_parquet(path, index=False)
+
+    expected = build_data_dictionary(pd.read_parquet(path), max_sample_values=3)
+    streamed, source = build_data_dictionary_streaming(path, max_sample_values=3, batch_size=64)
+
+    # Small columns stay within the sketches' exact range.
+    assert (streamed["n_unique_rel_error"] == 0).all()
+    assert streamed["quantile_rank_error"].dropna().eq(0).all()
+    pd.testing.assert_frame_equal(streamed[expected.columns], expected, check_exact=False, rtol=1e-9)
+    assert (source.n_rows, source.n_columns) == (n, len(df.columns))
+    assert build_markdown_report(streamed, source).count("Date range: 2024-01-02 to 2025-05-14") == 1
+
+
+def test_sketches_report_error_bounds_once_approximate() -> None:
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=50_000)
+
+    quantiles = KllSketch()
+    distinct = HyperLogLog()
+    for chunk in np.array_split(values, 10):
+        quantiles.update(chunk)
+        distinct.update(hash_values(pd.Series(chunk)))
+
+    assert quantiles.rank_error > 0 and distinct.relative_error > 0
+    estimates = quantiles.quantiles([0.05, 0.5, 0.95])
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    assert np.abs(ranks - [0.05, 0.5, 0.95]).max() <= 3 * quantiles.rank_error
+    assert abs(distinct.estimate() / len(values) - 1) <= 4 * distinct.relative_error
+
+    merged = HyperLogLog()
+    for chunk in np.array_split(values, 2):
+        part = HyperLogLog()
+        part.update(hash_values(pd.Series(chunk)))
+        merged.merge(part)
+    assert merged.estimate() == distinct.estimate()
+
+
+def test_parallel_dictionary_keeps_column_order() -> None:
+    rng = np.random.default_rng(5)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "calendarDate": pd.date_range("2024-01-01", periods=n).strftime("%Y-%m-%d"),
+            **{f"metric{i}Seconds": rng.normal(100, 20, n).round(0) for i in range(9)},
+            "stressLevelValue": pd.array(rng.integers(0, 4, n), dtype="Int64"),
+            "label": pd.Series(rng.choice(["a", "b", None], n), dtype="str"),
+        }
+    )
+    df.loc[::7, "metric3Seconds"] = np.nan
+
+    serial = build_data_dictionary(df, max_sample_values=3)
+    parallel = build_data_dictionary(df, max_sample_values=3, jobs=3)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+    # Object ints with None would come back from Arrow as float64: profiled serially instead.
+    mixed = df.assign(objectInts=pd.Series([1, None] * (n // 2), dtype="object"))
+    pd.testing.assert_frame_equal(
+        build_data_dictionary(mixed, jobs=2),
+        build_data_dictionary(mixed),
+    )
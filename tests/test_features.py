@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from garmin_analytics.features import (
+    FEATURES,
+    available_features,
+    clear_feature_cache,
+    compute_features,
+    feature_sources,
+)
+from garmin_analytics.modeling.prepare import add_modeling_features
+
+
+def _daily() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "calendarDate": ["2025-01-04", "2025-01-05", "2025-01-06"],
+            "allDayStress_AWAKE_highDuration": [1800, 0, 900],
+            "allDayStress_AWAKE_totalDuration": [7200, 0, 3600],
+            "deepSleepSeconds": [3600, 5400, None],
+            "lightSleepSeconds": [10800, 9000, 12000],
+        }
+    )
+
+
+def _count_calls(monkeypatch: pytest.MonkeyPatch, name: str) -> list[int]:
+    calls: list[int] = []
+    original = FEATURES[name]
+
+    def compute(cols):
+        calls.append(1)
+        return original.compute(cols)
+
+    monkeypatch.setitem(FEATURES, name, dataclasses.replace(original, compute=compute))
+    return calls
+
+
+def test_compute_features_only_computes_requested_dependencies(monkeypatch: pytest.MonkeyPatch) -> None:
+    clear_feature_cache()
+    efficiency_calls = _count_calls(monkeypatch, "sleep_efficiency")
+    df = _daily()
+
+    out = compute_features(df, ["awakeHighStressShare", "is_weekend"])
+
+    assert list(out.columns) == ["awakeHighStressShare", "is_weekend"]
+    assert out["awakeHighStressShare"].iloc[0] == 0.25
+    assert pd.isna(out["awakeHighStressShare"].iloc[1])
+    assert out["is_weekend"].tolist() == [True, True, False]
+    assert efficiency_calls == []
+
+    # Same values as the full Stage 3 feature layer.
+    full = add_modeling_features(df)
+    pd.testing.assert_series_equal(out["awakeHighStressShare"], full["awakeHighStressShare"])
+    with pytest.raises(KeyError, match="sleep_opportunity_hours"):
+        compute_features(df, ["sleep_opportunity_hours"])
+
+
+def test_stress_shares_are_float64_for_int64_inputs() -> None:
+    clear_feature_cache()
+    df = _daily().astype(
+        {"allDayStress_AWAKE_highDuration": "Int64", "allDayStress_AWAKE_totalDuration": "Int64"}
+    )
+    df.loc[2, "allDayStress_AWAKE_highDuration"] = pd.NA
+
+    out = compute_features(df, ["awakeHighStressShare"])
+
+    expected = pd.Series([0.25, float("nan"), float("nan")], name="awakeHighStressShare")
+    pd.testing.assert_series_equal(out["awakeHighStressShare"], expected)
+
+
+def test_compute_features_memoizes_on_source_fingerprint(monkeypatch: pytest.MonkeyPatch) -> None:
+    clear_feature_cache()
+    calls = _count_calls(monkeypatch, "sleep_efficiency")
+    df = _daily()
+
+    first = compute_features(df, ["sleep_efficiency"])
+    again = compute_features(df.copy(), ["sleep_efficiency"])
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, again)
+
+    # A change to a column the feature does not read keeps the cached result...
+    df["allDayStress_AWAKE_highDuration"] = 0
+    compute_features(df, ["sleep_efficiency"])
+    assert len(calls) == 1
+    # ...while a change to one of its sources recomputes it.
+    df.loc[0, "lightSleepSeconds"] = 7200
+    changed = compute_features(df, ["sleep_efficiency"])
+    assert len(calls) == 2
+    assert changed["sleep_efficiency"].iloc[0] == 1.0
+
+
+def test_feature_sources_and_availability() -> None:
+    sources = feature_sources(["bodyBatteryNetBalance"])
+    assert sources[0] == "bodyBatteryNetBalance"
+    assert {"bodyBattery_chargedValue", "bodyBattery_drainedValue"} <= set(sources)
+
+    available = available_features(_daily())
+    assert {"sleep_total_hours", "deep_pct", "awakeHighStressShare", "weekday_name"} <= set(available)
+    assert "spo2_gap" not in available
@@ -1,11 +1,19 @@
+import json
+import re
+from collections.abc import Iterator
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
+from garmin_analytics.ingest.chunks import merge_chunks, rows_to_chunk
+from garmin_analytics.ingest.dtypes import coerce_column
+from garmin_analytics.ingest.manifest import CacheStats, ChunkCache
 from garmin_analytics.ingest.sleep import COLUMNS as SLEEP_COLUMNS
-from garmin_analytics.ingest.sleep import parse_sleep_files
+from garmin_analytics.ingest.sleep import parse_sleep_files, stream_sleep_parquet
 from garmin_analytics.ingest.uds import CORE_COLUMNS, CORE_DERIVED_COLUMNS
-from garmin_analytics.ingest.uds import parse_uds_files
+from garmin_analytics.ingest.uds import parse_uds_files, stream_uds_parquet
+from garmin_analytics.util import io as util_io
 
 
 FIXTURES = Path(__file__).resolve().parent / "fixtures"
@@ -24,3 +32,213 @@ def test_parse_sleep_fixture() -> None:
     assert list(df.columns) == SLEEP_COLUMNS
     assert len(df) == 1
     assert pd.notna(df.loc[0, "calendarDate"])
+
+
+def _write_json(path: Path, payload: object) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_parse_uds_workers_match_serial(tmp_path: Path) -> None:
+    paths = []
+    for i, (date, extra) in enumerate(
+        [
+            ("2025-01-15", {"includesWellnessData": True}),
+            ("2025-01-16", {"hydration": {"valueInML": 500}}),
+            ("2025-01-16", {"totalSteps": 999}),
+        ]
+    ):
+        record = {"calendarDate": date, "totalSteps": 1000 + i, **extra}
+        path = tmp_path / f"UDSFile_{i}.json"
+        _write_json(path, [record])
+        paths.append(path)
+
+    serial = parse_uds_files(paths)
+    parallel = parse_uds_files(paths, workers=2)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert len(serial) == 2
+    assert int(serial.loc[1, "totalSteps"]) == 999
+
+
+def test_parse_sleep_workers_match_serial(tmp_path: Path) -> None:
+    paths = []
+    for i, date in enumerate(["2025-01-15", "2025-01-16"]):
+        path = tmp_path / f"{i}_sleepData.json"
+        _write_json(path, [{"calendarDate": date, "deepSleepSeconds": 3600 + i}])
+        paths.append(path)
+
+    serial = parse_sleep_files(paths)
+    parallel = parse_sleep_files(paths, workers=2)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert list(parallel.columns) == SLEEP_COLUMNS
+
+
+def test_incremental_uds_parse_reuses_unchanged_files(tmp_path: Path) -> None:
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    paths = []
+    for i, date in enumerate(["2025-01-15", "2025-01-16", "2025-01-17"]):
+        path = export_dir / f"UDSFile_{i}.json"
+        records: list[dict[str, object]] = [{"calendarDate": date, "totalSteps": 1000 + i, "cleared": None}]
+        if i == 0:
+            # The only NaN in "cleared" pads this record; it must survive the cache.
+            records.insert(0, {"calendarDate": "2025-01-14"})
+        _write_json(path, records)
+        paths.append(path)
+
+    cache = ChunkCache(tmp_path / "cache")
+    first = parse_uds_files(paths, cache=cache)
+    assert cache.stats == CacheStats(parsed=3, reused=0, removed=0)
+
+    second = parse_uds_files(paths, cache=cache)
+    assert cache.stats == CacheStats(parsed=0, reused=3, removed=0)
+    pd.testing.assert_frame_equal(second, first)
+    assert second["cleared"].dtype == "float64"
+
+    _write_json(paths[1], [{"calendarDate": "2025-01-16", "totalSteps": 5555}])
+    third = parse_uds_files(paths[1:], cache=cache)
+    assert cache.stats == CacheStats(parsed=1, reused=1, removed=1)
+    pd.testing.assert_frame_equal(third, parse_uds_files(paths[1:]))
+    assert int(third.loc[0, "totalSteps"]) == 5555
+    assert len(list((tmp_path / "cache" / "chunks").glob("*.json"))) == 2
+
+
+def test_observed_type_coercion_matches_value_probing() -> None:
+    rows = [
+        {"flag": True, "steps": 10, "dist": 1.5, "text": "12", "mixed": [1], "empty": None},
+        {"flag": False, "steps": None, "dist": 2, "text": "7.5", "mixed": 3.0, "empty": None},
+        {"flag": None, "steps": 30, "dist": None, "text": "x", "mixed": {"a": 1}},
+    ]
+    chunk = rows_to_chunk(rows)
+    assert chunk.types["steps"] == {"int"}
+    assert chunk.types["mixed"] == {"list", "float", "dict"}
+    assert chunk.types["empty"] == set()
+
+    df = pd.DataFrame(chunk.columns)
+    for col in df.columns:
+        typed = coerce_column(df[col], chunk.types[col])
+        probed = coerce_column(df[col])
+        if probed is None:
+            assert typed is None, col
+        else:
+            pd.testing.assert_series_equal(typed, probed)
+
+
+def test_chunks_match_dataframe_from_records() -> None:
+    first = [
+        {"steps": 10, "empty": None, "text": "a"},
+        {"steps": None, "empty": None, "late": 1.5},
+    ]
+    second = [
+        {"text": "b", "flag": True},
+        {"steps": 30, "mixed": [1]},
+    ]
+    expected = pd.DataFrame(first + second)
+    out = merge_chunks([rows_to_chunk(first), rows_to_chunk(second)])
+
+    pd.testing.assert_frame_equal(out, expected)
+    assert out["empty"].dtype == "float64"
+    assert out["late"].dtype == "float64"
+    pd.testing.assert_frame_equal(pd.DataFrame(rows_to_chunk(first).columns), pd.DataFrame(first))
+
+
+def test_memory_mapped_scan_is_linear_with_brackets_in_strings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "UDSFile_brackets.json"
+    records = [{"note": "x[", "tags": ["{"], "pad": "a" * 50, "i": i} for i in range(200)]
+    _write_json(path, records)
+
+    scanned: list[int] = []
+
+    class CountingPattern:
+        def __init__(self, pattern: re.Pattern[bytes]) -> None:
+            self.pattern = pattern
+
+        def __getattr__(self, name: str) -> object:
+            return getattr(self.pattern, name)
+
+        def finditer(self, buf: object, pos: int = 0) -> Iterator[re.Match[bytes]]:
+            for match in self.pattern.finditer(buf, pos):
+                scanned.append(match.end() - match.start())
+                yield match
+
+    for name, value in list(vars(util_io).items()):
+        if isinstance(value, re.Pattern):
+            monkeypatch.setattr(util_io, name, CountingPattern(value))
+
+    assert list(util_io.iter_json_records(path, lazy_min_bytes=0)) == records
+    # Brackets inside strings must not send the record scan past the record's end.
+    assert sum(scanned) <= path.stat().st_size
+
+
+def test_stream_writers_match_in_memory_parse(tmp_path: Path) -> None:
+    uds_paths = []
+    sleep_paths = []
+    for i, dates in enumerate([["2025-01-17", "2025-01-15"], ["2025-01-16", "2025-01-15", "bad"]]):
+        uds_path = tmp_path / f"UDSFile_{i}.json"
+        _write_json(
+            uds_path,
+            [
+                {
+                    "calendarDate": d,
+                    "totalSteps": 100 * i + j,
+                    "flag": j % 2 == 0,
+                    "note": f"f{i}",
+                    "ratio": "0.5",
+                    "cleared": None,
+                    # Only non-null on the row dropped for its invalid date.
+                    **({"droppedOnly": 7, "droppedFlag": True} if d == "bad" else {"droppedFlag": None}),
+                }
+                for j, d in enumerate(dates)
+            ],
+        )
+        uds_paths.append(uds_path)
+        sleep_path = tmp_path / f"{i}_sleepData.json"
+        _write_json(
+            sleep_path,
+            [
+                {"calendarDate": d, "deepSleepSeconds": 60 * j, "averageRespiration": 14, "retro": False}
+                for j, d in enumerate(dates)
+            ],
+        )
+        sleep_paths.append(sleep_path)
+
+    uds_out = tmp_path / "daily_uds.parquet"
+    assert stream_uds_parquet(uds_paths, uds_out, batch_size=2) == 3
+    expected_uds = parse_uds_files(uds_paths)
+    pd.testing.assert_frame_equal(pd.read_parquet(uds_out), expected_uds)
+    # Columns with no value on a kept row are float64, whatever the dropped rows held.
+    assert (expected_uds[["cleared", "droppedOnly", "droppedFlag"]].dtypes == "float64").all()
+    # Duplicate dates keep the last record in input order.
+    assert expected_uds.loc[0, "totalSteps"] == 101
+
+    sleep_out = tmp_path / "sleep.parquet"
+    assert stream_sleep_parquet(sleep_paths, sleep_out, batch_size=2) == 3
+    pd.testing.assert_frame_equal(pd.read_parquet(sleep_out), parse_sleep_files(sleep_paths))
+
+
+def test_memory_mapped_records_match_full_decode(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    wrapped = tmp_path / "UDSFile_wrapped.json"
+    _write_json(
+        wrapped,
+        {
+            "meta": {"note": "brackets ]} in a string"},
+            "dailySummaries": [
+                {"calendarDate": "2025-01-15", "totalSteps": 10, "tag": "[x"},
+                {"calendarDate": "2025-01-16", "allDayStress": {"aggregatorList": [{"type": "TOTAL"}]}},
+                "not a record",
+            ],
+        },
+    )
+    single = tmp_path / "UDSFile_single.json"
+    _write_json(single, {"calendarDate": "2025-01-17", "records": [{"totalSteps": 1}]})
+    paths = [FIXTURES / "uds_sample.json", wrapped, single]
+
+    eager = parse_uds_files(paths)
+    eager_records = [list(util_io.iter_json_records(p, container_keys=["dailySummaries"])) for p in paths]
+    monkeypatch.setattr(util_io, "LAZY_JSON_MIN_BYTES", 0)
+    lazy_records = [list(util_io.iter_json_records(p, container_keys=["dailySummaries"])) for p in paths]
+
+    assert lazy_records == eager_records
+    pd.testing.assert_frame_equal(parse_uds_files(paths), eager)
+    assert len(eager) == 3
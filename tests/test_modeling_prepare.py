@@ -47,6 +47,44 @@ def test_add_modeling_features_builds_stage3_aliases() -> None:
     assert "is_weekend" in out.columns
 
 
+def test_add_modeling_features_leaves_input_alone_and_appends_columns() -> None:
+    df = pd.DataFrame(
+        {
+            "calendarDate": ["2025-01-04", "2025-01-05"],
+            "awakeAverageStressLevel": ["stale", "stale"],
+            "allDayStress_AWAKE_averageStressLevel": [40, 60],
+            "allDayStress_AWAKE_restDuration": [3600, 0],
+            "allDayStress_AWAKE_totalDuration": [7200, 0],
+        }
+    )
+    before = df.copy()
+
+    out = add_modeling_features(df)
+
+    pd.testing.assert_frame_equal(df, before)
+    # Existing columns keep their position; derived ones follow in build order.
+    assert list(out.columns[:5]) == list(df.columns)
+    assert out["awakeAverageStressLevel"].tolist() == [40.0, 60.0]
+    assert out["awakeRestShare"].iloc[0] == 0.5
+    assert pd.isna(out["awakeRestShare"].iloc[1])
+    assert out["is_weekend"].tolist() == [True, True]
+
+
+def test_add_modeling_features_keeps_stress_shares_float64_for_int64_inputs() -> None:
+    df = pd.DataFrame(
+        {
+            "calendarDate": ["2025-01-04", "2025-01-05", "2025-01-06"],
+            "allDayStress_AWAKE_restDuration": pd.array([3600, 0, None], dtype="Int64"),
+            "allDayStress_AWAKE_totalDuration": pd.array([7200, 0, 3600], dtype="Int64"),
+        }
+    )
+
+    out = add_modeling_features(df)
+
+    expected = pd.Series([0.5, float("nan"), float("nan")], name="awakeRestShare")
+    pd.testing.assert_series_equal(out["awakeRestShare"], expected)
+
+
 def test_build_recovery_modeling_frame_aligns_next_night_targets() -> None:
     daily_df = pd.DataFrame(
         {
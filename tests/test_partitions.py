@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+from typer.testing import CliRunner
+
+import garmin_analytics.cli as cli_module
+from garmin_analytics.cli import app
+from garmin_analytics.modeling.prepare import build_recovery_modeling_frame, load_recovery_modeling_frame
+from garmin_analytics.sql import build_sql_mart
+from garmin_analytics.util.partitions import _date_filter, normalize_date_range, read_table, write_table
+
+duckdb = pytest.importorskip("duckdb")
+
+
+def _daily_frame(start: str = "2024-11-20", days: int = 90) -> pd.DataFrame:
+    dates = pd.date_range(start, periods=days, freq="D")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "calendarDate": dates,
+            "totalSteps": rng.integers(1000, 15000, days).astype("float64"),
+            "activeSeconds": rng.integers(600, 7200, days),
+            "restingHeartRate": rng.integers(45, 65, days),
+            "allDayStress_AWAKE_averageStressLevel": rng.integers(20, 70, days),
+            "sleepStartTimestampGMT": (dates.astype("int64") // 10**9 + 79200).astype("float64"),
+            "sleepEndTimestampGMT": (dates.astype("int64") // 10**9 + 108000).astype("float64"),
+            "sleepRecoveryScore": rng.integers(40, 95, days).astype("float64"),
+            "note": pd.Series([f"d{i}" if i % 3 else None for i in range(days)], dtype="str"),
+        }
+    )
+
+
+def _view_rows(processed_dir: Path, db_path: Path, date_range: tuple[str, str]) -> list[tuple]:
+    summary = build_sql_mart(
+        db_path=db_path,
+        daily_path=processed_dir / "daily_sanitized.parquet",
+        sleep_path=processed_dir / "sleep_sanitized.parquet",
+        quality_path=processed_dir / "daily_quality.parquet",
+        date_range=date_range,
+    )
+    assert summary.fact_daily_rows == 37
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        return conn.execute("SELECT * FROM vw_day_to_next_sleep ORDER BY day_date").fetchall()
+    finally:
+        conn.close()
+
+
+def test_month_layout_round_trips_and_prunes_months(tmp_path: Path) -> None:
+    df = _daily_frame()
+    path = tmp_path / "daily.parquet"
+    write_table(df, path, partition_by="month")
+
+    months = sorted(p.relative_to(path).as_posix() for p in path.rglob("*.parquet"))
+    assert months[0] == "year=2024/month=11/part-0.parquet"
+    assert months[-1] == "year=2025/month=02/part-0.parquet"
+    pd.testing.assert_frame_equal(read_table(path), df)
+
+    # December and February are unreadable now: a January range must not open them.
+    for month in ("year=2024/month=12", "year=2025/month=02"):
+        (path / month / "part-0.parquet").write_bytes(b"not parquet")
+    january = read_table(path, columns=["totalSteps"], date_range=("2025-01-05", "2025-01-31"))
+    expected = df.loc[df["calendarDate"].between("2025-01-05", "2025-01-31"), ["totalSteps"]]
+    pd.testing.assert_frame_equal(january, expected.reset_index(drop=True))
+
+    # Writing the single-file layout replaces the directory.
+    write_table(df, path, partition_by="none")
+    assert path.is_file()
+    pd.testing.assert_frame_equal(read_table(path, date_range=(None, "2024-11-30")), df.head(11))
+
+
+def test_single_file_date_range_skips_row_groups(tmp_path: Path) -> None:
+    df = _daily_frame(days=200)
+    path = tmp_path / "daily.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=20)
+
+    start, end = normalize_date_range(("2025-01-05", "2025-01-20"))
+    fragment = next(ds.dataset(path).get_fragments())
+    kept = fragment.split_by_row_group(_date_filter(pq.read_schema(path).field("calendarDate"), start, end))
+    assert (len(kept), fragment.num_row_groups) == (2, 10)
+
+    out = read_table(path, columns=["totalSteps"], date_range=(start, end))
+    expected = df.loc[df["calendarDate"].between("2025-01-05", "2025-01-20"), ["totalSteps"]]
+    pd.testing.assert_frame_equal(out, expected.reset_index(drop=True))
+    with pytest.raises(KeyError, match="missing columns"):
+        read_table(path, columns=["nope"])
+
+    # Text dates do not sort like dates unless they are padded ISO, so they are
+    # never filtered on the stored text; the parsed dates decide.
+    text = pd.DataFrame({"calendarDate": ["2025-1-5", "2025-1-20", "2025-1-9"], "totalSteps": [1, 2, 3]})
+    text_path = tmp_path / "text_dates.parquet"
+    text.to_parquet(text_path)
+    assert _date_filter(pq.read_schema(text_path).field("calendarDate"), start, end) is None
+    out = read_table(text_path, date_range=("2025-01-01", "2025-01-10"))
+    assert out["totalSteps"].tolist() == [1, 3]
+
+
+def test_empty_column_selection_matches_across_layouts(tmp_path: Path) -> None:
+    df = _daily_frame()
+    frames = {}
+    for layout in ("none", "month"):
+        path = tmp_path / f"daily_{layout}.parquet"
+        write_table(df, path, partition_by=layout)
+        frames[layout] = read_table(path, columns=[])
+        assert read_table(path, columns=[], date_range=("2025-01-01", "2025-01-10")).shape == (10, 0)
+    assert frames["none"].shape == (len(df), 0)
+    pd.testing.assert_frame_equal(frames["month"], frames["none"])
+
+
+def test_cli_stages_and_readers_match_across_layouts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    daily = _daily_frame()
+    uds = daily.drop(columns=["sleepRecoveryScore", "sleepStartTimestampGMT", "sleepEndTimestampGMT"])
+    sleep = daily[["calendarDate", "sleepRecoveryScore", "sleepStartTimestampGMT", "sleepEndTimestampGMT"]]
+
+    runner = CliRunner()
+    processed = {}
+    for layout in ("none", "month"):
+        processed_dir = tmp_path / layout
+        processed_dir.mkdir()
+        write_table(uds, processed_dir / "daily_uds.parquet", partition_by=layout)
+        write_table(sleep, processed_dir / "sleep.parquet", partition_by=layout)
+        monkeypatch.setattr(cli_module, "get_processed_dir", lambda d=processed_dir: d)
+        for args in (
+            ["build-daily"],
+            ["sanitize"],
+            ["quality", "--out-dir", str(tmp_path / f"reports_{layout}")],
+        ):
+            result = runner.invoke(app, [*args, "--partition-by", layout])
+            assert result.exit_code == 0, result.output
+        result = runner.invoke(app, ["quality-sweep", "--output", str(tmp_path / f"sweep_{layout}.csv")])
+        assert result.exit_code == 0, result.output
+        processed[layout] = processed_dir
+
+    for name in ("daily.parquet", "daily_sanitized.parquet", "sleep_sanitized.parquet", "daily_quality.parquet"):
+        assert (processed["month"] / name).is_dir()
+        pd.testing.assert_frame_equal(read_table(processed["month"] / name), read_table(processed["none"] / name))
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "sweep_month.csv"), pd.read_csv(tmp_path / "sweep_none.csv"))
+
+    date_range = ("2024-12-15", "2025-01-20")
+    assert _view_rows(processed["month"], tmp_path / "month.duckdb", date_range) == _view_rows(
+        processed["none"], tmp_path / "none.duckdb", date_range
+    )
+
+    modeled = load_recovery_modeling_frame(
+        processed["month"] / "daily_sanitized.parquet",
+        processed["month"] / "daily_quality.parquet",
+        current_day_quality="loose",
+        date_range=date_range,
+    )
+    full = build_recovery_modeling_frame(
+        read_table(processed["none"] / "daily_sanitized.parquet"),
+        read_table(processed["none"] / "daily_quality.parquet"),
+        current_day_quality="loose",
+    )
+    expected = full.loc[full["calendarDate"].between(*date_range)].reset_index(drop=True)
+    # Only the columns the recovery frame needs are read; their values match a full read.
+    assert "note" not in modeled.columns
+    pd.testing.assert_frame_equal(modeled, expected[modeled.columns])
+    # The last day keeps its next-night target although that night is outside the range.
+    assert str(modeled["calendarDate"].iloc[-1].date()) == "2025-01-20"
+    assert pd.notna(modeled["target_sleepRecoveryScore_next_night"].iloc[-1])
+
+
+def test_cli_migrates_existing_outputs_between_layouts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    daily = _daily_frame()
+    uds = daily.drop(columns=["sleepRecoveryScore", "sleepStartTimestampGMT", "sleepEndTimestampGMT"])
+    sleep = daily[["calendarDate", "sleepRecoveryScore", "sleepStartTimestampGMT", "sleepEndTimestampGMT"]]
+    write_table(uds, tmp_path / "daily_uds.parquet")
+    write_table(sleep, tmp_path / "sleep.parquet")
+    monkeypatch.setattr(cli_module, "get_processed_dir", lambda: tmp_path)
+
+    runner = CliRunner()
+    outputs = ("daily.parquet", "daily_sanitized.parquet", "daily_uds_sanitized.parquet", "daily_quality.parquet")
+    expected = {}
+    # Monolithic files first, then month directories over them, then files again.
+    for layout in ("none", "month", "none"):
+        for args in (["build-daily"], ["sanitize"], ["quality", "--out-dir", str(tmp_path / "reports")]):
+            result = runner.invoke(app, [*args, "--partition-by", layout])
+            assert result.exit_code == 0, result.output
+        for name in outputs:
+            assert (tmp_path / name).is_dir() == (layout == "month")
+            frame = read_table(tmp_path / name)
+            if name in expected:
+                pd.testing.assert_frame_equal(frame, expected[name])
+            expected[name] = frame
+        assert not [p.name for p in tmp_path.iterdir() if p.name.endswith((".tmp", ".old"))]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from garmin_analytics.pipeline import Stage, run_pipeline
+
+
+def _copy_upper(src: Path, dst: Path, calls: list[str], name: str):
+    def _action() -> None:
+        calls.append(name)
+        dst.write_text(src.read_text().upper())
+
+    return _action
+
+
+def _statuses(results) -> dict[str, str]:
+    return {result.name: result.status for result in results}
+
+
+def _graph(tmp_path: Path, calls: list[str], *, suffix: str = "") -> list[Stage]:
+    raw = tmp_path / "raw.txt"
+    mid = tmp_path / "mid.txt"
+    left = tmp_path / "left.txt"
+    right = tmp_path / "right.txt"
+
+    def _left() -> None:
+        calls.append("left")
+        left.write_text(mid.read_text() + suffix)
+
+    return [
+        Stage(name="mid", action=_copy_upper(raw, mid, calls, "mid"), inputs=(raw,), outputs=(mid,)),
+        Stage(name="left", action=_left, deps=("mid",), inputs=(mid,), outputs=(left,), params={"suffix": suffix}),
+        Stage(name="right", action=_copy_upper(mid, right, calls, "right"), deps=("mid",), inputs=(mid,), outputs=(right,)),
+    ]
+
+
+def test_pipeline_skips_current_stages_and_tracks_content(tmp_path: Path) -> None:
+    state = tmp_path / "state.json"
+    (tmp_path / "raw.txt").write_text("a")
+    calls: list[str] = []
+
+    first = run_pipeline(_graph(tmp_path, calls), state_path=state, jobs=2)
+    assert _statuses(first) == {"mid": "ran", "left": "ran", "right": "ran"}
+
+    calls.clear()
+    second = run_pipeline(_graph(tmp_path, calls), state_path=state, jobs=2)
+    assert _statuses(second) == {"mid": "skipped", "left": "skipped", "right": "skipped"}
+    assert calls == []
+
+    # A parameter change only reruns the stage it belongs to.
+    run_pipeline(_graph(tmp_path, calls, suffix="!"), state_path=state)
+    assert calls == ["left"]
+
+    # Rewriting an input with different case yields the same upstream output,
+    # so downstream stages stay cached.
+    calls.clear()
+    (tmp_path / "raw.txt").write_text("A")
+    run_pipeline(_graph(tmp_path, calls, suffix="!"), state_path=state)
+    assert calls == ["mid"]
+
+    # An edited output makes its stage stale again.
+    calls.clear()
+    (tmp_path / "right.txt").write_text("tampered")
+    run_pipeline(_graph(tmp_path, calls, suffix="!"), state_path=state)
+    assert calls == ["right"]
+
+    calls.clear()
+    run_pipeline(_graph(tmp_path, calls, suffix="!"), state_path=state, force=True)
+    assert sorted(calls) == ["left", "mid", "right"]
+
+
+def test_pipeline_failure_blocks_dependents_only(tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def _fail() -> None:
+        raise RuntimeError("boom")
+
+    stages = [
+        Stage(name="a", action=_fail),
+        Stage(name="b", action=lambda: calls.append("b"), deps=("a",)),
+        Stage(name="c", action=lambda: calls.append("c")),
+    ]
+    results = run_pipeline(stages, state_path=tmp_path / "state.json", jobs=2)
+
+    assert _statuses(results) == {"a": "failed", "b": "blocked", "c": "ran"}
+    assert results[0].error == "RuntimeError: boom"
+    assert calls == ["c"]
+
+
+def test_pipeline_rejects_cycles(tmp_path: Path) -> None:
+    stages = [
+        Stage(name="a", action=lambda: None, deps=("b",)),
+        Stage(name="b", action=lambda: None, deps=("a",)),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        run_pipeline(stages, state_path=tmp_path / "state.json")
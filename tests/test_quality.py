@@ -3,13 +3,18 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 from garmin_analytics.quality.quality import (
+    SUSPICION_REASONS,
     QualityConfig,
     apply_quality_labels,
+    build_config_grid,
     build_quality_summary_markdown,
     build_suspicious_days_artifacts,
     build_suspicious_days,
+    decode_suspicion_mask,
+    sweep_quality_configs,
 )
 
 
@@ -124,6 +129,34 @@ def test_corrupted_stress_only_day_forced_bad() -> None:
     assert out.loc[0, "suspicion_reasons"].startswith("corrupted_stress_only_day")
 
 
+def test_suspicion_mask_matches_reason_strings() -> None:
+    df = pd.DataFrame(
+        {
+            "calendarDate": ["2025-01-01", "2025-01-02", "2025-01-03"],
+            "totalSteps": [5000, None, None],
+            "minHeartRate": [50, 55, None],
+            "stressTotalDurationSeconds": [80000, 30000, 86400],
+            "bodyBatteryEndOfDay": [40, None, None],
+            "sleepStartTimestampGMT": [1, None, None],
+            "sleepEndTimestampGMT": [2, None, None],
+        }
+    )
+    out = apply_quality_labels(df, QualityConfig())
+
+    assert str(out["suspicion_mask"].dtype) == "uint8"
+    assert out["suspicion_reasons"].tolist() == [
+        "",
+        "has_steps,has_bodybattery_end,has_sleep,full_day_stress",
+        "corrupted_stress_only_day,has_steps,has_hr,has_bodybattery_end,has_sleep",
+    ]
+    for mask, reasons in zip(out["suspicion_mask"], out["suspicion_reasons"]):
+        assert decode_suspicion_mask(mask) == [r for r in reasons.split(",") if r]
+
+    has_sleep_bit = 1 << SUSPICION_REASONS.index("has_sleep")
+    missing_sleep = out.loc[(out["suspicion_mask"] & has_sleep_bit) != 0, "calendarDate"]
+    assert missing_sleep.tolist() == ["2025-01-02", "2025-01-03"]
+
+
 def test_quality_summary_markdown_includes_thresholds_and_reason_breakdown() -> None:
     df = pd.DataFrame(
         {
@@ -172,3 +205,42 @@ def test_artifact_suspicious_export_prioritizes_corrupted_days() -> None:
     assert art.loc[0, "calendarDate"] == "2024-02-26"
     assert bool(art.loc[0, "corrupted_stress_only_day"])
     assert "bodybattery_start_without_end" in art.columns
+
+
+def test_quality_sweep_matches_per_config_labels() -> None:
+    df = pd.DataFrame(
+        {
+            "calendarDate": pd.date_range("2025-01-01", periods=6).strftime("%Y-%m-%d"),
+            "totalSteps": [5000, 60, None, 0, 120, None],
+            "minHeartRate": [50, None, None, 48, None, None],
+            "stressTotalDurationSeconds": [30000, 80000, 86400, None, 25000, 86000],
+            "bodyBatteryEndOfDay": [20, None, None, 30, 10, None],
+            "sleepStartTimestampGMT": [1, None, None, 1, None, None],
+            "sleepEndTimestampGMT": [2, None, None, 2, None, None],
+        }
+    )
+    configs = build_config_grid(
+        steps_min=[0, 50, 100],
+        stress_any_min_seconds=[21600, 28000],
+        stress_full_min_seconds=[72000, 86000],
+        strict_min_score=[1, 4],
+        loose_min_score=[3],
+    )
+    assert len(configs) == 24
+
+    sweep = sweep_quality_configs(df, configs)
+    assert sweep["config_id"].tolist() == list(range(len(configs)))
+    for config, (_, row) in zip(configs, sweep.iterrows()):
+        labeled = apply_quality_labels(df, config)
+        assert row["steps_min"] == config.steps_min
+        assert row["corrupted_days"] == int(labeled["corrupted_stress_only_day"].sum())
+        assert row["full_day_stress_days"] == int(labeled["full_day_stress"].sum())
+        for kind in ("strict", "loose"):
+            counts = labeled[f"day_quality_label_{kind}"].value_counts()
+            for label in ("good", "partial", "bad"):
+                assert row[f"{kind}_{label}"] == int(counts.get(label, 0))
+
+
+def test_build_config_grid_rejects_unknown_fields() -> None:
+    with pytest.raises(ValueError, match="steps_max"):
+        build_config_grid(steps_max=[1])
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 import pandas as pd
+import pytest
+from typer.testing import CliRunner
 
-from garmin_analytics.sanitize import _sanitize_dataframe_impl, sanitize_dataframe
+import garmin_analytics.cli as cli_module
+from garmin_analytics.cli import app
+from garmin_analytics.sanitize import GuidScanCache, _sanitize_dataframe_impl, sanitize_dataframe, sanitize_parquet_file
 
 
 def test_sanitize_drops_identifiers_and_metadata() -> None:
@@ -125,3 +132,101 @@ def test_sanitize_normalizes_stress_level_sentinels_to_null() -> None:
         "allDayStress_AWAKE_averageStressLevelIntensity": 1,
         "avgSleepStress": 2,
     }
+
+
+def test_sanitize_parquet_file_streams_batches_like_dataframe_path(tmp_path: Path) -> None:
+    n = 50
+    df = pd.DataFrame(
+        {
+            "sleep_calendarDate": ["2025-01-01"] * n,
+            "calendarDate": pd.date_range("2025-01-01", periods=n).strftime("%Y-%m-%d"),
+            "userProfilePK": [7] * n,
+            # Non-null values only appear after the first batches.
+            "deviceGuid": [None] * 20 + ["0f8fad5b-d9cb-469f-a165-70867728950e"] * (n - 20),
+            "avgSleepStress": [-2, 30, None, 101, 55] * 10,
+            "allDayStress_TOTAL_averageStressLevel": [20] * n,
+            "totalSteps": range(n),
+        }
+    )
+    in_path = tmp_path / "daily.parquet"
+    df.to_parquet(in_path, index=False)
+    expected, expected_report = _sanitize_dataframe_impl(pd.read_parquet(in_path), allow_identifiers=False)
+
+    out_path = tmp_path / "daily_sanitized.parquet"
+    report = sanitize_parquet_file(in_path, out_path, batch_size=8)
+
+    assert "deviceGuid" in report["dropped_columns"]
+    assert report["rows"] == n
+    assert report["cols_before"] == 7
+    assert report["cols_after"] == len(expected.columns)
+    for key in ("dropped_columns", "kept_columns", "rules_applied", "value_replacements"):
+        assert report[key] == expected_report[key]
+    pd.testing.assert_frame_equal(pd.read_parquet(out_path), expected)
+
+    # In-place runs write a temp file and replace the input only when done.
+    sanitize_parquet_file(in_path, in_path, batch_size=8)
+    pd.testing.assert_frame_equal(pd.read_parquet(in_path), expected)
+
+
+def test_sanitize_command_jobs_keeps_report_order(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    processed_dir = tmp_path / "processed"
+    processed_dir.mkdir()
+    base = pd.DataFrame(
+        {
+            "calendarDate": ["2025-01-01", "2025-01-02"],
+            "uuid": ["a", "b"],
+            "avgSleepStress": [-1, 20],
+        }
+    )
+    for name in ("daily", "daily_uds", "sleep"):
+        base.to_parquet(processed_dir / f"{name}.parquet", index=False)
+    monkeypatch.setattr(cli_module, "get_processed_dir", lambda: processed_dir)
+
+    reports = []
+    for jobs in ("1", "3"):
+        report_path = tmp_path / f"report_{jobs}.json"
+        result = CliRunner().invoke(app, ["sanitize", "--jobs", jobs, "--report", str(report_path)])
+        assert result.exit_code == 0, result.output
+        reports.append(json.loads(report_path.read_text(encoding="utf-8"))["files"])
+
+    assert list(reports[1]) == ["daily", "daily_uds", "sleep"]
+    assert reports[0] == reports[1]
+    assert all(report["dropped_columns"] == ["uuid"] for report in reports[1].values())
+
+
+def test_guid_sample_strategies_and_column_cache(tmp_path: Path) -> None:
+    n = 1000
+    guid = "0f8fad5b-d9cb-469f-a165-70867728950e"
+    df = pd.DataFrame(
+        {
+            "calendarDate": pd.date_range("2020-01-01", periods=n).strftime("%Y-%m-%d"),
+            # Plain labels first, device GUIDs for the remaining 90% of rows.
+            "deviceId": ["watch"] * 100 + [guid] * (n - 100),
+            "note": ["ok"] * n,
+        }
+    )
+    in_path = tmp_path / "daily.parquet"
+    df.to_parquet(in_path, index=False, row_group_size=100)
+    out_path = tmp_path / "out.parquet"
+
+    dropped = {
+        strategy: sanitize_parquet_file(in_path, out_path, guid_sample=strategy)["dropped_columns"]
+        for strategy in ("head", "random", "stratified")
+    }
+    assert dropped["head"] == []
+    assert dropped["random"] == ["deviceId"]
+    assert dropped["stratified"] == ["deviceId"]
+
+    cache_path = tmp_path / "guid_cache.json"
+    first = GuidScanCache(cache_path)
+    sanitize_parquet_file(in_path, out_path, guid_sample="stratified", guid_cache=first)
+    first.save()
+    assert (first.hits, first.misses) == (0, 3)
+
+    # Only the rewritten column is scanned again.
+    df["note"] = "changed"
+    df.to_parquet(in_path, index=False, row_group_size=100)
+    second = GuidScanCache(cache_path)
+    report = sanitize_parquet_file(in_path, out_path, guid_sample="stratified", guid_cache=second)
+    assert (second.hits, second.misses) == (2, 1)
+    assert report["dropped_columns"] == ["deviceId"]
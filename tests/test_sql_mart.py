@@ -3,9 +3,13 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
+from garmin_analytics.ingest import manifest
 from garmin_analytics.sql import build_sql_mart, run_sql_directory
+from garmin_analytics.util.partitions import write_table
 
 duckdb = pytest.importorskip("duckdb")
 
@@ -212,8 +216,10 @@ def test_run_sql_directory_smoke_on_portfolio_queries(tmp_path: Path) -> None:
 
     assert len(results) >= 10
     for result in results:
-        assert result.output_csv_path.exists()
+        assert result.output_path.exists()
         assert result.columns >= 1
+    with pytest.warns(DeprecationWarning, match="output_path"):
+        assert results[0].output_csv_path == results[0].output_path
 
 
 def test_run_sql_directory_handles_sleep_stress_alias_only(tmp_path: Path) -> None:
@@ -239,3 +245,250 @@ def test_run_sql_directory_handles_sleep_stress_alias_only(tmp_path: Path) -> No
 
     query_07 = next(result for result in results if result.query_path.name == "07_sleep_duration_bands.sql")
     assert query_07.rows >= 1
+
+
+def _fact_rows(db_path: Path, table: str) -> list[tuple]:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        return conn.execute(f"SELECT * FROM {table} ORDER BY ALL").fetchall()
+    finally:
+        conn.close()
+
+
+def test_incremental_refresh_upserts_only_changed_days(tmp_path: Path) -> None:
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    sleep_path = tmp_path / "sleep_sanitized.parquet"
+    quality_path = tmp_path / "daily_quality.parquet"
+    db_path = tmp_path / "analytics.duckdb"
+    sources = {"daily_path": daily_path, "sleep_path": sleep_path, "quality_path": quality_path}
+
+    daily = _make_daily_frame()
+    _write_parquet(daily, daily_path)
+    _write_parquet(_make_sleep_frame(), sleep_path)
+    _write_parquet(_make_quality_frame(), quality_path)
+    build_sql_mart(db_path=db_path, **sources)
+
+    unchanged = build_sql_mart(db_path=db_path, incremental=True, **sources)
+    assert [refresh.action for refresh in unchanged.refreshes] == ["unchanged"] * 3
+    assert not unchanged.views_rebuilt
+
+    # One edited day, one removed day and one new day.
+    changed = daily.copy()
+    changed.loc[3, "totalSteps"] = 99_999
+    changed = changed.drop(index=0)
+    extra = changed.tail(1).assign(calendarDate=pd.Timestamp("2025-01-15"))
+    _write_parquet(pd.concat([changed, extra], ignore_index=True), daily_path)
+
+    summary = build_sql_mart(db_path=db_path, incremental=True, **sources)
+    refreshes = {refresh.table: refresh for refresh in summary.refreshes}
+    assert (refreshes["fact_daily"].action, refreshes["fact_daily"].upserted, refreshes["fact_daily"].deleted) == (
+        "updated",
+        2,
+        1,
+    )
+    assert refreshes["fact_sleep"].action == "unchanged"
+    assert not summary.views_rebuilt
+    assert summary.fact_daily_rows == 14
+
+    rebuilt_path = tmp_path / "rebuilt.duckdb"
+    build_sql_mart(db_path=rebuilt_path, **sources)
+    assert _fact_rows(db_path, "fact_daily") == _fact_rows(rebuilt_path, "fact_daily")
+    assert _fact_rows(db_path, "vw_day_to_next_sleep") == _fact_rows(rebuilt_path, "vw_day_to_next_sleep")
+
+    # A new column changes the schema: the table and the views are rebuilt.
+    _write_parquet(daily.assign(restingHeartRate=55), daily_path)
+    summary = build_sql_mart(db_path=db_path, incremental=True, **sources)
+    assert summary.refreshes[0].action == "created"
+    assert summary.views_rebuilt
+
+
+def test_incremental_refresh_hashes_only_changed_parts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    january = _make_daily_frame()
+    daily = pd.concat([january, january.assign(calendarDate=january["calendarDate"] + pd.Timedelta(days=31))])
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    db_path = tmp_path / "analytics.duckdb"
+    write_table(daily.reset_index(drop=True), daily_path, partition_by="month")
+
+    hashed: list[Path] = []
+    sha256 = manifest._sha256
+
+    def counting_sha256(path: Path) -> str:
+        hashed.append(path)
+        return sha256(path)
+
+    monkeypatch.setattr(manifest, "_sha256", counting_sha256)
+
+    def refresh() -> str:
+        hashed.clear()
+        summary = build_sql_mart(db_path=db_path, daily_path=daily_path, sleep_path=None, quality_path=None, incremental=True)
+        return summary.refreshes[0].action
+
+    assert refresh() == "created"
+    assert len(hashed) == 2
+    assert refresh() == "unchanged"
+    assert hashed == []
+
+    february = daily_path / "year=2025" / "month=02" / "part-0.parquet"
+    frame = pd.read_parquet(february)
+    frame.loc[0, "totalSteps"] = 99_999
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), february)
+    assert refresh() == "updated"
+    assert hashed == [february]
+
+
+def test_incremental_refresh_rejects_duplicate_dates(tmp_path: Path) -> None:
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    db_path = tmp_path / "analytics.duckdb"
+    daily = _make_daily_frame()
+    _write_parquet(daily, daily_path)
+    build_sql_mart(db_path=db_path, daily_path=daily_path, sleep_path=None, quality_path=None)
+    before = _fact_rows(db_path, "fact_daily")
+
+    _write_parquet(pd.concat([daily, daily.tail(1).assign(totalSteps=1)]), daily_path)
+    with pytest.raises(ValueError, match="one row per calendarDate"):
+        build_sql_mart(db_path=db_path, daily_path=daily_path, sleep_path=None, quality_path=None, incremental=True)
+
+    assert _fact_rows(db_path, "fact_daily") == before
+
+
+def test_materialized_views_match_plain_views_and_follow_their_sources(tmp_path: Path) -> None:
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    sleep_path = tmp_path / "sleep_sanitized.parquet"
+    quality_path = tmp_path / "daily_quality.parquet"
+    sources = {"daily_path": daily_path, "sleep_path": sleep_path, "quality_path": quality_path}
+    _write_parquet(_make_daily_frame(), daily_path)
+    _write_parquet(_make_sleep_frame(), sleep_path)
+    _write_parquet(_make_quality_frame(), quality_path)
+
+    plain_path = tmp_path / "plain.duckdb"
+    db_path = tmp_path / "analytics.duckdb"
+    build_sql_mart(db_path=plain_path, **sources)
+    summary = build_sql_mart(db_path=db_path, materialize=True, **sources)
+    assert summary.materialized == ("mat_day_to_next_sleep", "mat_sleep_nights", "mat_weekday_profiles")
+    for view in ("vw_day_to_next_sleep", "vw_sleep_nights", "vw_weekday_profiles"):
+        assert _fact_rows(db_path, view) == _fact_rows(plain_path, view)
+
+    # Quality feeds the day-to-next-sleep join (and the weekday profile built on it), not sleep nights.
+    quality = _make_quality_frame()
+    quality.loc[2, "valid_day_strict"] = False
+    _write_parquet(quality, quality_path)
+    summary = build_sql_mart(db_path=db_path, incremental=True, materialize=True, **sources)
+    assert summary.materialized == ("mat_day_to_next_sleep", "mat_weekday_profiles")
+    assert not summary.views_rebuilt
+    build_sql_mart(db_path=plain_path, **sources)
+    assert _fact_rows(db_path, "vw_weekday_profiles") == _fact_rows(plain_path, "vw_weekday_profiles")
+
+    summary = build_sql_mart(db_path=db_path, incremental=True, **sources)
+    assert summary.views_rebuilt and summary.materialized == ()
+    assert _fact_rows(db_path, "vw_day_to_next_sleep") == _fact_rows(plain_path, "vw_day_to_next_sleep")
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name LIKE 'mat_%'").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_external_and_hybrid_modes_match_table_mode(tmp_path: Path) -> None:
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    sleep_path = tmp_path / "sleep_sanitized.parquet"
+    quality_path = tmp_path / "daily_quality.parquet"
+    sources = {"daily_path": daily_path, "sleep_path": sleep_path, "quality_path": quality_path}
+    _write_parquet(_make_daily_frame(), daily_path)
+    _write_parquet(_make_sleep_frame(), sleep_path)
+    _write_parquet(_make_quality_frame(), quality_path)
+
+    table_path = tmp_path / "table.duckdb"
+    build_sql_mart(db_path=table_path, **sources)
+    relations = ("fact_daily", "fact_sleep", "fact_quality", "vw_day_to_next_sleep", "vw_sleep_nights", "vw_weekday_profiles")
+
+    for mode in ("external", "hybrid"):
+        db_path = tmp_path / f"{mode}.duckdb"
+        summary = build_sql_mart(db_path=db_path, mode=mode, **sources)
+        assert summary.mode == mode
+        for relation in relations:
+            assert _fact_rows(db_path, relation) == _fact_rows(table_path, relation)
+
+    conn = duckdb.connect(str(tmp_path / "hybrid.duckdb"), read_only=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+        assert {"hot_daily", "hot_sleep", "hot_quality"} <= tables
+        assert not tables & {"fact_daily", "fact_sleep", "fact_quality"}
+        assert "totalSteps" in {row[0] for row in conn.execute("DESCRIBE hot_daily").fetchall()}
+    finally:
+        conn.close()
+
+    # Switching a kept file back to table mode replaces the views and drops the hot tables.
+    db_path = tmp_path / "hybrid.duckdb"
+    build_sql_mart(db_path=db_path, overwrite=False, **sources)
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+        assert {"fact_daily", "fact_sleep", "fact_quality"} <= tables
+        assert not tables & {"hot_daily", "hot_sleep", "hot_quality"}
+    finally:
+        conn.close()
+
+    with pytest.raises(ValueError, match="Incremental refresh needs mode 'table'"):
+        build_sql_mart(db_path=db_path, incremental=True, mode="external", **sources)
+
+
+def test_run_sql_directory_concurrent_with_repeats_matches_serial(tmp_path: Path) -> None:
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    sleep_path = tmp_path / "sleep_sanitized.parquet"
+    quality_path = tmp_path / "daily_quality.parquet"
+    db_path = tmp_path / "analytics.duckdb"
+    _write_parquet(_make_daily_frame(), daily_path)
+    _write_parquet(_make_sleep_frame(), sleep_path)
+    _write_parquet(_make_quality_frame(), quality_path)
+    build_sql_mart(db_path=db_path, daily_path=daily_path, sleep_path=sleep_path, quality_path=quality_path)
+
+    query_dir = Path(__file__).resolve().parents[1] / "sql" / "duckdb"
+    serial = run_sql_directory(db_path=db_path, query_dir=query_dir, output_dir=tmp_path / "serial")
+    concurrent = run_sql_directory(
+        db_path=db_path,
+        query_dir=query_dir,
+        output_dir=tmp_path / "concurrent",
+        jobs=3,
+        repeat=3,
+    )
+
+    assert [r.query_path for r in concurrent] == [r.query_path for r in serial]
+    for a, b in zip(serial, concurrent):
+        assert a.output_path.read_bytes() == b.output_path.read_bytes()
+        assert len(a.latencies_seconds) == 1 and len(b.latencies_seconds) == 3
+        assert 0 < b.p50_seconds <= b.p95_seconds <= max(b.latencies_seconds)
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_run_sql_directory_columnar_formats_keep_types(tmp_path: Path, output_format: str) -> None:
+    daily_path = tmp_path / "daily_sanitized.parquet"
+    sleep_path = tmp_path / "sleep_sanitized.parquet"
+    quality_path = tmp_path / "daily_quality.parquet"
+    db_path = tmp_path / "analytics.duckdb"
+    _write_parquet(_make_daily_frame(), daily_path)
+    _write_parquet(_make_sleep_frame(), sleep_path)
+    _write_parquet(_make_quality_frame(), quality_path)
+    build_sql_mart(db_path=db_path, daily_path=daily_path, sleep_path=sleep_path, quality_path=quality_path)
+
+    query_dir = Path(__file__).resolve().parents[1] / "sql" / "duckdb"
+    results = run_sql_directory(
+        db_path=db_path,
+        query_dir=query_dir,
+        output_dir=tmp_path / output_format,
+        output_format=output_format,
+    )
+
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        for result in results:
+            assert result.output_path.suffix == f".{output_format}"
+            if output_format == "parquet":
+                table = pq.read_table(result.output_path)
+            else:
+                table = pa.ipc.open_file(str(result.output_path)).read_all()
+            executed = conn.execute(result.query_path.read_text(encoding="utf-8"))
+            expected = (getattr(executed, "to_arrow_table", None) or executed.fetch_arrow_table)()
+            assert (result.rows, result.columns) == (table.num_rows, table.num_columns)
+            assert table.equals(expected)
+    finally:
+        conn.close()
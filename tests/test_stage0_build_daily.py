@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pandas as pd
@@ -90,3 +91,29 @@ def test_build_daily_fails_fast_on_duplicate_calendar_date(
     assert result.exit_code == 1
     assert "duplicate calendarDate" in result.output
     assert not (tmp_path / "daily.parquet").exists()
+
+
+def test_build_daily_writes_metrics_line(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(cli_module, "get_processed_dir", lambda: tmp_path)
+    _write_parquet(pd.DataFrame({"calendarDate": ["2025-01-01", "2025-01-02"]}), tmp_path / "daily_uds.parquet")
+    _write_parquet(pd.DataFrame({"calendarDate": ["2025-01-01"]}), tmp_path / "sleep.parquet")
+    metrics_path = tmp_path / "metrics.jsonl"
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["--metrics-out", str(metrics_path), "build-daily"])
+    assert result.exit_code == 0, result.output
+    # Without --metrics-out nothing more is appended.
+    assert runner.invoke(app, ["build-daily"]).exit_code == 0
+
+    lines = metrics_path.read_text().splitlines()
+    assert len(lines) == 1
+    metrics = json.loads(lines[0])
+    assert metrics["command"] == "build-daily"
+    assert metrics["status"] == "ok"
+    assert metrics["rows_in"] == 3
+    assert metrics["rows_out"] == 2
+    assert metrics["bytes_written"] == (tmp_path / "daily.parquet").stat().st_size
+    assert metrics["wall_seconds"] >= 0 and metrics["cpu_seconds"] >= 0